@@ -0,0 +1,357 @@
+"""
+Benchmark the forecasting pipeline on synthetic data.
+
+Sweeps series length, forecast horizon and number of simulations over
+fetching, fitting, simulation, calibration and plotting, and records wall
+time and peak traced memory of each case. Data is served by a local fake
+FRED client, so no API key or network access is needed.
+
+Usage::
+
+    python -m benchmarks.run                      # quick sweep, print results
+    python -m benchmarks.run --sweep full --slow  # include Bayesian fits
+    python -m benchmarks.run --save-baseline      # store as the baseline
+    python -m benchmarks.run --compare            # flag regressions
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Parameter grids; each benchmark sweeps the parameters it depends on
+SWEEPS = {
+    "quick": {"length": [40, 120], "horizon": [8, 20], "N": [1000, 10000]},
+    "full": {"length": [40, 120, 300], "horizon": [8, 20, 40], "N": [1000, 10000, 100000]},
+}
+
+
+class FakeFredClient:
+    """Local stand-in for ``fredapi.Fred`` serving synthetic monthly series."""
+
+    def __init__(self, n_months: int, seed: int = 0):
+        self.n_months = n_months
+        self.seed = seed
+
+    def get_series_info(self, series_id: str) -> pd.Series:
+        return pd.Series({
+            "title": f"Synthetic {series_id}",
+            "units": "Billions of Dollars",
+            "frequency": "Monthly",
+        })
+
+    def get_series(self, series_id: str) -> pd.Series:
+        index = pd.date_range("1950-01-01", periods=self.n_months, freq="MS")
+        return pd.Series(_random_walk(self.n_months, self.seed), index=index)
+
+
+def _random_walk(n: int, seed: int) -> np.ndarray:
+    """A positive, trending random walk with quarterly seasonality."""
+    rng = np.random.default_rng(seed)
+    season = np.tile([0.5, -0.2, 0.3, -0.6], n // 4 + 1)[:n]
+    return 100 + np.cumsum(rng.normal(0.5, 1.0, n)) + season
+
+
+def synthetic_quarterly(length: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic quarterly DataFrame as returned by ``fetch_fred_data``."""
+    index = pd.period_range("1950Q1", periods=length, freq="Q-DEC")
+    df = pd.DataFrame({"SYNTH": _random_walk(length, seed)}, index=index)
+    df.attrs["title"] = "Synthetic series"
+    df.attrs["units"] = "Billions of Dollars"
+    return df
+
+
+def synthetic_posterior(length: int, draws: int = 500, seed: int = 0):
+    """A posterior shaped like the output of ``fit_bayesian_model``."""
+    import arviz as az
+
+    rng = np.random.default_rng(seed)
+    y = _random_walk(length, seed)
+    return az.from_dict(posterior={
+        "level": y + rng.normal(0, 0.1, size=(2, draws, length)),
+        "trend": 0.5 + rng.normal(0, 0.05, size=(2, draws, length)),
+        "seasonal": rng.normal(0, 0.1, size=(2, draws, length)),
+        "sigma_obs": rng.uniform(0.5, 1.5, size=(2, draws)),
+    })
+
+
+def _end_period(df: pd.DataFrame, horizon: int) -> str:
+    return str(df.index[-1] + horizon)
+
+
+def _cases(grid: Dict[str, List[int]], slow: bool) -> Iterator[Tuple[str, Dict[str, int], Callable[[], Callable[[], Any]]]]:
+    """
+    Yield (name, params, setup) for every benchmark case.
+
+    ``setup`` prepares the inputs outside the measurement and returns the
+    callable to time.
+    """
+    from fred_forecaster.calibration import calibrate_simulations
+    from fred_forecaster.data import fetch_fred_data_many
+    from fred_forecaster.models.bayesian import fit_bayesian_model, generate_bayesian_simulations
+    from fred_forecaster.models.sarimax import fit_sarimax_model, generate_simulations
+    from fred_forecaster.visualization import plot_drop_probabilities, plot_forecasts
+
+    largest_n = max(grid["N"])
+    largest_length = max(grid["length"])
+
+    for length in grid["length"]:
+        def setup(length=length):
+            client = FakeFredClient(n_months=3 * length)
+            ids = [f"S{i}" for i in range(8)]
+            return lambda: fetch_fred_data_many(ids, client=client)
+        yield "fetch_fred_data_many", {"length": length, "series": 8}, setup
+
+        def setup(length=length):
+            df = synthetic_quarterly(length)
+            return lambda: fit_sarimax_model(df)
+        yield "fit_sarimax_model", {"length": length}, setup
+
+        if slow:
+            def setup(length=length):
+                df = synthetic_quarterly(length)
+                return lambda: fit_bayesian_model(df)
+            yield "fit_bayesian_model", {"length": length}, setup
+
+    df = synthetic_quarterly(largest_length)
+    sarimax_results = None
+    for horizon in grid["horizon"]:
+        end = _end_period(df, horizon)
+        for N in grid["N"]:
+            def setup(end=end, N=N):
+                nonlocal sarimax_results
+                if sarimax_results is None:
+                    sarimax_results = fit_sarimax_model(df)
+                return lambda: generate_simulations(sarimax_results, df, end=end, N=N)
+            yield "generate_simulations", {"horizon": horizon, "N": N}, setup
+
+            def setup(end=end, N=N):
+                idata = synthetic_posterior(len(df))
+                return lambda: generate_bayesian_simulations(None, idata, df, end=end, N=N)
+            yield "generate_bayesian_simulations", {"horizon": horizon, "N": N}, setup
+
+    horizon = max(grid["horizon"])
+    end = _end_period(df, horizon)
+    targets_idata = synthetic_posterior(len(df))
+    for N in grid["N"]:
+        def simulate(N=N):
+            sim_array, forecast_index = generate_bayesian_simulations(
+                None, targets_idata, df, end=end, N=N
+            )
+            q4 = np.flatnonzero(np.asarray(forecast_index.quarter == 4))
+            targets = {
+                int(forecast_index[i].year): float(np.quantile(sim_array[i], 0.6))
+                for i in q4
+            }
+            return sim_array, forecast_index, targets
+
+        for method in ["entropy", "slsqp"]:
+            if method == "slsqp" and N > 1000:
+                # One free weight per path with a dense solver workspace
+                continue
+            def setup(simulate=simulate, method=method):
+                sim_array, forecast_index, targets = simulate()
+                return lambda: calibrate_simulations(sim_array, forecast_index, targets, method=method)
+            yield f"calibrate_simulations[{method}]", {"horizon": horizon, "N": N}, setup
+
+        def setup(simulate=simulate):
+            sim_array, forecast_index, _ = simulate()
+            weights = np.full(sim_array.shape[1], 1 / sim_array.shape[1])
+            return lambda: plot_forecasts(df, sim_array, forecast_index, weights).to_json()
+        yield "plot_forecasts", {"horizon": horizon, "N": N}, setup
+
+        def setup(simulate=simulate):
+            sim_array, forecast_index, _ = simulate()
+            start_year = int(forecast_index[0].year) + 1
+            return lambda: plot_drop_probabilities(
+                sim_array, forecast_index, start_year=start_year
+            ).to_json()
+        yield "plot_drop_probabilities", {"horizon": horizon, "N": N}, setup
+
+
+def measure(fn: Callable[[], Any], repeat: int = 3) -> Dict[str, float]:
+    """
+    Time a callable and trace its peak memory.
+
+    Wall time is the best of ``repeat`` untraced runs; peak memory is
+    measured in one extra run under ``tracemalloc``, which also tracks
+    NumPy allocations.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"time": min(times), "peak_mb": peak / 1024 ** 2}
+
+
+def environment() -> Dict[str, str]:
+    """Versions of the libraries that affect performance."""
+    env = {"python": platform.python_version(), "machine": platform.machine()}
+    for name in ["fred_forecaster", "numpy", "pandas", "scipy", "statsmodels", "pymc", "plotly"]:
+        try:
+            env[name] = importlib.import_module(name).__version__
+        except ImportError:
+            env[name] = "not installed"
+    return env
+
+
+def run(sweep: str = "quick", slow: bool = False, repeat: int = 3,
+        only: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the benchmark sweep.
+
+    Parameters
+    ----------
+    sweep : str, optional
+        "quick" (default) or "full"
+    slow : bool, optional
+        Whether to include the Bayesian fits (default: False)
+    repeat : int, optional
+        Timed runs per case (default: 3)
+    only : str, optional
+        Run only the benchmarks whose name contains this string
+
+    Returns
+    -------
+    Dict[str, Any]
+        "environment" and a list of "results", each with the benchmark
+        "name", its "params", "time" in seconds and "peak_mb", or "error"
+        if the case failed
+    """
+    results = []
+    for name, params, setup in _cases(SWEEPS[sweep], slow):
+        if only and only not in name:
+            continue
+        try:
+            fn = setup()
+            stats = measure(fn, repeat=1 if name.startswith("fit_bayesian") else repeat)
+        except Exception as e:
+            # Record the failure and keep going with the other cases
+            results.append({"name": name, "params": params, "error": f"{type(e).__name__}: {e}"})
+            print(f"{_case_id(name, params):<60} FAILED: {type(e).__name__}: {e}", flush=True)
+            continue
+        results.append({"name": name, "params": params, **stats})
+        print(f"{_case_id(name, params):<60} {stats['time']:9.4f}s {stats['peak_mb']:9.1f} MB",
+              flush=True)
+    return {"environment": environment(), "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            time_tolerance: float = 0.25, memory_tolerance: float = 0.10) -> List[str]:
+    """
+    Flag cases that got slower or use more memory than the baseline.
+
+    Parameters
+    ----------
+    current, baseline : Dict[str, Any]
+        Outputs of ``run``
+    time_tolerance : float, optional
+        Allowed relative increase in wall time (default: 25%)
+    memory_tolerance : float, optional
+        Allowed relative increase in peak memory (default: 10%)
+
+    Returns
+    -------
+    List[str]
+        One message per regression; empty if there are none
+    """
+    reference = {_case_id(r["name"], r["params"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        case = _case_id(result["name"], result["params"])
+        if case not in reference:
+            continue
+        base = reference[case]
+        if "error" in result and "error" not in base:
+            regressions.append(f"{case}: failed with {result['error']}")
+            continue
+        if "error" in result or "error" in base:
+            continue
+        if result["time"] > base["time"] * (1 + time_tolerance):
+            regressions.append(
+                f"{case}: time {base['time']:.4f}s -> {result['time']:.4f}s "
+                f"({result['time'] / base['time'] - 1:+.0%})"
+            )
+        # Ignore memory noise on tiny allocations
+        if result["peak_mb"] > base["peak_mb"] * (1 + memory_tolerance) + 1.0:
+            regressions.append(
+                f"{case}: peak memory {base['peak_mb']:.1f} MB -> {result['peak_mb']:.1f} MB"
+            )
+    return regressions
+
+
+def _case_id(name: str, params: Dict[str, int]) -> str:
+    return name + "(" + ", ".join(f"{k}={v}" for k, v in sorted(params.items())) + ")"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sweep", choices=sorted(SWEEPS), default="quick")
+    parser.add_argument("--slow", action="store_true", help="include the Bayesian fits")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store the results as the baseline")
+    parser.add_argument("--compare", action="store_true",
+                        help="compare with the baseline and fail on regressions")
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    parser.add_argument("--memory-tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+    if args.compare and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(
+            f"no baseline at {args.baseline}; run with --save-baseline first"
+        )
+
+    # Convergence and resampling warnings would drown the results
+    warnings.simplefilter("ignore")
+    current = run(args.sweep, slow=args.slow, repeat=args.repeat, only=args.only)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        changed = {
+            k: (v, current["environment"].get(k))
+            for k, v in baseline["environment"].items()
+            if current["environment"].get(k) != v
+        }
+        for name, (old, new) in changed.items():
+            print(f"Environment changed: {name} {old} -> {new}")
+        regressions = compare(current, baseline, args.time_tolerance, args.memory_tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
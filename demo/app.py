@@ -5,6 +5,10 @@ This app demonstrates the use of the fred_forecaster package for generating
 time series forecasts of FRED economic data.
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -24,6 +28,220 @@ from fred_forecaster import (
 from fred_forecaster.data import get_series_name, get_series_title
 
 
+BAYESIAN = "Bayesian Structural Time Series"
+SARIMAX = "SARIMAX (Classical)"
+
+
+@st.cache_data(ttl=3600, show_spinner="Fetching data from FRED...")
+def load_series(series_id: str) -> pd.DataFrame:
+    """Quarterly data of a FRED series, fetched once per hour."""
+    return fetch_fred_data(series_id)
+
+
+@st.cache_resource(show_spinner=False)
+def fit_executor() -> ThreadPoolExecutor:
+    """Background worker running the model fits of all sessions."""
+    return ThreadPoolExecutor(max_workers=1)
+
+
+class FitJob:
+    """A model fit running in the background, with its progress."""
+
+    def __init__(self, fn, *args, **kwargs):
+        self.progress = 0.0
+        self.discarded = False
+        self.future = fit_executor().submit(fn, *args, progress=self.update, **kwargs)
+
+    def update(self, done: int, total: int) -> None:
+        self.progress = min(done / total, 1.0)
+
+    @property
+    def failed(self) -> bool:
+        """Whether the fit finished with an exception."""
+        return self.future.done() and self.future.exception() is not None
+
+    def discard(self) -> None:
+        """Drop the job from the cache at its next lookup, so it is fitted again."""
+        self.discarded = True
+
+
+def _keep_job(job: FitJob) -> bool:
+    return not job.discarded
+
+
+def _fit_model(df_quarterly, model_type, inference_method, progress):
+    if model_type == SARIMAX:
+        return None, fit_sarimax_model(df_quarterly)
+    return fit_bayesian_model(df_quarterly, method=inference_method, progress=progress)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16, validate=_keep_job)
+def fit_job(series_id: str, model_type: str, inference_method: str) -> FitJob:
+    """Start fitting a model, once per series, model and inference method."""
+    return FitJob(_fit_model, load_series(series_id), model_type, inference_method)
+
+
+@st.cache_data(show_spinner="Generating simulations...", max_entries=16)
+def simulate(request) -> Tuple[np.ndarray, pd.PeriodIndex]:
+    """Simulations of a finished fit, once per fit, horizon and N."""
+    series_id, model_type, inference_method, end, N = request
+    df_quarterly = load_series(series_id)
+    model, fitted = fit_job(series_id, model_type, inference_method).future.result()
+    if model_type == SARIMAX:
+        return generate_simulations(fitted, df_quarterly, end=end, N=N)
+    return generate_bayesian_simulations(model, fitted, df_quarterly, end=end, N=N)
+
+
+@st.cache_data(show_spinner="Calibrating simulations to CBO targets...", max_entries=16)
+def calibrate(request) -> np.ndarray:
+    """Calibration weights of the simulations of a request."""
+    sim_array, forecast_index = simulate(request)
+    return calibrate_simulations(sim_array, forecast_index)
+
+
+def wait_for_fit(job: FitJob, model_type: str) -> None:
+    """Show the progress of a fit, rerunning the page until it finishes."""
+    if job.future.done():
+        return
+    label = "Fitting SARIMAX model..." if model_type == SARIMAX else "Fitting Bayesian model..."
+    st.progress(job.progress, text=f"{label} {job.progress:.0%}")
+    time.sleep(0.5)
+    st.rerun()
+
+
+def show_forecast(request, calibration_toggle: bool, show_paths: int) -> None:
+    """Fit, simulate, calibrate and plot a request, reusing cached steps."""
+    series_id, model_type, inference_method, end, N = request
+    try:
+        df_quarterly = load_series(series_id)
+        series_name = get_series_name(df_quarterly)
+        series_title = get_series_title(df_quarterly)
+            
+        # Show the historical data
+        st.subheader(f"Historical Data: {series_title}")
+        st.dataframe(df_quarterly.style.format({series_name: "{:.2f}"}))
+        
+        # Failed fits stay cached, so display changes show the same error
+        # without refitting; only this button fits them again
+        job = fit_job(series_id, model_type, inference_method)
+        label = "Retry Bayesian fit" if model_type == BAYESIAN else "Retry SARIMAX fit"
+        if job.failed and st.button(label):
+            job.discard()
+            job = fit_job(series_id, model_type, inference_method)
+        wait_for_fit(job, model_type)
+        
+        idata = None
+        error = job.future.exception()
+        if model_type == BAYESIAN and error is not None:
+            st.error(f"Error fitting Bayesian model: {str(error)}")
+            st.info("Falling back to SARIMAX model due to Bayesian model error.")
+            request = (series_id, SARIMAX, "nuts", end, N)
+            fallback = fit_job(series_id, SARIMAX, "nuts")
+            wait_for_fit(fallback, SARIMAX)
+            error = fallback.future.exception()
+        elif model_type == BAYESIAN:
+            _, idata = job.future.result()
+            
+            # Create Bayesian diagnostics in a collapsible section
+            with st.expander("Bayesian Model Diagnostics", expanded=False):
+                st.write("Posterior distributions of key parameters:")
+                
+                # Create diagnostic plots using Arviz
+                param_names = ["sigma_level", "sigma_trend", "sigma_seasonal", "sigma_obs"]
+                for param in param_names:
+                    trace_plot = az.plot_trace(idata, var_names=[param])
+                    st.pyplot(trace_plot[0][0].figure)
+        if error is not None:
+            raise error
+        
+        sim_array, forecast_index = simulate(request)
+
+        # Optional: Calibration
+        weights = None
+        if calibration_toggle:
+            try:
+                weights = calibrate(request)
+            except Exception as e:
+                st.warning(f"Calibration failed: {str(e)}. Proceeding without calibration.")
+
+        # Visualization
+        st.subheader("Forecast Results")
+        
+        # Create columns for forecast and probabilities
+        col1, col2 = st.columns(2)
+        
+        # Plot forecasts
+        fig_forecasts = plot_forecasts(
+            df_quarterly, 
+            sim_array, 
+            forecast_index, 
+            weights, 
+            num_paths_to_show=show_paths,
+            render="webgl"
+        )
+        col1.plotly_chart(fig_forecasts, use_container_width=True)
+
+        # Probability of drop
+        fig_drop_prob = plot_drop_probabilities(sim_array, forecast_index, weights)
+        col2.plotly_chart(fig_drop_prob, use_container_width=True)
+        
+        # Bayesian insights (only for Bayesian model)
+        if idata is not None:
+            show_components(df_quarterly, idata)
+            
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
+        st.exception(e)
+
+
+def show_components(df_quarterly: pd.DataFrame, idata) -> None:
+    """Plot the posterior mean level, trend and seasonal components."""
+    with st.expander("Bayesian Model Component Decomposition", expanded=False):
+        st.write("""
+        The Bayesian structural time series model decomposes the time series into:
+        - Level: The base value of the series
+        - Trend: The directional component
+        - Seasonality: Quarterly patterns in the data
+        """)
+        
+        # Create time component plots with Plotly
+        components_fig = go.Figure()
+        
+        # Convert index to timestamp for plotting
+        plot_dates = df_quarterly.index.to_timestamp()
+        
+        # Get component means
+        level_mean = idata.posterior["level"].mean(["chain", "draw"]).values
+        trend_mean = idata.posterior["trend"].mean(["chain", "draw"]).values
+        seasonal_mean = idata.posterior["seasonal"].mean(["chain", "draw"]).values
+        
+        # Add traces
+        components_fig.add_trace(go.Scatter(
+            x=plot_dates, y=level_mean, mode='lines', name='Level Component',
+            line=dict(color='blue')
+        ))
+        
+        components_fig.add_trace(go.Scatter(
+            x=plot_dates, y=trend_mean, mode='lines', name='Trend Component',
+            line=dict(color='red')
+        ))
+        
+        components_fig.add_trace(go.Scatter(
+            x=plot_dates, y=seasonal_mean, mode='lines', name='Seasonal Component',
+            line=dict(color='green')
+        ))
+        
+        # Update layout
+        components_fig.update_layout(
+            title="Time Series Components",
+            xaxis_title="Date",
+            yaxis_title="Value",
+            template="plotly_white"
+        )
+        
+        st.plotly_chart(components_fig, use_container_width=True)
+
+
 def main():
     st.set_page_config(
         page_title="FRED Forecaster Demo",
@@ -46,11 +264,21 @@ def main():
     # 2. User input: Model selection
     model_type = st.sidebar.radio(
         "Select Forecasting Model:",
-        ["SARIMAX (Classical)", "Bayesian Structural Time Series"],
+        [SARIMAX, BAYESIAN],
         index=0,
         help="SARIMAX is faster but less robust. Bayesian model provides more insight into uncertainty."
     )
 
+    inference_method = "nuts"
+    if model_type == BAYESIAN:
+        inference_label = st.sidebar.radio(
+            "Bayesian inference:",
+            ["ADVI (fast)", "NUTS (exact, slow)"],
+            index=0,
+            help="ADVI approximates the posterior in seconds. NUTS samples it exactly but may take a few minutes."
+        )
+        inference_method = "advi" if inference_label.startswith("ADVI") else "nuts"
+
     # 3. User input: Use calibration or not
     calibration_toggle = st.sidebar.checkbox(
         "Calibrate to CBO targets?", value=True,
@@ -80,156 +308,7 @@ def main():
             value="2028Q4"
         )
 
-    # Run the forecast
-    if st.button("Load Data and Run Forecast", type="primary"):
-        try:
-            with st.spinner("Fetching data from FRED..."):
-                df_quarterly = fetch_fred_data(fred_series_id)
-                series_name = get_series_name(df_quarterly)
-                series_title = get_series_title(df_quarterly)
-                
-            # Show the historical data
-            st.subheader(f"Historical Data: {series_title}")
-            st.dataframe(df_quarterly.style.format({series_name: "{:.2f}"}))
-            
-            # Run selected model
-            sim_array = None
-            forecast_index = None
-            
-            if model_type == "SARIMAX (Classical)":
-                # Classical SARIMAX approach
-                with st.spinner("Fitting SARIMAX model..."):
-                    results = fit_sarimax_model(df_quarterly)
-                    
-                with st.spinner("Generating simulations..."):
-                    sim_array, forecast_index = generate_simulations(
-                        results, 
-                        df_quarterly,
-                        end=forecast_end,
-                        N=num_simulations
-                    )
-                    
-            else:
-                # Bayesian approach
-                with st.spinner("Fitting Bayesian model (this may take a few minutes)..."):
-                    try:
-                        model, idata = fit_bayesian_model(df_quarterly)
-                        
-                        # Create Bayesian diagnostics in a collapsible section
-                        with st.expander("Bayesian Model Diagnostics", expanded=False):
-                            st.write("Posterior distributions of key parameters:")
-                            
-                            # Create diagnostic plots using Arviz
-                            param_names = ["sigma_level", "sigma_trend", "sigma_seasonal", "sigma_obs"]
-                            for param in param_names:
-                                trace_plot = az.plot_trace(idata, var_names=[param])
-                                st.pyplot(trace_plot[0][0].figure)
-                    
-                    except Exception as e:
-                        st.error(f"Error fitting Bayesian model: {str(e)}")
-                        st.info("Falling back to SARIMAX model due to Bayesian model error.")
-                        
-                        # Fallback to SARIMAX
-                        with st.spinner("Fitting SARIMAX model instead..."):
-                            results = fit_sarimax_model(df_quarterly)
-                            
-                        with st.spinner("Generating simulations..."):
-                            sim_array, forecast_index = generate_simulations(
-                                results, 
-                                df_quarterly,
-                                end=forecast_end,
-                                N=num_simulations
-                            )
-                    else:
-                        # If Bayesian model succeeded, generate simulations
-                        with st.spinner("Generating Bayesian simulations..."):
-                            sim_array, forecast_index = generate_bayesian_simulations(
-                                model, 
-                                idata, 
-                                df_quarterly,
-                                end=forecast_end,
-                                N=num_simulations
-                            )
-
-            # Optional: Calibration
-            weights = None
-            if calibration_toggle:
-                try:
-                    with st.spinner("Calibrating simulations to CBO targets..."):
-                        weights = calibrate_simulations(sim_array, forecast_index)
-                except Exception as e:
-                    st.warning(f"Calibration failed: {str(e)}. Proceeding without calibration.")
-
-            # Visualization
-            st.subheader("Forecast Results")
-            
-            # Create columns for forecast and probabilities
-            col1, col2 = st.columns(2)
-            
-            # Plot forecasts
-            fig_forecasts = plot_forecasts(
-                df_quarterly, 
-                sim_array, 
-                forecast_index, 
-                weights, 
-                num_paths_to_show=show_paths
-            )
-            col1.plotly_chart(fig_forecasts, use_container_width=True)
-
-            # Probability of drop
-            fig_drop_prob = plot_drop_probabilities(sim_array, forecast_index, weights)
-            col2.plotly_chart(fig_drop_prob, use_container_width=True)
-            
-            # Bayesian insights (only for Bayesian model)
-            if model_type == "Bayesian Structural Time Series" and 'model' in locals() and 'idata' in locals():
-                with st.expander("Bayesian Model Component Decomposition", expanded=False):
-                    st.write("""
-                    The Bayesian structural time series model decomposes the time series into:
-                    - Level: The base value of the series
-                    - Trend: The directional component
-                    - Seasonality: Quarterly patterns in the data
-                    """)
-                    
-                    # Create time component plots with Plotly
-                    components_fig = go.Figure()
-                    
-                    # Convert index to timestamp for plotting
-                    plot_dates = df_quarterly.index.to_timestamp()
-                    
-                    # Get component means
-                    level_mean = idata.posterior["level"].mean(["chain", "draw"]).values
-                    trend_mean = idata.posterior["trend"].mean(["chain", "draw"]).values
-                    seasonal_mean = idata.posterior["seasonal"].mean(["chain", "draw"]).values
-                    
-                    # Add traces
-                    components_fig.add_trace(go.Scatter(
-                        x=plot_dates, y=level_mean, mode='lines', name='Level Component',
-                        line=dict(color='blue')
-                    ))
-                    
-                    components_fig.add_trace(go.Scatter(
-                        x=plot_dates, y=trend_mean, mode='lines', name='Trend Component',
-                        line=dict(color='red')
-                    ))
-                    
-                    components_fig.add_trace(go.Scatter(
-                        x=plot_dates, y=seasonal_mean, mode='lines', name='Seasonal Component',
-                        line=dict(color='green')
-                    ))
-                    
-                    # Update layout
-                    components_fig.update_layout(
-                        title="Time Series Components",
-                        xaxis_title="Date",
-                        yaxis_title="Value",
-                        template="plotly_white"
-                    )
-                    
-                    st.plotly_chart(components_fig, use_container_width=True)
-                
-        except Exception as e:
-            st.error(f"Error: {str(e)}")
-            st.exception(e)
+    run = st.button("Load Data and Run Forecast", type="primary")
 
     # About section
     st.sidebar.markdown("---")
@@ -245,6 +324,15 @@ def main():
     )
     st.sidebar.markdown("© 2025 fred_forecaster")
 
+    # The forecast is redrawn from the caches whenever a display or
+    # calibration option changes, and only refitted for a new request
+    if run:
+        st.session_state.request = (
+            fred_series_id, model_type, inference_method, forecast_end, int(num_simulations)
+        )
+    if "request" in st.session_state:
+        show_forecast(st.session_state.request, calibration_toggle, show_paths)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,10 +1,112 @@
 """Time series forecasting for FRED economic data."""
 
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 __version__ = "0.1.0"
 
-# Import user-facing classes and functions
-from .data import fetch_fred_data, get_series_name, get_series_title
-from .models.sarimax import fit_sarimax_model, generate_simulations
-from .models.bayesian import fit_bayesian_model, generate_bayesian_simulations
-from .calibration import calibrate_simulations
-from .visualization import plot_forecasts, plot_drop_probabilities
\ No newline at end of file
+# User-facing classes and functions, mapped to the submodule defining them.
+# Submodules are imported on first attribute access, so that importing the
+# package does not pull in PyMC, ArviZ, statsmodels or Plotly.
+_LAZY_IMPORTS = {
+    "fetch_fred_data": ".data",
+    "fetch_fred_data_many": ".data",
+    "fetch_fred_data_many_async": ".data",
+    "get_series_name": ".data",
+    "get_series_title": ".data",
+    "FredCache": ".cache",
+    "FredClient": ".client",
+    "ModelStore": ".store",
+    "run_batch": ".batch",
+    "fit_and_simulate_many": ".batch",
+    "fit_sarimax_model": ".models.sarimax",
+    "generate_simulations": ".models.sarimax",
+    "select_sarimax_order": ".models.sarimax",
+    "update_sarimax_model": ".models.sarimax",
+    "fit_bayesian_model": ".models.bayesian",
+    "generate_bayesian_simulations": ".models.bayesian",
+    "fit_bayesian_kalman_model": ".models.bayesian",
+    "sample_latent_states": ".models.bayesian",
+    "compare_posteriors": ".models.bayesian",
+    "ForecastState": ".models.bayesian",
+    "ModelFactory": ".models.factory",
+    "share_compile_cache": ".models.factory",
+    "iter_simulations": ".streaming",
+    "iter_bayesian_simulations": ".streaming",
+    "summarize_chunks": ".streaming",
+    "MeanAccumulator": ".streaming",
+    "QuantileSketch": ".streaming",
+    "DeclineAccumulator": ".streaming",
+    "open_simulation_array": ".io",
+    "save_simulations": ".io",
+    "load_simulations": ".io",
+    "Span": ".instrumentation",
+    "add_hook": ".instrumentation",
+    "remove_hook": ".instrumentation",
+    "record_spans": ".instrumentation",
+    "calibrate_simulations": ".calibration",
+    "calibrate_scenarios": ".calibration",
+    "weighted_quantiles": ".stats",
+    "summarize_simulations": ".stats",
+    "decline_probabilities": ".stats",
+    "plot_forecasts": ".visualization",
+    "plot_drop_probabilities": ".visualization",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        # Cache on the package so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
+
+
+if TYPE_CHECKING:
+    from .data import (
+        fetch_fred_data,
+        fetch_fred_data_many,
+        fetch_fred_data_many_async,
+        get_series_name,
+        get_series_title,
+    )
+    from .cache import FredCache
+    from .client import FredClient
+    from .store import ModelStore
+    from .batch import run_batch, fit_and_simulate_many
+    from .models.sarimax import (
+        fit_sarimax_model,
+        generate_simulations,
+        select_sarimax_order,
+        update_sarimax_model,
+    )
+    from .models.bayesian import (
+        fit_bayesian_model,
+        generate_bayesian_simulations,
+        fit_bayesian_kalman_model,
+        sample_latent_states,
+        compare_posteriors,
+        ForecastState,
+    )
+    from .models.factory import ModelFactory, share_compile_cache
+    from .streaming import (
+        iter_simulations,
+        iter_bayesian_simulations,
+        summarize_chunks,
+        MeanAccumulator,
+        QuantileSketch,
+        DeclineAccumulator,
+    )
+    from .io import open_simulation_array, save_simulations, load_simulations
+    from .instrumentation import Span, add_hook, remove_hook, record_spans
+    from .calibration import calibrate_simulations, calibrate_scenarios
+    from .stats import weighted_quantiles, summarize_simulations, decline_probabilities
+    from .visualization import plot_forecasts, plot_drop_probabilities
@@ -0,0 +1,269 @@
+"""Batch fitting and simulation of many series with a pluggable executor."""
+
+import traceback
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+from .instrumentation import instrumented
+from .store import ModelStore
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one item of a batch.
+
+    Attributes
+    ----------
+    key : str
+        Identifier of the item, e.g. the series ID
+    value : Any
+        Return value of the task, or None if it failed
+    error : str, optional
+        Exception type and message if the task failed
+    traceback : str, optional
+        Formatted traceback if the task failed
+    """
+
+    key: str
+    value: Any = None
+    error: Optional[str] = None
+    traceback: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the task succeeded."""
+        return self.error is None
+
+
+class SerialExecutor(Executor):
+    """Executor that runs each task immediately in the calling process."""
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+@contextmanager
+def get_executor(
+    executor: Union[str, Executor] = "process",
+    max_workers: Optional[int] = None,
+    address: Optional[str] = None
+) -> Iterator[Executor]:
+    """
+    Create an executor by name, shutting it down on exit.
+
+    Parameters
+    ----------
+    executor : str or Executor, optional
+        One of "serial", "thread", "process" (default) or "dask", or an
+        existing ``concurrent.futures.Executor``, which is used as is and
+        left running.
+    max_workers : int, optional
+        Number of workers. If None, uses the number of CPUs.
+    address : str, optional
+        Scheduler address for the "dask" executor. If None, a local
+        cluster with ``max_workers`` worker processes is started.
+
+    Yields
+    ------
+    Executor
+        The executor
+
+    Raises
+    ------
+    ValueError
+        If the executor name is unknown
+    """
+    if isinstance(executor, Executor):
+        yield executor
+        return
+
+    if executor == "serial":
+        yield SerialExecutor()
+    elif executor == "thread":
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            yield pool
+    elif executor == "process":
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            yield pool
+    elif executor == "dask":
+        try:
+            from dask.distributed import Client, LocalCluster
+        except ImportError as e:
+            raise ImportError(
+                "The dask executor requires dask.distributed. "
+                "Install it with `pip install fred-forecaster[distributed]`."
+            ) from e
+        if address is None:
+            with LocalCluster(n_workers=max_workers, threads_per_worker=1) as cluster:
+                with Client(cluster) as client:
+                    yield client.get_executor()
+        else:
+            with Client(address) as client:
+                yield client.get_executor()
+    else:
+        raise ValueError(
+            f"Unknown executor: {executor!r}. "
+            f"Use 'serial', 'thread', 'process', 'dask' or an Executor."
+        )
+
+
+def run_batch(
+    fn: Callable,
+    items: Union[Mapping[str, Any], Sequence[Any]],
+    executor: Union[str, Executor] = "process",
+    max_workers: Optional[int] = None,
+    **kwargs
+) -> List[BatchResult]:
+    """
+    Apply a function to many items in parallel, isolating failures.
+
+    Parameters
+    ----------
+    fn : Callable
+        Function called as ``fn(item, **kwargs)``. For process-based
+        executors it must be picklable, i.e. defined at module level.
+    items : Mapping[str, Any] or Sequence[Any]
+        Items keyed by name, or a sequence whose positions (as strings)
+        are used as keys
+    executor : str or Executor, optional
+        Executor name or instance, see ``get_executor`` (default: "process")
+    max_workers : int, optional
+        Number of workers. If None, uses the number of CPUs.
+    **kwargs
+        Extra keyword arguments passed to every call
+
+    Returns
+    -------
+    List[BatchResult]
+        One result per item, in input order. A task that raises yields a
+        result with ``error`` set instead of aborting the batch.
+    """
+    if not isinstance(items, Mapping):
+        items = {str(i): item for i, item in enumerate(items)}
+
+    with get_executor(executor, max_workers) as pool:
+        futures = [
+            (key, pool.submit(_call_isolated, fn, key, item, kwargs))
+            for key, item in items.items()
+        ]
+        results = []
+        for key, future in futures:
+            try:
+                results.append(future.result())
+            except BaseException as e:
+                # The worker itself failed, e.g. a process was killed
+                results.append(_failure(key, e))
+    return results
+
+
+@instrumented
+def fit_and_simulate_many(
+    series: Mapping[str, pd.DataFrame],
+    model: str = "sarimax",
+    end: str = "2028Q4",
+    N: int = 1000,
+    executor: Union[str, Executor] = "process",
+    max_workers: Optional[int] = None,
+    store: Optional[ModelStore] = None
+) -> List[BatchResult]:
+    """
+    Fit a model to each series and simulate it, in parallel.
+
+    Parameters
+    ----------
+    series : Mapping[str, pd.DataFrame]
+        Quarterly DataFrames keyed by series ID, as returned by
+        ``fetch_fred_data_many``
+    model : str, optional
+        "sarimax" (default), "bayesian" or "bayesian_kalman"
+    end : str
+        End period for forecast in format 'YYYYQN' (e.g., '2028Q4')
+    N : int
+        Number of simulations to generate per series
+    executor : str or Executor, optional
+        Executor name or instance, see ``get_executor`` (default: "process")
+    max_workers : int, optional
+        Number of workers. If None, uses the number of CPUs.
+    store : ModelStore, optional
+        Fitted-model store shared by the workers to skip refits
+
+    Returns
+    -------
+    List[BatchResult]
+        One result per series, in input order, whose value is the
+        ``(sim_array, forecast_index)`` pair of the series
+    """
+    return run_batch(
+        _fit_and_simulate,
+        series,
+        executor=executor,
+        max_workers=max_workers,
+        model=model,
+        end=end,
+        N=N,
+        store=store,
+    )
+
+
+def _fit_and_simulate(
+    df_quarterly: pd.DataFrame,
+    model: str,
+    end: str,
+    N: int,
+    store: Optional[ModelStore]
+):
+    """Fit one series and simulate it."""
+    if model == "sarimax":
+        from .models.sarimax import fit_sarimax_model, generate_simulations
+
+        results = fit_sarimax_model(df_quarterly, store=store)
+        return generate_simulations(results, df_quarterly, end=end, N=N)
+
+    from .models import bayesian
+    from .models.factory import default_factory
+
+    # Only the forecast state is simulated, so the full traces are dropped.
+    # Series fitted by the same worker process share compiled models.
+    if model == "bayesian":
+        pm_model, idata = bayesian.fit_bayesian_model(
+            df_quarterly, store=store, compact=True, factory=default_factory()
+        )
+    elif model == "bayesian_kalman":
+        pm_model, idata = bayesian.fit_bayesian_kalman_model(
+            df_quarterly, store=store, compact=True, factory=default_factory()
+        )
+    else:
+        raise ValueError(
+            f"Unknown model: {model!r}. Use 'sarimax', 'bayesian' or 'bayesian_kalman'."
+        )
+    return bayesian.generate_bayesian_simulations(
+        pm_model, idata, df_quarterly, end=end, N=N
+    )
+
+
+def _call_isolated(fn: Callable, key: str, item: Any, kwargs: dict) -> BatchResult:
+    """Run one task, capturing any exception in the result."""
+    try:
+        return BatchResult(key=key, value=fn(item, **kwargs))
+    except Exception as e:
+        return _failure(key, e)
+
+
+def _failure(key: str, error: BaseException) -> BatchResult:
+    return BatchResult(
+        key=key,
+        error=f"{type(error).__name__}: {error}",
+        traceback="".join(
+            traceback.format_exception(type(error), error, error.__traceback__)
+        ),
+    )
@@ -0,0 +1,186 @@
+"""Persistent on-disk cache for FRED observations and series metadata."""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+import pandas as pd
+from typing import Any, Dict, Optional, Tuple
+
+from .optional import import_pyarrow
+
+
+class FredCache:
+    """
+    Local cache of raw FRED observations and series metadata.
+
+    Each series is stored as one Parquet file holding the observation dates
+    and values, with the series metadata and download time in the file's
+    schema metadata. Entries older than ``ttl`` seconds are treated as
+    missing, and the least recently used files are evicted once the cache
+    grows beyond ``max_bytes``.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Cache directory. If None, uses the FRED_FORECASTER_CACHE_DIR
+        environment variable, falling back to ~/.cache/fred_forecaster.
+    ttl : float, optional
+        Seconds for which an entry is considered fresh (default: one day).
+        If None, entries never expire.
+    max_bytes : int, optional
+        Upper bound on the total size of the cache files (default: 512 MB).
+        If None, the cache is never pruned.
+    offline : bool, optional
+        If True, serve every cached entry regardless of age and never
+        go to the network (default: False).
+    """
+
+    _METADATA_KEY = b"fred_forecaster"
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl: Optional[float] = 24 * 60 * 60,
+        max_bytes: Optional[int] = 512 * 1024 ** 2,
+        offline: bool = False
+    ):
+        if directory is None:
+            directory = os.getenv(
+                "FRED_FORECASTER_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "fred_forecaster"),
+            )
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, series_id: str) -> str:
+        """Return the cache file path for a series."""
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", series_id)
+        # Keep IDs that only differ in replaced characters apart
+        if safe_id != series_id:
+            digest = hashlib.sha1(series_id.encode()).hexdigest()[:8]
+            safe_id = f"{safe_id}-{digest}"
+        return os.path.join(self.directory, f"{safe_id}.parquet")
+
+    def get(self, series_id: str) -> Optional[Tuple[pd.Series, Dict[str, Any]]]:
+        """
+        Look up a series in the cache.
+
+        Parameters
+        ----------
+        series_id : str
+            FRED series identifier
+
+        Returns
+        -------
+        Tuple[pd.Series, Dict[str, Any]] or None
+            Raw observations and series metadata, or None if the series is
+            not cached, its entry has expired, or the file at its path
+            belongs to a different series.
+        """
+        _, pq = import_pyarrow()
+        path = self.path(series_id)
+        # Another thread or process may evict the file at any point
+        try:
+            table = pq.read_table(path)
+        except FileNotFoundError:
+            return None
+        meta = json.loads(table.schema.metadata[self._METADATA_KEY])
+        if meta.get("series_id") != series_id:
+            return None
+        if (
+            not self.offline
+            and self.ttl is not None
+            and time.time() - meta["fetched_at"] > self.ttl
+        ):
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        df = table.to_pandas()
+        series_data = pd.Series(
+            df["value"].to_numpy(),
+            index=pd.DatetimeIndex(df["date"]),
+            name=series_id,
+        )
+        return series_data, meta["series_info"]
+
+    def put(self, series_id: str, series_data: pd.Series, series_info: Any) -> None:
+        """
+        Store raw observations and metadata for a series.
+
+        Parameters
+        ----------
+        series_id : str
+            FRED series identifier
+        series_data : pd.Series
+            Observations indexed by date, as returned by ``Fred.get_series``
+        series_info : Mapping
+            Series metadata, as returned by ``Fred.get_series_info``
+        """
+        pa, pq = import_pyarrow()
+        table = pa.table({
+            "date": pd.to_datetime(series_data.index).to_numpy(),
+            "value": series_data.to_numpy(dtype=float),
+        })
+        meta = {
+            "series_id": series_id,
+            "fetched_at": time.time(),
+            "series_info": {k: str(v) for k, v in dict(series_info).items()},
+        }
+        table = table.replace_schema_metadata(
+            {self._METADATA_KEY: json.dumps(meta).encode()}
+        )
+
+        # Write to a temporary file first so readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, self.path(series_id))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        self.prune()
+
+    def prune(self) -> None:
+        """Evict least recently used entries until the cache fits in max_bytes."""
+        if self.max_bytes is None:
+            return
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".parquet"):
+                continue
+            # Concurrent prunes may remove the same files
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".parquet"):
+                os.remove(os.path.join(self.directory, name))
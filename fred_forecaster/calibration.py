@@ -3,13 +3,18 @@
 import numpy as np
 import pandas as pd
 from scipy.optimize import minimize
-from typing import Dict, List, Optional
+from scipy.special import logsumexp
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
+from .instrumentation import annotate, instrumented
 
+
+@instrumented
 def calibrate_simulations(
     sim_array: np.ndarray, 
     forecast_index: pd.PeriodIndex,
-    targets: Optional[Dict[int, float]] = None
+    targets: Optional[Dict[int, float]] = None,
+    method: str = "slsqp"
 ) -> np.ndarray:
     """
     Reweight simulation paths to match external targets in Q4 of each year.
@@ -17,12 +22,23 @@ def calibrate_simulations(
     Parameters
     ----------
     sim_array : np.ndarray
-        Array of shape (steps, N) containing N simulation paths
+        Array of shape (steps, N) containing N simulation paths. It may be
+        a float32 or memory-mapped array, of which only the Q4 rows with a
+        target are read.
     forecast_index : pd.PeriodIndex
         Index of time periods corresponding to sim_array rows
     targets : Dict[int, float], optional
         Dictionary mapping years to target values for Q4.
         If None, uses default CBO targets.
+    method : str, optional
+        Calibration method (default: "slsqp"):
+        
+        - "slsqp": least-squares fit of the weighted Q4 means to the targets,
+          with one free weight per simulation path.
+        - "entropy": minimum-divergence (entropy) reweighting that matches
+          the targets exactly while staying as close as possible to equal
+          weights. It solves the dual problem with one variable per target
+          year, so its cost grows linearly in N.
         
     Returns
     -------
@@ -34,7 +50,7 @@ def calibrate_simulations(
     RuntimeError
         If the optimization fails to converge
     ValueError
-        If no valid calibration years are found
+        If no valid calibration years are found, or the method is unknown
     """
     # Hard-coded CBO annual forecasts (in trillions)
     if targets is None:
@@ -46,40 +62,386 @@ def calibrate_simulations(
             2028: 42.748
         }
 
-    df_fc = pd.DataFrame(sim_array, index=forecast_index)
+    S, T = _target_matrix(sim_array, forecast_index, targets)
+
+    if method == "slsqp":
+        return _calibrate_slsqp(S, T)
+    if method == "entropy":
+        return _calibrate_entropy(S, T)
+    raise ValueError(
+        f"Unknown calibration method: {method!r}. Use 'slsqp' or 'entropy'."
+    )
+
+
+@instrumented
+def calibrate_scenarios(
+    sim_array: np.ndarray,
+    forecast_index: pd.PeriodIndex,
+    scenarios: Union[Sequence[Dict[int, float]], Mapping[str, Dict[int, float]]],
+    method: str = "entropy"
+) -> np.ndarray:
+    """
+    Reweight simulation paths to each of many sets of Q4 targets.
+    
+    Equivalent to calling ``calibrate_simulations`` once per scenario, but
+    the target rows are extracted from the ensemble once. With "entropy",
+    all scenarios sharing the same target years are solved together by a
+    batched Newton iteration on the dual, whose cost per iteration is one
+    matrix product for the whole batch. With "slsqp", each scenario is
+    warm-started from the solution of the closest scenario solved before.
+    
+    Parameters
+    ----------
+    sim_array : np.ndarray
+        Array of shape (steps, N) containing N simulation paths
+    forecast_index : pd.PeriodIndex
+        Index of time periods corresponding to sim_array rows
+    scenarios : Sequence or Mapping of Dict[int, float]
+        Target dictionaries mapping years to Q4 target values, e.g. one per
+        fiscal scenario, optionally keyed by scenario name
+    method : str, optional
+        "entropy" (default) or "slsqp", see ``calibrate_simulations``
+        
+    Returns
+    -------
+    np.ndarray
+        Weight matrix of shape (len(scenarios), N) whose rows sum to 1, in
+        the order of ``scenarios``
+        
+    Raises
+    ------
+    RuntimeError
+        If the optimization fails to converge for any scenario
+    ValueError
+        If there are no scenarios, a scenario has no valid calibration year,
+        or the method is unknown
+    """
+    if method not in ("slsqp", "entropy"):
+        raise ValueError(
+            f"Unknown calibration method: {method!r}. Use 'slsqp' or 'entropy'."
+        )
+    names = list(scenarios) if isinstance(scenarios, Mapping) else list(range(len(scenarios)))
+    scenarios = list(scenarios.values()) if isinstance(scenarios, Mapping) else list(scenarios)
+    if not scenarios:
+        raise ValueError("No scenarios to calibrate")
+    
+    # The rows of every target year, read from the ensemble once
+    all_years, all_rows = _target_rows(
+        forecast_index, set().union(*(s.keys() for s in scenarios))
+    )
+    S_all = np.asarray(sim_array[all_rows, :], dtype=float)
+    position = {year: i for i, year in enumerate(all_years)}
+    
+    # Scenarios targeting the same years share a target matrix
+    groups: Dict[Tuple[int, ...], List[int]] = {}
+    for i, targets in enumerate(scenarios):
+        years = tuple(year for year in all_years if year in targets)
+        if not years:
+            raise ValueError(
+                f"No valid calibration years found for scenario {names[i]!r}: "
+                f"target years {sorted(targets)}"
+            )
+        groups.setdefault(years, []).append(i)
+    
+    weights = np.empty((len(scenarios), sim_array.shape[1]))
+    failed = []
+    for years, members in groups.items():
+        S = S_all[[position[year] for year in years]]
+        T = np.array([[scenarios[i][year] for year in years] for i in members], dtype=float)
+        if method == "entropy":
+            W, ok = _calibrate_entropy_batch(S, T)
+            failed += [names[members[j]] for j in np.flatnonzero(~ok)]
+        else:
+            W = _calibrate_slsqp_sweep(S, T)
+        weights[members] = W
+    
+    if failed:
+        raise RuntimeError(
+            f"Calibration failed for scenarios {failed}. Targets may lie "
+            f"outside the range spanned by the simulations."
+        )
+    annotate(method=method, scenarios=len(scenarios), groups=len(groups))
+    return weights
+
+
+def _target_matrix(
+    sim_array: np.ndarray,
+    forecast_index: pd.PeriodIndex,
+    targets: Dict[int, float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract the Q4 rows that have a target, and the matching target values.
+    
+    Returns
+    -------
+    S : np.ndarray
+        Array of shape (num_years, N) with the simulated Q4 values
+    T : np.ndarray
+        Array of shape (num_years,) with the target values
+    """
+    years, rows = _target_rows(forecast_index, targets)
+    S = np.asarray(sim_array[rows, :], dtype=float)
+    T = np.array([targets[year] for year in years], dtype=float)
+    return S, T
+
+
+def _target_rows(
+    forecast_index: pd.PeriodIndex,
+    targets: Iterable[int]
+) -> Tuple[List[int], np.ndarray]:
+    """
+    Find the Q4 rows of the forecast whose year has a target.
+    
+    Returns
+    -------
+    years : List[int]
+        The target years covered by the forecast, in forecast order
+    rows : np.ndarray
+        The matching rows of sim_array
+    """
+    targets = set(targets)
     # Filter to Q4 only.
-    df_Q4 = df_fc[df_fc.index.quarter == 4]
-    S = df_Q4.to_numpy()  # shape: (num_years, N)
-    calib_years = df_Q4.index.year.to_numpy()
+    is_q4 = np.asarray(forecast_index.quarter == 4)
+    calib_years = np.asarray(forecast_index.year)[is_q4]
     
     valid_indices = [i for i, y in enumerate(calib_years) if y in targets]
     if not valid_indices:
         raise ValueError(
             f"No valid calibration years found. Available years: {list(calib_years)}, "
-            f"target years: {list(targets.keys())}"
+            f"target years: {sorted(targets)}"
         )
 
-    def ssq_obj(w, S, years, targets):
-        valid_indices = [i for i, y in enumerate(years) if y in targets]
-        T = np.array([targets[years[i]] for i in valid_indices])
-        weighted_q4 = S[valid_indices, :].dot(w)
+    rows = np.flatnonzero(is_q4)[valid_indices]
+    return [int(calib_years[i]) for i in valid_indices], rows
+
+
+def _calibrate_slsqp(
+    S: np.ndarray,
+    T: np.ndarray,
+    w0: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Least-squares calibration with one free weight per simulation path."""
+
+    def ssq_obj(w):
+        weighted_q4 = S.dot(w)
         return np.sum((weighted_q4 - T) ** 2)
 
-    N_sims = sim_array.shape[1]
-    w0 = np.ones(N_sims) / N_sims
+    N_sims = S.shape[1]
+    if w0 is None:
+        w0 = np.ones(N_sims) / N_sims
     constraints = [{"type": "eq", "fun": lambda w: np.sum(w) - 1.0}]
     bounds = [(0.0, None)] * N_sims
 
     res = minimize(
-        fun=lambda w: ssq_obj(w, S, calib_years, targets),
+        fun=ssq_obj,
         x0=w0,
         method="SLSQP",
         bounds=bounds,
         constraints=constraints,
         options={"maxiter": 1000, "ftol": 1e-12},
     )
+    annotate(method="slsqp", iterations=res.nit, function_evals=res.nfev)
     if not res.success:
         raise RuntimeError(f"Calibration failed: {res.message}")
 
     weights = res.x
-    return weights
\ No newline at end of file
+    return weights
+
+
+def _calibrate_entropy(
+    S: np.ndarray,
+    T: np.ndarray,
+    lam0: Optional[np.ndarray] = None,
+    tol: float = 1e-8
+) -> np.ndarray:
+    """
+    Minimum-divergence calibration solved in the dual.
+    
+    The weights minimizing the Kullback-Leibler divergence from equal
+    weights subject to ``S @ w = T`` have the form ``w ∝ exp(S.T @ lam)``,
+    where ``lam`` minimizes the convex dual ``log(mean(exp(S.T @ lam))) -
+    lam @ T``. Rows are centered on their targets and scaled to unit
+    spread first so the Newton steps are well conditioned.
+    """
+    Z = (S - T[:, np.newaxis]) / _row_scale(S)[:, np.newaxis]
+
+    def dual(lam):
+        log_w = Z.T.dot(lam)
+        log_norm = logsumexp(log_w)
+        w = np.exp(log_w - log_norm)
+        # Objective, gradient (weighted moment residual) and weights
+        return log_norm, Z.dot(w), w
+
+    def fun(lam):
+        f, g, _ = dual(lam)
+        return f, g
+
+    def hess(lam):
+        _, g, w = dual(lam)
+        return (Z * w).dot(Z.T) - np.outer(g, g)
+
+    if lam0 is None:
+        lam0 = np.zeros(len(T))
+    res = minimize(
+        fun=fun,
+        x0=lam0,
+        jac=True,
+        hess=hess,
+        method="trust-exact",
+        options={"gtol": tol, "maxiter": 200},
+    )
+    annotate(method="entropy", iterations=res.nit, function_evals=res.nfev)
+    _, residual, weights = dual(res.x)
+    if not np.all(np.isfinite(weights)) or np.max(np.abs(residual)) > np.sqrt(tol):
+        raise RuntimeError(
+            f"Calibration failed: {res.message} Targets may lie outside "
+            f"the range spanned by the simulations."
+        )
+
+    return weights
+
+
+def _row_scale(S: np.ndarray) -> np.ndarray:
+    """Spread of each target row, used to standardize the dual."""
+    scale = S.std(axis=1)
+    scale[scale == 0] = 1.0
+    return scale
+
+
+def _calibrate_slsqp_sweep(S: np.ndarray, T: np.ndarray) -> np.ndarray:
+    """Least-squares calibration of each row of T, warm-started from neighbours."""
+    scale = _row_scale(S)
+    W = np.empty((len(T), S.shape[1]))
+    for i in range(len(T)):
+        w0 = None
+        if i > 0:
+            # Start from the closest scenario already solved
+            distance = np.abs((T[:i] - T[i]) / scale).sum(axis=1)
+            w0 = W[np.argmin(distance)]
+        W[i] = _calibrate_slsqp(S, T[i], w0=w0)
+    return W
+
+
+def _calibrate_entropy_batch(
+    S: np.ndarray,
+    T: np.ndarray,
+    tol: float = 1e-8,
+    max_iter: int = 200
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum-divergence calibration of each row of T, solved jointly.
+    
+    Runs damped Newton steps on the duals of all scenarios at once (see
+    ``_calibrate_entropy``). Since ``w ∝ exp(Z.T @ lam)`` does not change
+    when Z is shifted by a constant, the scenarios share the standardized
+    matrix Z and differ only in their standardized targets C. The central
+    scenario is solved first, and the others start from its solution moved
+    by the first-order sensitivity ``d lam / d C = H^-1`` of the dual.
+    
+    Returns
+    -------
+    W : np.ndarray
+        Shape (m, N), the weights of each of the m scenarios
+    ok : np.ndarray
+        Shape (m,), whether each scenario converged
+    """
+    scale = _row_scale(S)
+    Z = (S - S.mean(axis=1, keepdims=True)) / scale[:, np.newaxis]
+    C = (T - S.mean(axis=1)) / scale
+    m, k = C.shape
+    
+    lam0 = np.zeros((m, k))
+    if m > 1:
+        center = C.mean(axis=0, keepdims=True)
+        lam_c, W_c, g_c = _entropy_newton(Z, center, np.zeros((1, k)), tol, max_iter)
+        if np.abs(g_c).max() <= np.sqrt(tol):
+            H = _entropy_hessian(Z, W_c, g_c + center)[0]
+            lam0 = lam_c + np.linalg.solve(H, (C - center).T).T
+    
+    _, W, g = _entropy_newton(Z, C, lam0, tol, max_iter)
+    ok = np.all(np.isfinite(W), axis=1) & (np.abs(g).max(axis=1) <= np.sqrt(tol))
+    return W, ok
+
+
+def _entropy_newton(
+    Z: np.ndarray,
+    C: np.ndarray,
+    lam: np.ndarray,
+    tol: float,
+    max_iter: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Damped Newton iteration on a batch of entropy calibration duals."""
+    m, k = C.shape
+    
+    def evaluate(lam, c):
+        log_w = lam.dot(Z)
+        shift = log_w.max(axis=1, keepdims=True)
+        w = np.exp(log_w - shift)
+        total = w.sum(axis=1, keepdims=True)
+        w /= total
+        log_norm = (shift + np.log(total))[:, 0]
+        # Objective, gradient (weighted moment residual) and weights
+        return log_norm - np.sum(lam * c, axis=1), w.dot(Z.T) - c, w
+    
+    lam = lam.copy()
+    f, g, W = evaluate(lam, C)
+    active = np.abs(g).max(axis=1) > tol
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if len(idx) == 0:
+            break
+        
+        # One stacked (len(idx), k, k) solve for all active scenarios
+        H = _entropy_hessian(Z, W[idx], g[idx] + C[idx])
+        step = np.linalg.solve(H, g[idx][:, :, np.newaxis])[:, :, 0]
+        decrement = np.sum(g[idx] * step, axis=1)
+        
+        # Backtracking line search, for all active scenarios at once
+        t = np.ones(len(idx))
+        pending = np.ones(len(idx), dtype=bool)
+        for _ in range(60):
+            p = np.flatnonzero(pending)
+            trial = lam[idx[p]] - t[p, np.newaxis] * step[p]
+            f_t, g_t, W_t = evaluate(trial, C[idx[p]])
+            accept = np.isfinite(f_t) & (f_t <= f[idx[p]] - 1e-4 * t[p] * decrement[p])
+            done = idx[p[accept]]
+            lam[done], f[done], g[done], W[done] = (
+                trial[accept], f_t[accept], g_t[accept], W_t[accept]
+            )
+            pending[p[accept]] = False
+            t[p[~accept]] *= 0.5
+            if not pending.any():
+                break
+        
+        # Converged, or no further decrease possible at machine precision
+        active[idx] = (np.abs(g[idx]).max(axis=1) > tol) & ~pending
+    
+    return lam, W, g
+
+
+def _entropy_hessian(Z: np.ndarray, W: np.ndarray, mean: np.ndarray) -> np.ndarray:
+    """
+    Dual Hessians of a batch of scenarios: weighted covariances of the rows of Z.
+    
+    Each Hessian is built from one weighted copy of Z at a time, so memory
+    stays O(kN) however many scenarios are batched.
+    
+    Parameters
+    ----------
+    Z : np.ndarray
+        Shape (k, N), the standardized target rows
+    W : np.ndarray
+        Shape (m, N), the weights of each scenario
+    mean : np.ndarray
+        Shape (m, k), the weighted means of the rows of Z
+    
+    Returns
+    -------
+    np.ndarray
+        Shape (m, k, k)
+    """
+    k = Z.shape[0]
+    H = np.stack([(Z * w).dot(Z.T) for w in W])
+    H -= mean[:, :, np.newaxis] * mean[:, np.newaxis, :]
+    H[:, np.arange(k), np.arange(k)] += 1e-12
+    return H
@@ -0,0 +1,330 @@
+"""Command-line batch runner writing forecasts as partitioned Parquet."""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .batch import BatchResult, run_batch
+from .optional import import_pyarrow
+
+SUCCESS_MARKER = "_SUCCESS"
+
+DEFAULTS = {
+    "output": "forecasts",
+    "model": "sarimax",
+    "end": "2028Q4",
+    "N": 1000,
+    "probs": [0.05, 0.5, 0.95],
+    "start_year": 2025,
+    "executor": "process",
+    "max_workers": None,
+    "cache_dir": None,
+    "store_dir": None,
+    "compile_dir": None,
+    "calibration": {},
+}
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """
+    Read a run configuration from a JSON or TOML file.
+
+    Keys
+    ----
+    series : List[str]
+        FRED series identifiers (required)
+    output : str
+        Output directory (default: "forecasts")
+    model : str
+        "sarimax" (default), "bayesian" or "bayesian_kalman"
+    end : str
+        End period of the forecast (default: "2028Q4")
+    N : int
+        Number of simulations per series (default: 1000)
+    probs : List[float]
+        Quantile levels of the summaries (default: [0.05, 0.5, 0.95])
+    start_year : int
+        First year of the decline probabilities (default: 2025)
+    executor : str
+        "serial", "thread", "process" (default) or "dask"
+    max_workers : int
+        Number of series processed at the same time
+    cache_dir : str
+        Directory of a ``FredCache`` for the downloads
+    store_dir : str
+        Directory of a ``ModelStore`` for the fits
+    compile_dir : str
+        PyTensor compile cache shared by the worker processes of Bayesian
+        fits, see ``share_compile_cache``
+    calibration : Dict
+        ``method`` ("slsqp" or "entropy") and ``targets`` mapping series
+        IDs to ``{year: Q4 target}``. Series without targets get equal
+        weights.
+
+    Parameters
+    ----------
+    path : str
+        Path of a ``.json`` or ``.toml`` file
+
+    Returns
+    -------
+    Dict[str, Any]
+        The configuration with defaults filled in
+
+    Raises
+    ------
+    ValueError
+        If the file type is unknown or no series are given
+    """
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+    elif path.endswith(".json"):
+        with open(path) as f:
+            config = json.load(f)
+    else:
+        raise ValueError(f"Config must be a .json or .toml file, got {path!r}.")
+
+    if not config.get("series"):
+        raise ValueError("The config must list at least one series.")
+    return {**DEFAULTS, **config}
+
+
+def run_config(
+    config: Dict[str, Any],
+    resume: bool = True,
+    client: Optional[Any] = None,
+    executor: Optional[Union[str, Executor]] = None
+) -> List[BatchResult]:
+    """
+    Fetch, fit, simulate, calibrate and write every series of a config.
+
+    Each series is written to ``<output>/series_id=<ID>/`` as three Parquet
+    files, followed by an empty ``_SUCCESS`` marker:
+
+    - ``simulations.parquet``: one row per path, one column per quarter
+    - ``weights.parquet``: the "path" and its calibration "weight"
+    - ``summary.parquet``: one row per quarter with the weighted "mean",
+      quantiles "q<level>" and the probability of a decrease from the
+      previous quarter, "prob_decrease"
+
+    Parameters
+    ----------
+    config : Dict[str, Any]
+        Configuration as returned by ``load_config``
+    resume : bool, optional
+        If True (default), skip series whose output is complete
+    client : object, optional
+        Object with ``get_series_info`` and ``get_series`` methods used for
+        the downloads. If None, a pooled ``FredClient`` is created.
+    executor : str or Executor, optional
+        Overrides the executor of the config
+
+    Returns
+    -------
+    List[BatchResult]
+        One result per processed series, whose value is the output
+        directory. Skipped series are not included.
+    """
+    from .cache import FredCache
+    from .data import _bulk_client, fetch_fred_data
+    from .store import ModelStore
+
+    output = config["output"]
+    os.makedirs(output, exist_ok=True)
+
+    pending = [
+        series_id for series_id in config["series"]
+        if not (resume and is_complete(output, series_id))
+    ]
+    if not pending:
+        return []
+
+    if config["compile_dir"]:
+        from .models.factory import share_compile_cache
+
+        share_compile_cache(config["compile_dir"])
+
+    cache = FredCache(config["cache_dir"]) if config["cache_dir"] else None
+    store = ModelStore(config["store_dir"]) if config["store_dir"] else None
+
+    # Fetch over one shared client, isolating failures per series
+    with _bulk_client(client, None, cache, max_connections=8) as shared_client:
+        fetched = run_batch(
+            fetch_fred_data,
+            {series_id: series_id for series_id in pending},
+            executor="thread",
+            max_workers=8,
+            cache=cache,
+            client=shared_client,
+        )
+    panel = {result.key: result.value for result in fetched if result.ok}
+    failures = [result for result in fetched if not result.ok]
+
+    calibration = config["calibration"]
+    results = run_batch(
+        _run_series,
+        panel,
+        executor=executor or config["executor"],
+        max_workers=config["max_workers"],
+        output=output,
+        model=config["model"],
+        end=config["end"],
+        N=config["N"],
+        probs=config["probs"],
+        start_year=config["start_year"],
+        method=calibration.get("method", "entropy"),
+        all_targets=calibration.get("targets", {}),
+        store=store,
+    )
+    by_key = {result.key: result for result in results + failures}
+    return [by_key[series_id] for series_id in pending]
+
+
+def is_complete(output: str, series_id: str) -> bool:
+    """Whether the output of a series was fully written."""
+    return os.path.exists(os.path.join(_partition(output, series_id), SUCCESS_MARKER))
+
+
+def _partition(output: str, series_id: str) -> str:
+    return os.path.join(output, f"series_id={series_id}")
+
+
+def _run_series(
+    df_quarterly: pd.DataFrame,
+    output: str,
+    model: str,
+    end: str,
+    N: int,
+    probs: Sequence[float],
+    start_year: int,
+    method: str,
+    all_targets: Dict[str, Dict[Any, float]],
+    store: Optional[Any]
+) -> str:
+    """Fit, simulate, calibrate and write one series."""
+    from .batch import _fit_and_simulate
+    from .calibration import calibrate_simulations
+    from .stats import decline_probabilities, summarize_simulations
+
+    series_id = df_quarterly.attrs["series_id"]
+    sim_array, forecast_index = _fit_and_simulate(df_quarterly, model, end, N, store)
+
+    targets = all_targets.get(series_id)
+    if targets:
+        # TOML and JSON keys are strings
+        targets = {int(year): float(value) for year, value in targets.items()}
+        weights = calibrate_simulations(sim_array, forecast_index, targets, method=method)
+    else:
+        weights = np.full(N, 1.0 / N)
+
+    summary = summarize_simulations(sim_array, forecast_index, weights, probs)
+    summary.columns = ["mean"] + [f"q{p:g}" for p in probs]
+    prob_fall, overall, window = decline_probabilities(
+        sim_array, forecast_index, weights, start_year
+    )
+    summary["prob_decrease"] = prob_fall["ProbDecrease"].reindex(summary.index)
+    summary.index = summary.index.astype(str)
+
+    quarters = [str(q) for q in forecast_index]
+    tables = {
+        "simulations.parquet": pd.DataFrame(sim_array.T, columns=quarters).rename_axis("path"),
+        "weights.parquet": pd.DataFrame({"weight": weights}).rename_axis("path"),
+        "summary.parquet": summary.rename_axis("quarter"),
+    }
+    meta = {
+        "series_id": series_id,
+        "model": model,
+        "overall_prob_drop": overall,
+        "prob_drop_start_year_on": window,
+        "start_year": start_year,
+    }
+
+    # Write into a temporary directory and move it into place, so a killed
+    # run never leaves a partition that looks complete
+    partition = _partition(output, series_id)
+    tmp_dir = tempfile.mkdtemp(dir=output, prefix=".tmp-")
+    try:
+        for name, df in tables.items():
+            _write_parquet(df.reset_index(), os.path.join(tmp_dir, name), meta)
+        open(os.path.join(tmp_dir, SUCCESS_MARKER), "w").close()
+        if os.path.exists(partition):
+            shutil.rmtree(partition)
+        os.replace(tmp_dir, partition)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return partition
+
+
+def _write_parquet(df: pd.DataFrame, path: str, meta: Dict[str, Any]) -> None:
+    pa, pq = import_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"fred_forecaster": json.dumps(meta).encode(),
+    })
+    pq.write_table(table, path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of the ``fred-forecaster`` console script."""
+    parser = argparse.ArgumentParser(
+        prog="fred-forecaster",
+        description="Forecast FRED series in batch and write Parquet outputs.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser(
+        "run", help="fetch, fit, simulate and calibrate the series of a config"
+    )
+    run_parser.add_argument("config", help="JSON or TOML config file")
+    run_parser.add_argument("--output", help="output directory (overrides the config)")
+    run_parser.add_argument("--executor", help="serial, thread, process or dask")
+    run_parser.add_argument("--max-workers", type=int, help="number of parallel series")
+    run_parser.add_argument(
+        "--force", action="store_true", help="redo series that are already complete"
+    )
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    if args.output:
+        config["output"] = args.output
+    if args.executor:
+        config["executor"] = args.executor
+    if args.max_workers:
+        config["max_workers"] = args.max_workers
+
+    skipped = [
+        s for s in config["series"]
+        if not args.force and is_complete(config["output"], s)
+    ]
+    for series_id in skipped:
+        print(f"{series_id}: already complete, skipped")
+
+    try:
+        results = run_config(config, resume=not args.force)
+    except ValueError as e:
+        # E.g. no FRED API key
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    for result in results:
+        if result.ok:
+            print(f"{result.key}: wrote {result.value}")
+        else:
+            print(f"{result.key}: FAILED {result.error}", file=sys.stderr)
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
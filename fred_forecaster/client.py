@@ -0,0 +1,188 @@
+"""Pooled HTTP client for the FRED web API."""
+
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+
+class FredClient:
+    """
+    Thread-safe FRED API client that reuses keep-alive connections.
+
+    Implements the ``get_series_info`` and ``get_series`` methods of
+    ``fredapi.Fred`` on top of a bounded pool of persistent HTTP(S)
+    connections, so it can be shared by many concurrent fetches. Requests
+    are spaced to stay within the FRED rate limit.
+
+    Parameters
+    ----------
+    api_key : str, optional
+        FRED API key. If None, will attempt to read from FRED_API_KEY environment variable
+    max_connections : int, optional
+        Maximum number of open connections (default: 8)
+    max_requests_per_minute : float, optional
+        Request rate limit (default: 120, the FRED API limit). If None,
+        requests are not throttled.
+    timeout : float, optional
+        Socket timeout in seconds (default: 30)
+    root_url : str, optional
+        Base URL of the API (default: https://api.stlouisfed.org/fred)
+
+    Raises
+    ------
+    ValueError
+        If FRED_API_KEY is not set and api_key is not provided
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: int = 8,
+        max_requests_per_minute: Optional[float] = 120,
+        timeout: float = 30,
+        root_url: str = "https://api.stlouisfed.org/fred"
+    ):
+        if api_key is None:
+            api_key = os.getenv("FRED_API_KEY", None)
+            if not api_key:
+                raise ValueError("FRED_API_KEY not set in environment.")
+        self.api_key = api_key
+        self.timeout = timeout
+
+        url = urlsplit(root_url)
+        self._scheme = url.scheme
+        self._netloc = url.netloc
+        self._base_path = url.path.rstrip("/")
+
+        self._connections = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+        self._interval = (
+            60.0 / max_requests_per_minute if max_requests_per_minute else 0.0
+        )
+        self._rate_lock = threading.Lock()
+        self._next_request = 0.0
+
+    def get_series_info(self, series_id: str) -> pd.Series:
+        """
+        Get the metadata of a FRED series.
+
+        Parameters
+        ----------
+        series_id : str
+            FRED series identifier
+
+        Returns
+        -------
+        pd.Series
+            Series metadata such as title, units and frequency
+        """
+        payload = self._request("series", series_id=series_id)
+        return pd.Series(payload["seriess"][0])
+
+    def get_series(self, series_id: str) -> pd.Series:
+        """
+        Get the observations of a FRED series.
+
+        Parameters
+        ----------
+        series_id : str
+            FRED series identifier
+
+        Returns
+        -------
+        pd.Series
+            Observations indexed by date, with missing values as NaN
+        """
+        payload = self._request("series/observations", series_id=series_id)
+        observations = payload["observations"]
+        index = pd.to_datetime([obs["date"] for obs in observations])
+        values = np.array(
+            [np.nan if obs["value"] == "." else float(obs["value"])
+             for obs in observations],
+            dtype=float,
+        )
+        return pd.Series(values, index=index, name=series_id)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __enter__(self) -> "FredClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(self._netloc, timeout=self.timeout)
+
+    def _throttle(self) -> None:
+        """Block until the next request fits within the rate limit."""
+        if not self._interval:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request - now
+            self._next_request = max(now, self._next_request) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _request(self, endpoint: str, max_retries: int = 3, **params) -> Dict[str, Any]:
+        params.update(api_key=self.api_key, file_type="json")
+        path = f"{self._base_path}/{endpoint}?{urlencode(params)}"
+
+        with self._slots:
+            try:
+                conn = self._connections.get_nowait()
+            except queue.Empty:
+                conn = self._new_connection()
+
+            try:
+                for attempt in range(max_retries + 1):
+                    self._throttle()
+                    try:
+                        conn.request("GET", path)
+                        response = conn.getresponse()
+                        body = response.read()
+                    except (http.client.HTTPException, OSError):
+                        if attempt == max_retries:
+                            raise
+                        # The server closed an idle keep-alive connection
+                        conn.close()
+                        conn = self._new_connection()
+                        continue
+
+                    if response.status == 429 or response.status >= 500:
+                        if attempt < max_retries:
+                            time.sleep(2 ** attempt)
+                            continue
+                    break
+            except BaseException:
+                # Never return a connection in an unknown state to the pool
+                conn.close()
+                raise
+
+            self._connections.put(conn)
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = {}
+        if response.status >= 400:
+            message = payload.get("error_message", response.reason)
+            raise ValueError(f"FRED API error for {params['series_id']}: {message}")
+        return payload
@@ -1,16 +1,30 @@
 """Functions for fetching and preprocessing FRED data."""
 
+import asyncio
+import contextvars
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from fredapi import Fred
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, Sequence, TYPE_CHECKING
 
+from .client import FredClient
+from .instrumentation import annotate, instrumented
 
+if TYPE_CHECKING:
+    from .cache import FredCache
+
+
+@instrumented
 def fetch_fred_data(
     series_id: str, 
     api_key: Optional[str] = None,
-    value_name: Optional[str] = None
+    value_name: Optional[str] = None,
+    cache: Optional["FredCache"] = None,
+    client: Optional[Any] = None
 ) -> pd.DataFrame:
     """
     Fetches a FRED series by ID, returns a quarterly PeriodIndex DataFrame.
@@ -23,6 +37,12 @@ def fetch_fred_data(
         FRED API key. If None, will attempt to read from FRED_API_KEY environment variable
     value_name : str, optional
         Name to use for the value column. If None, uses the series ID.
+    cache : FredCache, optional
+        Local cache of observations and metadata. Fresh cache entries are
+        served without any network request, and new downloads are stored.
+    client : object, optional
+        Object with ``get_series_info`` and ``get_series`` methods used in
+        place of a new ``fredapi.Fred`` client.
         
     Returns
     -------
@@ -33,19 +53,149 @@ def fetch_fred_data(
     ------
     ValueError
         If FRED_API_KEY is not set and api_key is not provided
+    LookupError
+        If the cache is offline and does not hold the series
+    """
+    cached = cache.get(series_id) if cache is not None else None
+    annotate(series_id=series_id, cache_hit=cached is not None)
+    if cached is not None:
+        series_data, series_info = cached
+    elif cache is not None and cache.offline:
+        raise LookupError(
+            f"Series {series_id!r} is not in the cache and the cache is offline."
+        )
+    else:
+        if client is None:
+            if api_key is None:
+                api_key = os.getenv("FRED_API_KEY", None)
+                if not api_key:
+                    raise ValueError("FRED_API_KEY not set in environment.")
+            client = Fred(api_key=api_key)
+
+        # Get series metadata to determine name and units
+        series_info = client.get_series_info(series_id)
+        
+        # Get actual data
+        series_data = client.get_series(series_id)
+
+        if cache is not None:
+            cache.put(series_id, series_data, series_info)
+
+    return _to_quarterly(series_data, series_info, series_id, value_name)
+
+
+@instrumented
+def fetch_fred_data_many(
+    series_ids: Sequence[str],
+    api_key: Optional[str] = None,
+    cache: Optional["FredCache"] = None,
+    client: Optional[Any] = None,
+    max_workers: int = 8
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetches many FRED series concurrently over one pooled client.
+    
+    Parameters
+    ----------
+    series_ids : Sequence[str]
+        FRED series identifiers
+    api_key : str, optional
+        FRED API key. If None, will attempt to read from FRED_API_KEY environment variable
+    cache : FredCache, optional
+        Local cache of observations and metadata, see ``fetch_fred_data``
+    client : object, optional
+        Shared client with ``get_series_info`` and ``get_series`` methods.
+        If None, a ``FredClient`` with ``max_workers`` pooled connections
+        is created for the batch.
+    max_workers : int, optional
+        Number of series fetched at the same time (default: 8)
+        
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        Quarterly DataFrames keyed by series ID, in input order
     """
-    if api_key is None:
-        api_key = os.getenv("FRED_API_KEY", None)
-        if not api_key:
-            raise ValueError("FRED_API_KEY not set in environment.")
-
-    # Get series metadata to determine name and units
-    fred = Fred(api_key=api_key)
-    series_info = fred.get_series_info(series_id)
+    with _bulk_client(client, api_key, cache, max_workers) as shared_client:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Run each fetch in a copy of the context so its span nests here
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    fetch_fred_data, series_id, cache=cache, client=shared_client
+                )
+                for series_id in series_ids
+            ]
+            return {
+                series_id: future.result()
+                for series_id, future in zip(series_ids, futures)
+            }
+
+
+@instrumented
+async def fetch_fred_data_many_async(
+    series_ids: Sequence[str],
+    api_key: Optional[str] = None,
+    cache: Optional["FredCache"] = None,
+    client: Optional[Any] = None,
+    max_workers: int = 8
+) -> Dict[str, pd.DataFrame]:
+    """
+    Asyncio variant of ``fetch_fred_data_many``.
     
-    # Get actual data
-    series_data = fred.get_series(series_id)
+    Requests run on a thread pool over one pooled client, with at most
+    ``max_workers`` series in flight, so the coroutine can be awaited
+    alongside other work in an event loop. See ``fetch_fred_data_many``
+    for the parameters.
     
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        Quarterly DataFrames keyed by series ID, in input order
+    """
+    loop = asyncio.get_running_loop()
+    with _bulk_client(client, api_key, cache, max_workers) as shared_client:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # run_in_executor does not carry the context over to the thread,
+            # so run each fetch in a copy for its span to nest here
+            results = await asyncio.gather(*[
+                loop.run_in_executor(
+                    executor,
+                    partial(
+                        contextvars.copy_context().run,
+                        fetch_fred_data, series_id, cache=cache, client=shared_client,
+                    ),
+                )
+                for series_id in series_ids
+            ])
+    return dict(zip(series_ids, results))
+
+
+@contextmanager
+def _bulk_client(
+    client: Optional[Any],
+    api_key: Optional[str],
+    cache: Optional["FredCache"],
+    max_connections: int
+) -> Iterator[Any]:
+    """Yield the caller's client, or a pooled FredClient owned by the batch."""
+    if client is not None or (cache is not None and cache.offline):
+        yield client
+        return
+
+    pooled = FredClient(api_key=api_key, max_connections=max_connections)
+    try:
+        yield pooled
+    finally:
+        pooled.close()
+
+
+def _to_quarterly(
+    series_data: pd.Series,
+    series_info: Any,
+    series_id: str,
+    value_name: Optional[str] = None
+) -> pd.DataFrame:
+    """Resample raw FRED observations to a quarterly PeriodIndex DataFrame."""
     # Determine column name
     if value_name is None:
         value_name = series_id
@@ -0,0 +1,193 @@
+"""Timed spans around pipeline stages, reported to user hooks."""
+
+import contextvars
+import functools
+import inspect
+import itertools
+import time
+import warnings
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """
+    Record of one timed stage of the pipeline.
+
+    Attributes
+    ----------
+    name : str
+        Stage name, e.g. "fit_bayesian_model" or "pymc.sample"
+    span_id : int
+        Identifier unique within the process
+    parent_id : int, optional
+        Identifier of the enclosing span, if any
+    start : float
+        Start time as a Unix timestamp
+    duration : float
+        Wall time in seconds
+    attributes : Dict[str, Any]
+        Stage-specific measurements, e.g. draws per second or iterations
+    error : str, optional
+        Exception type and message if the stage raised
+    """
+
+    name: str
+    span_id: int
+    parent_id: Optional[int] = None
+    start: float = 0.0
+    duration: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The span as a flat JSON-serializable record."""
+        return asdict(self)
+
+
+_hooks: List[Callable[[Span], None]] = []
+_current: contextvars.ContextVar = contextvars.ContextVar(
+    "fred_forecaster_span", default=None
+)
+_ids = itertools.count(1)
+
+
+def add_hook(hook: Callable[[Span], None]) -> Callable[[Span], None]:
+    """
+    Register a callback called with every finished span.
+
+    Instrumentation is disabled, at the cost of one list check per call,
+    while no hook is registered. Hooks only see spans of the process they
+    are registered in, so stages run by a process-based executor are not
+    reported.
+
+    Parameters
+    ----------
+    hook : Callable[[Span], None]
+        Callback, e.g. one forwarding ``span.to_dict()`` to a metrics system
+
+    Returns
+    -------
+    Callable[[Span], None]
+        The hook, so this can be used as a decorator
+    """
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook: Callable[[Span], None]) -> None:
+    """Unregister a callback added with ``add_hook``."""
+    _hooks.remove(hook)
+
+
+def is_enabled() -> bool:
+    """Whether any hook is registered."""
+    return bool(_hooks)
+
+
+@contextmanager
+def record_spans() -> Iterator[List[Span]]:
+    """
+    Collect the spans finished within the block.
+
+    Yields
+    ------
+    List[Span]
+        List that the spans are appended to as they finish
+    """
+    spans: List[Span] = []
+    add_hook(spans.append)
+    try:
+        yield spans
+    finally:
+        remove_hook(spans.append)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Time a block as a span nested in the current one.
+
+    Parameters
+    ----------
+    name : str
+        Stage name
+    **attributes
+        Initial span attributes
+
+    Yields
+    ------
+    Span or None
+        The open span, or None while instrumentation is disabled
+    """
+    if not _hooks:
+        yield None
+        return
+
+    parent = _current.get()
+    record = Span(
+        name=name,
+        span_id=next(_ids),
+        parent_id=parent.span_id if parent is not None else None,
+        start=time.time(),
+        attributes=attributes,
+    )
+    token = _current.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record.duration = time.perf_counter() - start
+        _current.reset(token)
+        _emit(record)
+
+
+def annotate(**attributes) -> None:
+    """Add attributes to the current span, if instrumentation is enabled."""
+    record = _current.get()
+    if record is not None:
+        record.attributes.update(attributes)
+
+
+def instrumented(fn: F) -> F:
+    """
+    Decorator timing every call of a function as a span named after it.
+
+    Coroutine functions are timed until the coroutine finishes.
+    """
+    name = fn.__name__
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            if not _hooks:
+                return await fn(*args, **kwargs)
+            with span(name):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _hooks:
+            return fn(*args, **kwargs)
+        with span(name):
+            return fn(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _emit(record: Span) -> None:
+    for hook in list(_hooks):
+        try:
+            hook(record)
+        except Exception as e:
+            # A broken metrics hook must not break the forecast
+            warnings.warn(f"Instrumentation hook {hook!r} failed: {e}")
@@ -0,0 +1,246 @@
+"""Allocation and storage of simulation ensembles."""
+
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from .optional import import_pyarrow
+
+_METADATA_KEY = b"fred_forecaster"
+
+
+def open_simulation_array(
+    steps: int,
+    N: int,
+    dtype: Union[str, np.dtype] = np.float64,
+    mmap_path: Optional[str] = None
+) -> np.ndarray:
+    """
+    Allocate an uninitialized (steps, N) simulation array.
+
+    Parameters
+    ----------
+    steps : int
+        Number of forecast quarters
+    N : int
+        Number of simulation paths
+    dtype : str or np.dtype, optional
+        Floating-point type of the values (default: float64). float32
+        halves the memory footprint.
+    mmap_path : str, optional
+        If given, the array is a memory map backed by this ``.npy`` file,
+        which can later be reopened with ``np.load(mmap_path, mmap_mode="r")``
+
+    Returns
+    -------
+    np.ndarray
+        The array, a ``np.memmap`` if mmap_path is given
+
+    Raises
+    ------
+    ValueError
+        If dtype is not a floating-point type
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind != "f":
+        raise ValueError(f"Simulations must have a floating-point dtype, got {dtype}.")
+    if mmap_path is None:
+        return np.empty((steps, N), dtype=dtype)
+
+    directory = os.path.dirname(os.path.abspath(mmap_path))
+    os.makedirs(directory, exist_ok=True)
+    return np.lib.format.open_memmap(mmap_path, mode="w+", dtype=dtype, shape=(steps, N))
+
+
+def collect_simulations(
+    chunks: Iterable[np.ndarray],
+    steps: int,
+    N: int,
+    dtype: Union[str, np.dtype] = np.float64,
+    mmap_path: Optional[str] = None
+) -> np.ndarray:
+    """
+    Write a stream of simulation chunks into one (steps, N) array.
+
+    Parameters
+    ----------
+    chunks : Iterable[np.ndarray]
+        Arrays of shape (steps, n) covering the N paths in order, e.g. from
+        ``iter_simulations``
+    steps : int
+        Number of forecast quarters
+    N : int
+        Total number of simulation paths
+    dtype : str or np.dtype, optional
+        Floating-point type of the output (default: float64)
+    mmap_path : str, optional
+        If given, write into a memory-mapped ``.npy`` file at this path
+
+    Returns
+    -------
+    np.ndarray
+        Shape (steps, N), a ``np.memmap`` if mmap_path is given
+    """
+    chunks = iter(chunks)
+    if mmap_path is None:
+        first = next(chunks)
+        if first.shape[1] == N and first.dtype == np.dtype(dtype):
+            # A single chunk already is the ensemble
+            return first
+        chunks = _prepend(first, chunks)
+
+    out = open_simulation_array(steps, N, dtype, mmap_path)
+    offset = 0
+    for chunk in chunks:
+        n = chunk.shape[1]
+        out[:, offset:offset + n] = chunk
+        offset += n
+    if offset != N:
+        raise ValueError(f"Chunks cover {offset} paths, expected {N}.")
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def save_simulations(
+    path: str,
+    sim_array: np.ndarray,
+    forecast_index: pd.PeriodIndex,
+    weights: Optional[np.ndarray] = None,
+    attrs: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Save a simulation ensemble with its index, weights and series metadata.
+
+    The ensemble is stored as an Arrow table with one row per path: a
+    "path" column of fixed-size lists holding the path's values over the
+    forecast quarters and, if given, a "weight" column. The forecast index
+    and attrs go in the schema metadata. Paths ending in ``.parquet`` are
+    written as Parquet (compressed, for archiving); any other path as an
+    uncompressed Arrow IPC file (e.g. ``.arrow``), which
+    ``load_simulations`` maps back into NumPy without copying.
+
+    Parameters
+    ----------
+    path : str
+        Output file
+    sim_array : np.ndarray
+        Array of shape (steps, N) containing N simulation paths
+    forecast_index : pd.PeriodIndex
+        Index of time periods corresponding to sim_array rows
+    weights : np.ndarray, optional
+        Weight vector of length N
+    attrs : Dict[str, Any], optional
+        JSON-serializable series metadata, e.g. ``df_quarterly.attrs``
+
+    Raises
+    ------
+    ValueError
+        If the shapes of the inputs do not match
+    """
+    pa, pq = import_pyarrow()
+    steps, N = sim_array.shape
+    if len(forecast_index) != steps:
+        raise ValueError(
+            f"forecast_index has {len(forecast_index)} periods, sim_array {steps} rows."
+        )
+
+    # Path-major values, so each path's quarters are contiguous
+    values = np.ascontiguousarray(sim_array.T).reshape(-1)
+    columns = {"path": pa.FixedSizeListArray.from_arrays(pa.array(values), steps)}
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (N,):
+            raise ValueError(f"weights must have shape ({N},), got {weights.shape}.")
+        columns["weight"] = pa.array(weights)
+
+    meta = {
+        "start": str(forecast_index[0]),
+        "periods": steps,
+        "freq": forecast_index.freqstr,
+        "attrs": attrs or {},
+    }
+    table = pa.table(columns).replace_schema_metadata(
+        {_METADATA_KEY: json.dumps(meta, default=str).encode()}
+    )
+
+    # Write to a temporary file first so readers never see partial files
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        if path.endswith(".parquet"):
+            pq.write_table(table, tmp_path)
+        else:
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    # A single record batch keeps the values in one buffer
+                    writer.write_table(table, max_chunksize=max(N, 1))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_simulations(
+    path: str,
+    memory_map: bool = True
+) -> Tuple[np.ndarray, pd.PeriodIndex, Optional[np.ndarray], Dict[str, Any]]:
+    """
+    Load an ensemble written by ``save_simulations``.
+
+    Parameters
+    ----------
+    path : str
+        File written by ``save_simulations``
+    memory_map : bool, optional
+        If True (default), memory-map Arrow IPC files, so the returned
+        arrays are read-only views of the file and loading costs no copy.
+        Parquet files are always decoded into memory.
+
+    Returns
+    -------
+    sim_array : np.ndarray
+        Shape (steps, N), each column is one simulation path
+    forecast_index : pd.PeriodIndex
+        The quarters covered by the forecast
+    weights : np.ndarray or None
+        Weight vector of length N, if one was saved
+    attrs : Dict[str, Any]
+        Series metadata
+    """
+    pa, pq = import_pyarrow()
+    if path.endswith(".parquet"):
+        table = pq.read_table(path, memory_map=memory_map)
+    else:
+        source = pa.memory_map(path, "r") if memory_map else pa.OSFile(path, "rb")
+        table = pa.ipc.open_file(source).read_all()
+
+    meta = json.loads(table.schema.metadata[_METADATA_KEY])
+    steps = meta["periods"]
+    forecast_index = pd.period_range(meta["start"], periods=steps, freq=meta["freq"])
+
+    paths = _single_chunk(table.column("path"))
+    values = paths.flatten().to_numpy(zero_copy_only=False)
+    sim_array = values.reshape(len(paths), steps).T
+
+    weights = None
+    if "weight" in table.column_names:
+        weights = _single_chunk(table.column("weight")).to_numpy(zero_copy_only=False)
+    return sim_array, forecast_index, weights, meta["attrs"]
+
+
+def _single_chunk(column):
+    """The column as one Arrow array, without copying if it already is one."""
+    if column.num_chunks == 1:
+        return column.chunk(0)
+    return column.combine_chunks()
+
+
+def _prepend(first: np.ndarray, rest: Iterable[np.ndarray]):
+    yield first
+    yield from rest
@@ -4,10 +4,154 @@ import numpy as np
 import pandas as pd
 import pymc as pm
 import arviz as az
-from typing import Tuple, Any, Union
+import pytensor
+import pytensor.tensor as pt
+import itertools
+import os
+import tempfile
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from scipy.fft import dst
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Any, Union, TYPE_CHECKING
 
+from ..instrumentation import annotate, instrumented, span
+from ..io import collect_simulations
 
-def fit_bayesian_model(ts_data: Union[pd.Series, pd.DataFrame]):
+if TYPE_CHECKING:
+    from ..store import ModelStore
+    from .factory import ModelFactory
+
+# Prior means and variances of the initial level, trend and seasonal states,
+# relative to the first observation (matching ``fit_bayesian_model``).
+_INIT_STATE_VAR = np.array([1.0, 0.1 ** 2, 0.1 ** 2])
+
+# Inference methods of the fits: NUTS, or a fast posterior approximation
+INFERENCE_METHODS = ("nuts", "advi", "pathfinder")
+
+# Optimizer iterations and posterior draws of the approximations
+_ADVI_ITERATIONS = 10000
+_APPROX_DRAWS = 1000
+
+# Draws per chain, tuning steps per chain and chains of NUTS
+_NUTS_DRAWS, _NUTS_TUNE, _NUTS_CHAINS = 500, 500, 2
+# Attempts per chain at a jittered initial point with finite log density
+_JITTER_RETRIES = 10
+
+# Callback reporting (iterations done, total iterations) of a fit
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class ForecastState:
+    """
+    The part of a posterior that forecasting needs, one entry per draw.
+    
+    ``generate_bayesian_simulations`` only reads the final level and trend,
+    the last four seasonal values and the observation noise of each draw.
+    This holds just those, a few dozen bytes per draw instead of the full
+    latent paths, so it is cheap to store and to send to worker processes.
+    
+    Attributes
+    ----------
+    level : np.ndarray
+        Shape (S,), the final level of each of the S draws
+    trend : np.ndarray
+        Shape (S,), the final trend of each draw
+    seasonal : np.ndarray
+        Shape (S, 4), the last four seasonal values of each draw
+    sigma_obs : np.ndarray
+        Shape (S,), the observation noise scale of each draw
+    """
+    
+    level: np.ndarray
+    trend: np.ndarray
+    seasonal: np.ndarray
+    sigma_obs: np.ndarray
+    
+    def __post_init__(self):
+        n = len(self.sigma_obs)
+        if not (len(self.level) == len(self.trend) == n and self.seasonal.shape == (n, 4)):
+            raise ValueError(
+                f"Inconsistent shapes: level {self.level.shape}, trend "
+                f"{self.trend.shape}, seasonal {self.seasonal.shape}, "
+                f"sigma_obs {self.sigma_obs.shape}."
+            )
+    
+    def __len__(self) -> int:
+        return len(self.sigma_obs)
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays."""
+        return sum(a.nbytes for a in self.to_arrays().values())
+    
+    @classmethod
+    def from_inference_data(cls, idata: az.InferenceData) -> "ForecastState":
+        """
+        Extract the forecast state of every posterior draw.
+        
+        Parameters
+        ----------
+        idata : az.InferenceData
+            Inference data with ``level``, ``trend``, ``seasonal`` and
+            ``sigma_obs`` in its posterior, e.g. from ``fit_bayesian_model``
+            
+        Returns
+        -------
+        ForecastState
+            The state of each draw, chains flattened
+        """
+        # Get parameter posterior samples, flattening chains
+        posterior = idata.posterior
+        n_samples = posterior["sigma_obs"].size
+        return cls(
+            level=posterior["level"].values.reshape(n_samples, -1)[:, -1].copy(),
+            trend=posterior["trend"].values.reshape(n_samples, -1)[:, -1].copy(),
+            seasonal=posterior["seasonal"].values.reshape(n_samples, -1)[:, -4:].copy(),
+            sigma_obs=posterior["sigma_obs"].values.reshape(-1).copy(),
+        )
+    
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The state as a dictionary of arrays, e.g. for a ``ModelStore``."""
+        return {
+            "level": self.level,
+            "trend": self.trend,
+            "seasonal": self.seasonal,
+            "sigma_obs": self.sigma_obs,
+        }
+    
+    def save(self, path: str) -> None:
+        """Write the state to an ``.npz`` file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **self.to_arrays())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    
+    @classmethod
+    def load(cls, path: str) -> "ForecastState":
+        """Read a state written by ``save``."""
+        with np.load(path, allow_pickle=False) as stored:
+            return cls(**{name: stored[name] for name in stored.files})
+
+
+@instrumented
+def fit_bayesian_model(
+    ts_data: Union[pd.Series, pd.DataFrame],
+    store: Optional["ModelStore"] = None,
+    method: str = "nuts",
+    random_seed: Optional[int] = None,
+    compact: bool = False,
+    factory: Optional["ModelFactory"] = None,
+    progress: Optional[ProgressCallback] = None
+):
     """
     Fits a Bayesian structural time series model to the provided data.
     Uses PyMC for Bayesian inference.
@@ -16,24 +160,111 @@ def fit_bayesian_model(ts_data: Union[pd.Series, pd.DataFrame]):
     ----------
     ts_data : Union[pd.Series, pd.DataFrame]
         Time series data to fit. If DataFrame, the first column is used.
+    store : ModelStore, optional
+        Fitted-model store. If it holds a posterior for the same data,
+        model and library versions, sampling is skipped and the stored
+        draws are returned; otherwise the new draws are saved to it.
+    method : str, optional
+        Inference method (default: "nuts"):
+        
+        - "nuts": two chains of the No-U-Turn sampler, exact but slow.
+        - "advi": mean-field variational inference, typically an order of
+          magnitude faster. It tends to understate posterior spread.
+        - "pathfinder": quasi-Newton variational inference from
+          ``pymc-extras``, which must be installed.
+        
+        The approximations return draws shaped like a single chain, so
+        ``generate_bayesian_simulations`` accepts them unchanged. Use
+        ``compare_posteriors`` against a NUTS fit to check their accuracy
+        for a series.
+    random_seed : int, optional
+        Seed for the sampler or optimizer
+    compact : bool, optional
+        If True, discard the full traces after fitting and return only the
+        ``ForecastState`` of each draw. The store then also holds only the
+        compact state.
+    factory : ModelFactory, optional
+        If given, fit the factory's shared model for series of this length
+        instead of building and compiling a new one
+    progress : Callable[[int, int], None], optional
+        Called with the number of sampler or optimizer iterations done and
+        their total as the fit advances, e.g. to update a progress bar.
+        ADVI may stop before the total when it converges.
         
     Returns
     -------
     model : pm.Model
         PyMC model object
-    idata : az.InferenceData
-        Inference data containing posterior samples
+    idata : az.InferenceData or ForecastState
+        Inference data containing posterior samples, or their forecast
+        state if compact is True
+        
+    Raises
+    ------
+    ValueError
+        If the method is unknown
     """
+    _check_method(method)
+    
     # Convert DataFrame to Series if needed
     if isinstance(ts_data, pd.DataFrame):
         ts_data = ts_data.iloc[:, 0]
         
     # Convert to numpy array for modeling
     y = ts_data.values
-    n = len(y)
+    
+    if store is not None:
+        key = store.key(
+            "bayesian", ts_data, spec=_store_spec(method, compact), libraries=["pymc"]
+        )
+        draws = store.load(key)
+        if draws is not None:
+            annotate(store_hit=True)
+            model = (
+                factory.model("bayesian", y) if factory is not None
+                else _build_bayesian_model(y)
+            )
+            if compact:
+                return model, ForecastState(**draws)
+            return model, az.from_dict(posterior=draws)
+    
+    if factory is not None:
+        model, idata = factory.fit("bayesian", y, method, random_seed, progress)
+    else:
+        model = _build_bayesian_model(y)
+        idata = _sample(model, method, random_seed, progress=progress)
+    if compact:
+        idata = ForecastState.from_inference_data(idata)
+    
+    if store is not None:
+        store.save(key, idata.to_arrays() if compact else _posterior_arrays(idata))
+    
+    return model, idata
+
+
+def _build_bayesian_model(y: np.ndarray, length: Optional[int] = None) -> pm.Model:
+    """
+    Build the PyMC model fitted by ``fit_bayesian_model``.
+    
+    If length is given, the observations are held in ``pm.Data`` containers
+    padded to that length, with a mask excluding the padding and missing
+    values from the likelihood. The model can then be refitted to any
+    series of up to length observations with ``_set_bayesian_data``. The
+    unobserved states past the end of the series do not change the
+    posterior of the others.
+    """
+    n = len(y) if length is None else length
     
     # Build PyMC model
     with pm.Model() as model:
+        if length is not None:
+            y_data = pm.Data("y", np.zeros(length))
+            mask = pm.Data("mask", np.zeros(length))
+            y0 = pm.Data("y0", 0.0)
+            _set_bayesian_data(model, y)
+        else:
+            y0 = y[0]
+        
         # Standard deviation priors for the different components
         sigma_level = pm.HalfNormal("sigma_level", sigma=0.1)
         sigma_trend = pm.HalfNormal("sigma_trend", sigma=0.01)
@@ -41,7 +272,7 @@ def fit_bayesian_model(ts_data: Union[pd.Series, pd.DataFrame]):
         sigma_obs = pm.HalfNormal("sigma_obs", sigma=0.1)
         
         # Initial values using dist() API to avoid registration errors
-        init_level_dist = pm.Normal.dist(mu=y[0], sigma=1)
+        init_level_dist = pm.Normal.dist(mu=y0, sigma=1)
         init_trend_dist = pm.Normal.dist(mu=0, sigma=0.1)
         init_seasonal_dist = pm.Normal.dist(mu=0, sigma=0.1, shape=4)
         
@@ -72,20 +303,658 @@ def fit_bayesian_model(ts_data: Union[pd.Series, pd.DataFrame]):
         mu = level + trend + seasonal
         
         # Observations
-        y_obs = pm.Normal("y_obs", mu=mu, sigma=sigma_obs, observed=y)
+        if length is None:
+            y_obs = pm.Normal("y_obs", mu=mu, sigma=sigma_obs, observed=y)
+        else:
+            loglik = pm.logp(pm.Normal.dist(mu=mu, sigma=sigma_obs), y_data)
+            pm.Potential("y_obs", (mask * loglik).sum())
+    
+    return model
+
+
+def _set_bayesian_data(model: pm.Model, y: np.ndarray) -> None:
+    """Swap the series of a model built with a padded length."""
+    length = model["y"].get_value().shape[0]
+    if len(y) > length:
+        raise ValueError(f"The series has {len(y)} observations, the model {length}.")
+    observed = ~np.isnan(y)
+    padded = np.zeros(length)
+    padded[:len(y)][observed] = y[observed]
+    mask = np.zeros(length)
+    mask[:len(y)] = observed
+    pm.set_data(
+        {"y": padded, "mask": mask, "y0": float(y[observed][0])}, model=model
+    )
+
+
+def _check_method(method: str) -> None:
+    if method not in INFERENCE_METHODS:
+        raise ValueError(
+            f"Unknown inference method: {method!r}. "
+            f"Use one of {', '.join(map(repr, INFERENCE_METHODS))}."
+        )
+
+
+def _store_spec(method: str, compact: bool = False) -> Optional[Dict[str, Any]]:
+    """Store spec of a fit; full NUTS fits keep the keys they had before methods."""
+    spec: Dict[str, Any] = {}
+    if method != "nuts":
+        spec["method"] = method
+    if compact:
+        spec["compact"] = True
+    return spec or None
+
+
+def _sample(
+    model: pm.Model,
+    method: str = "nuts",
+    random_seed: Optional[int] = None,
+    logp_dlogp_func: Optional[Any] = None,
+    progress: Optional[ProgressCallback] = None
+) -> az.InferenceData:
+    """
+    Draw from the posterior, reporting throughput to the span hooks.
+    
+    A compiled ``model.logp_dlogp_function`` can be passed to reuse it for
+    NUTS instead of compiling the model again. The chains then start from
+    jittered initial points, like ``pm.sample``'s default initialization.
+    """
+    if method != "nuts":
+        return _approximate(model, method, random_seed, progress)
+    
+    callback = None
+    if progress is not None:
+        total = _NUTS_CHAINS * (_NUTS_DRAWS + _NUTS_TUNE)
+        done = itertools.count(1)
         
-        # Inference - use a smaller sample for faster results
-        idata = pm.sample(500, tune=500, chains=2, return_inferencedata=True)
+        def callback(trace, draw):
+            progress(next(done), total)
+    
+    with span(
+        "pymc.sample", draws=_NUTS_DRAWS, tune=_NUTS_TUNE, chains=_NUTS_CHAINS
+    ) as record:
+        with model:
+            step, initvals = None, None
+            if logp_dlogp_func is not None:
+                initvals = _jittered_points(model, logp_dlogp_func, random_seed)
+                step = pm.NUTS(
+                    logp_dlogp_func=logp_dlogp_func,
+                    potential=_initial_potential(initvals),
+                )
+            # Inference - use a smaller sample for faster results
+            idata = pm.sample(
+                _NUTS_DRAWS, tune=_NUTS_TUNE, chains=_NUTS_CHAINS,
+                return_inferencedata=True, random_seed=random_seed, step=step,
+                initvals=initvals, callback=callback,
+            )
+        if record is not None:
+            record.attributes.update(_sampler_stats(idata))
+    return idata
+
+
+def _jittered_points(
+    model: pm.Model,
+    logp_dlogp_func: Any,
+    random_seed: Optional[int] = None
+) -> List[Dict[str, np.ndarray]]:
+    """
+    One initial point per chain, jittered as ``init="jitter+adapt_diag"`` does.
+    
+    pm.sample does not jitter the initial points when it is given a NUTS
+    step, so chains would all start from the same point and R-hat could
+    miss a multimodal posterior.
+    """
+    from pymc.blocking import DictToArrayBijection
+    from pymc.initial_point import make_initial_point_fns_per_chain
+    
+    rng = np.random.default_rng(random_seed)
+    point_fns = make_initial_point_fns_per_chain(
+        model=model, overrides=None, jitter_rvs=set(model.free_RVs), chains=_NUTS_CHAINS
+    )
+    points = []
+    for point_fn in point_fns:
+        # Jitter in [-1, 1] on the unconstrained scale, retried if the log
+        # density is not finite
+        for _ in range(_JITTER_RETRIES + 1):
+            point = point_fn(rng.integers(2 ** 30))
+            logp, _ = logp_dlogp_func(
+                DictToArrayBijection.map(point).data, extra_vars=point
+            )
+            if np.isfinite(logp):
+                break
+        points.append(point)
+    return points
+
+
+def _initial_potential(points: Sequence[Dict[str, np.ndarray]]):
+    """Diagonal mass matrix adaptation centered on the initial points, as ``pm.sample`` sets up."""
+    from pymc.blocking import DictToArrayBijection
+    from pymc.step_methods.hmc.quadpotential import QuadPotentialDiagAdapt
+    
+    mean = np.mean([DictToArrayBijection.map(point).data for point in points], axis=0)
+    return QuadPotentialDiagAdapt(len(mean), mean, np.ones(len(mean)), 10)
+
+
+def _approximate(
+    model: pm.Model,
+    method: str,
+    random_seed: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None
+) -> az.InferenceData:
+    """Fit a variational approximation and draw from it as one chain."""
+    with span("pymc.fit", method=method, draws=_APPROX_DRAWS) as record:
+        start = time.perf_counter()
+        if method == "advi":
+            callbacks = [pm.callbacks.CheckParametersConvergence(
+                tolerance=1e-3, diff="absolute"
+            )]
+            if progress is not None:
+                callbacks.append(
+                    lambda approx, losses, i: progress(i, _ADVI_ITERATIONS)
+                )
+            with model:
+                approx = pm.fit(
+                    n=_ADVI_ITERATIONS,
+                    method="advi",
+                    obj_optimizer=pm.adam(learning_rate=0.02),
+                    callbacks=callbacks,
+                    random_seed=random_seed,
+                    progressbar=False,
+                )
+                idata = approx.sample(_APPROX_DRAWS, random_seed=random_seed)
+            if record is not None:
+                record.attributes.update(
+                    iterations=len(approx.hist), final_loss=float(approx.hist[-1])
+                )
+        else:
+            pmx = _import_pymc_extras()
+            idata = pmx.fit(
+                method="pathfinder",
+                model=model,
+                num_draws=_APPROX_DRAWS,
+                random_seed=random_seed,
+                progressbar=False,
+            )
+            if progress is not None:
+                # Pathfinder reports no intermediate progress
+                progress(1, 1)
+        idata.posterior.attrs["sampling_time"] = time.perf_counter() - start
+        if record is not None:
+            record.attributes.update(_sampler_stats(idata))
+    return idata
+
+
+def _import_pymc_extras():
+    """Import pymc-extras, which provides Pathfinder."""
+    try:
+        import pymc_extras
+    except ImportError as e:
+        raise ImportError(
+            "Pathfinder requires pymc-extras. "
+            "Install it with `pip install fred-forecaster[fast]`."
+        ) from e
+    return pymc_extras
+
+
+def _sampler_stats(idata: az.InferenceData) -> Dict[str, Any]:
+    """Throughput and divergences of a sampler run."""
+    posterior = idata.posterior
+    n_draws = posterior.sizes["chain"] * posterior.sizes["draw"]
+    stats = {"total_draws": int(n_draws)}
+    sampling_time = posterior.attrs.get("sampling_time")
+    if sampling_time:
+        stats["sampling_time"] = float(sampling_time)
+        stats["draws_per_sec"] = n_draws / float(sampling_time)
+    if "sample_stats" in idata and "diverging" in idata.sample_stats:
+        stats["divergences"] = int(idata.sample_stats["diverging"].sum())
+    return stats
+
+
+def _posterior_arrays(idata: az.InferenceData) -> Dict[str, np.ndarray]:
+    """Posterior draws as plain arrays of shape (chain, draw, ...)."""
+    return {name: idata.posterior[name].values for name in idata.posterior.data_vars}
+
+
+def compare_posteriors(
+    idata: az.InferenceData,
+    reference: az.InferenceData,
+    var_names: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Accuracy of an approximate posterior against a reference, e.g. NUTS.
+    
+    Each scalar parameter is compared directly. Of the latent state paths,
+    only the final values are compared, since they are what forecasts
+    start from.
+    
+    Parameters
+    ----------
+    idata : az.InferenceData
+        Approximate fit, e.g. from ``fit_bayesian_model(..., method="advi")``
+    reference : az.InferenceData
+        Reference fit of the same model and data
+    var_names : Sequence[str], optional
+        Variables to compare. If None, all variables the two posteriors
+        have in common.
+        
+    Returns
+    -------
+    pd.DataFrame
+        One row per quantity, with the posterior "mean" and "sd" of both
+        fits, the difference of the means in reference standard
+        deviations ("mean_error") and the ratio of the standard deviations
+        ("sd_ratio"). The approximation is usually adequate for
+        forecasting when ``|mean_error|`` is well below 1 and "sd_ratio"
+        is near 1.
+    """
+    if var_names is None:
+        var_names = [
+            name for name in reference.posterior.data_vars
+            if name in idata.posterior.data_vars
+        ]
+    
+    rows = {}
+    for name in var_names:
+        draws = _final_draws(idata.posterior[name].values)
+        ref_draws = _final_draws(reference.posterior[name].values)
+        label = name if idata.posterior[name].ndim == 2 else f"{name}[-1]"
+        rows[label] = {
+            "mean": draws.mean(),
+            "reference_mean": ref_draws.mean(),
+            "sd": draws.std(),
+            "reference_sd": ref_draws.std(),
+        }
+    
+    df = pd.DataFrame.from_dict(rows, orient="index")
+    df["mean_error"] = (df["mean"] - df["reference_mean"]) / df["reference_sd"]
+    df["sd_ratio"] = df["sd"] / df["reference_sd"]
+    return df
+
+
+def _final_draws(values: np.ndarray) -> np.ndarray:
+    """Draws of a (chain, draw, ...) variable, or of its final element."""
+    values = values.reshape(values.shape[0] * values.shape[1], -1)
+    return values[:, -1]
+
+
+@instrumented
+def fit_bayesian_kalman_model(
+    ts_data: Union[pd.Series, pd.DataFrame],
+    smooth_states: bool = True,
+    random_seed: Optional[int] = None,
+    store: Optional["ModelStore"] = None,
+    method: str = "nuts",
+    compact: bool = False,
+    factory: Optional["ModelFactory"] = None,
+    progress: Optional[ProgressCallback] = None
+):
+    """
+    Fits the Bayesian structural time series model with the latent states
+    integrated out by a Kalman filter.
+    
+    The model is the same as in ``fit_bayesian_model``: level, trend and
+    seasonal random walks observed through their sum plus noise. Because
+    the observation only depends on the sum of the three walks, the
+    marginal likelihood is that of a scalar local level model. It is
+    evaluated in closed form for complete series, and by a Kalman filter
+    when observations are missing. NUTS then samples only the four sigma
+    parameters, so its cost no longer grows with the number of latent
+    states.
+    
+    Parameters
+    ----------
+    ts_data : Union[pd.Series, pd.DataFrame]
+        Time series data to fit. If DataFrame, the first column is used.
+        Missing observations are skipped by the filter.
+    smooth_states : bool, optional
+        If True (default), draw the level, trend and seasonal paths for each
+        posterior draw by simulation smoothing and add them to the posterior,
+        so that ``generate_bayesian_simulations`` can consume the result.
+        If False, only the sigma parameters are returned; the states can be
+        added later with ``sample_latent_states``.
+    random_seed : int, optional
+        Seed for the sampler or optimizer and the simulation smoother
+    store : ModelStore, optional
+        Fitted-model store. Only the sigma draws are stored; the latent
+        states are re-drawn by the smoother when a stored fit is reused.
+    method : str, optional
+        Inference method for the sigma parameters, "nuts" (default),
+        "advi" or "pathfinder", see ``fit_bayesian_model``. With only four
+        parameters, the approximations are usually close to NUTS here.
+    compact : bool, optional
+        If True, return only the ``ForecastState`` of each draw, without
+        the smoothed paths. Requires smooth_states.
+    factory : ModelFactory, optional
+        If given, fit the factory's shared model for series of this length
+        instead of building and compiling a new one
+    progress : Callable[[int, int], None], optional
+        Called with the number of sampler or optimizer iterations done and
+        their total as the fit advances, e.g. to update a progress bar.
+        ADVI may stop before the total when it converges.
+        
+    Returns
+    -------
+    model : pm.Model
+        PyMC model object
+    idata : az.InferenceData or ForecastState
+        Inference data containing posterior samples, or their forecast
+        state if compact is True
+        
+    Raises
+    ------
+    ValueError
+        If the method is unknown, or compact is set without smooth_states
+    """
+    _check_method(method)
+    if compact and not smooth_states:
+        raise ValueError("compact requires smooth_states.")
+    
+    # Convert DataFrame to Series if needed
+    if isinstance(ts_data, pd.DataFrame):
+        ts_data = ts_data.iloc[:, 0]
+        
+    y = ts_data.values.astype(float)
+    
+    idata = None
+    if store is not None:
+        key = store.key(
+            "bayesian_kalman", ts_data, spec=_store_spec(method), libraries=["pymc"]
+        )
+        draws = store.load(key)
+        if draws is not None:
+            annotate(store_hit=True)
+            idata = az.from_dict(posterior=draws)
+            model = (
+                factory.model("bayesian_kalman", y) if factory is not None
+                else _build_bayesian_kalman_model(y)
+            )
+    
+    if idata is None:
+        if factory is not None:
+            model, idata = factory.fit("bayesian_kalman", y, method, random_seed, progress)
+        else:
+            model = _build_bayesian_kalman_model(y)
+            idata = _sample(model, method, random_seed, progress=progress)
+        if store is not None:
+            store.save(key, _posterior_arrays(idata))
+    
+    if smooth_states:
+        idata = sample_latent_states(idata, ts_data, random_seed=random_seed)
+    if compact:
+        idata = ForecastState.from_inference_data(idata)
     
     return model, idata
 
 
+def _build_bayesian_kalman_model(y: np.ndarray, shared: bool = False) -> pm.Model:
+    """
+    Build the PyMC model fitted by ``fit_bayesian_kalman_model``.
+    
+    If shared is True, the data enter through ``pm.Data`` containers, so
+    the model can be refitted to any series of the same length and with
+    missing values in the same places via ``_set_bayesian_kalman_data``.
+    """
+    observed = ~np.isnan(y)
+    y0 = y[observed][0]
+    
+    with pm.Model() as model:
+        data = _kalman_data(y)
+        if shared:
+            data = {name: pm.Data(name, value) for name, value in data.items()}
+        
+        # Standard deviation priors for the different components
+        sigma_level = pm.HalfNormal("sigma_level", sigma=0.1)
+        sigma_trend = pm.HalfNormal("sigma_trend", sigma=0.01)
+        sigma_seasonal = pm.HalfNormal("sigma_seasonal", sigma=0.01)
+        sigma_obs = pm.HalfNormal("sigma_obs", sigma=0.1)
+        
+        # The sum of the three walks is itself a random walk
+        state_var = sigma_level ** 2 + sigma_trend ** 2 + sigma_seasonal ** 2
+        if observed.all():
+            loglik = _spectral_diff_loglik(
+                data["diffs"], len(y) - 1, _INIT_STATE_VAR.sum(), state_var, sigma_obs ** 2
+            )
+        else:
+            loglik = _kalman_loglik(
+                pt.as_tensor_variable(data["y"]),
+                pt.as_tensor_variable(observed.astype(float)),
+                data["y0"],
+                _INIT_STATE_VAR.sum(),
+                state_var,
+                sigma_obs ** 2,
+            )
+        pm.Potential("y_obs", loglik)
+    
+    return model
+
+
+def _kalman_data(y: np.ndarray) -> Dict[str, Any]:
+    """The data the likelihood of ``_build_bayesian_kalman_model`` reads."""
+    observed = ~np.isnan(y)
+    if observed.all():
+        return {"diffs": _spectral_diffs(y)}
+    return {"y": np.where(observed, y, 0.0), "y0": float(y[observed][0])}
+
+
+def _set_bayesian_kalman_data(model: pm.Model, y: np.ndarray) -> None:
+    """Swap the series of a model built with shared data."""
+    pm.set_data(_kalman_data(y), model=model)
+
+
+def _spectral_loglik(y, init_var, state_var, obs_var):
+    """
+    Closed-form log-likelihood of a fully observed local level model.
+    
+    This equals the Kalman filter's prediction error decomposition, but
+    needs no recursion. The first differences of the observations form an
+    MA(1) process whose covariance is tridiagonal Toeplitz, and is therefore
+    diagonalized by the type-I discrete sine transform whatever the
+    variances. The data are transformed once, and each evaluation is a
+    handful of vectorized operations over n terms. The first observation
+    is handled by conditioning on the differences.
+    """
+    return _spectral_diff_loglik(
+        _spectral_diffs(y), len(y) - 1, init_var, state_var, obs_var
+    )
+
+
+def _spectral_diffs(y: np.ndarray) -> np.ndarray:
+    """First differences of the observations in the sine basis."""
+    m = len(y) - 1
+    if m == 0:
+        return np.zeros(0)
+    return dst(np.diff(y), type=1) * np.sqrt(2 / (m + 1)) / 2
+
+
+def _spectral_diff_loglik(diffs, m, init_var, state_var, obs_var):
+    """``_spectral_loglik`` given the m transformed differences of the data."""
+    angle = np.pi * np.arange(1, m + 1) / (m + 1)
+    # Basis weights of the first difference
+    first = np.sqrt(2 / (m + 1)) * np.sin(angle)
+    
+    eigval = state_var + 2 * obs_var * (1 - np.cos(angle))
+    loglik = -0.5 * (
+        m * np.log(2 * np.pi)
+        + pt.log(eigval).sum()
+        + (diffs ** 2 / eigval).sum()
+    )
+    
+    # The first observation shares its noise term with the first difference,
+    # so its deviation from its conditional mean is known from the differences
+    deviation = obs_var * (first * diffs / eigval).sum()
+    cond_var = init_var + obs_var - obs_var ** 2 * (first ** 2 / eigval).sum()
+    return loglik - 0.5 * (
+        pt.log(2 * np.pi * cond_var) + deviation ** 2 / cond_var
+    )
+
+
+def _kalman_loglik(y, observed, init_mean, init_var, state_var, obs_var):
+    """Log-likelihood of a local level model, evaluated by a Kalman filter."""
+    
+    def step(y_t, observed_t, mean, var, state_var, obs_var):
+        forecast_var = var + obs_var
+        error = y_t - mean
+        gain = observed_t * var / forecast_var
+        loglik_t = -0.5 * observed_t * (
+            pt.log(2 * np.pi * forecast_var) + error ** 2 / forecast_var
+        )
+        # Update with the observation, then predict the next state
+        next_mean = mean + gain * error
+        next_var = var * (1 - gain) + state_var
+        return next_mean, next_var, loglik_t
+    
+    outputs, _ = pytensor.scan(
+        step,
+        sequences=[y, observed],
+        outputs_info=[
+            pt.as_tensor_variable(init_mean).astype("float64"),
+            pt.as_tensor_variable(np.float64(init_var)),
+            None,
+        ],
+        non_sequences=[state_var, obs_var],
+        strict=True,
+    )
+    return outputs[2].sum()
+
+
+@instrumented
+def sample_latent_states(
+    idata: az.InferenceData,
+    ts_data: Union[pd.Series, pd.DataFrame],
+    random_seed: Optional[int] = None
+) -> az.InferenceData:
+    """
+    Draws level, trend and seasonal paths for each posterior draw of the
+    sigma parameters by forward filtering, backward sampling.
+    
+    Parameters
+    ----------
+    idata : az.InferenceData
+        Inference data from ``fit_bayesian_kalman_model``
+    ts_data : Union[pd.Series, pd.DataFrame]
+        The time series the model was fitted to
+    random_seed : int, optional
+        Seed for the simulation smoother
+        
+    Returns
+    -------
+    az.InferenceData
+        The inference data with ``level``, ``trend`` and ``seasonal`` added
+        to its posterior
+    """
+    if isinstance(ts_data, pd.DataFrame):
+        ts_data = ts_data.iloc[:, 0]
+    y = ts_data.values.astype(float)
+    
+    posterior = idata.posterior
+    n_chains, n_draws = posterior["sigma_obs"].shape
+    state_sd = np.stack(
+        [posterior[name].values.reshape(-1)
+         for name in ["sigma_level", "sigma_trend", "sigma_seasonal"]],
+        axis=-1,
+    )
+    obs_sd = posterior["sigma_obs"].values.reshape(-1)
+    
+    rng = np.random.default_rng(random_seed)
+    states = _simulation_smoother(y, state_sd ** 2, obs_sd ** 2, rng)
+    
+    dims = ("chain", "draw")
+    for k, name in enumerate(["level", "trend", "seasonal"]):
+        posterior[name] = (
+            dims + (f"{name}_dim_0",),
+            states[..., k].reshape(n_chains, n_draws, len(y)),
+        )
+    return idata
+
+
+def _simulation_smoother(
+    y: np.ndarray,
+    state_var: np.ndarray,
+    obs_var: np.ndarray,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Forward-filtering, backward-sampling for the three random walk states,
+    vectorized over D parameter draws.
+    
+    Parameters
+    ----------
+    y : np.ndarray
+        Observations of shape (n,), with NaN for missing values
+    state_var : np.ndarray
+        Innovation variances of shape (D, 3)
+    obs_var : np.ndarray
+        Observation noise variances of shape (D,)
+    rng : np.random.Generator
+        Random number generator
+        
+    Returns
+    -------
+    np.ndarray
+        State draws of shape (D, n, 3)
+    """
+    n, D = len(y), len(obs_var)
+    Q = np.zeros((D, 3, 3))
+    Q[:, [0, 1, 2], [0, 1, 2]] = state_var
+    
+    filtered_mean = np.empty((n, D, 3))
+    filtered_cov = np.empty((n, D, 3, 3))
+    predicted_cov = np.empty((n, D, 3, 3))
+    
+    mean = np.zeros((D, 3))
+    mean[:, 0] = y[~np.isnan(y)][0]
+    cov = np.broadcast_to(np.diag(_INIT_STATE_VAR), (D, 3, 3)).copy()
+    for t in range(n):
+        if t > 0:
+            cov = cov + Q
+        predicted_cov[t] = cov
+        if not np.isnan(y[t]):
+            # The observation loads equally on all three states
+            cov_z = cov.sum(axis=2)
+            forecast_var = cov_z.sum(axis=1) + obs_var
+            gain = cov_z / forecast_var[:, np.newaxis]
+            error = y[t] - mean.sum(axis=1)
+            mean = mean + gain * error[:, np.newaxis]
+            cov = cov - gain[:, :, np.newaxis] * cov_z[:, np.newaxis, :]
+        filtered_mean[t] = mean
+        filtered_cov[t] = cov
+    
+    states = np.empty((D, n, 3))
+    states[:, -1] = _draw_mvn(filtered_mean[-1], filtered_cov[-1], rng)
+    for t in range(n - 2, -1, -1):
+        # Random walk transition: x[t+1] = x[t] + noise
+        gain = np.linalg.solve(predicted_cov[t + 1], filtered_cov[t]).transpose(0, 2, 1)
+        mean = filtered_mean[t] + np.einsum(
+            "dij,dj->di", gain, states[:, t + 1] - filtered_mean[t]
+        )
+        cov = filtered_cov[t] - gain @ predicted_cov[t + 1] @ gain.transpose(0, 2, 1)
+        states[:, t] = _draw_mvn(mean, cov, rng)
+    
+    return states
+
+
+def _draw_mvn(mean: np.ndarray, cov: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Draw one sample from each of a batch of (possibly singular) normals."""
+    cov = 0.5 * (cov + cov.transpose(0, 2, 1))
+    eigval, eigvec = np.linalg.eigh(cov)
+    scale = eigvec * np.sqrt(np.clip(eigval, 0.0, None))[:, np.newaxis, :]
+    noise = rng.standard_normal(mean.shape)
+    return mean + np.einsum("dij,dj->di", scale, noise)
+
+
+@instrumented
 def generate_bayesian_simulations(
     model: Any, 
-    idata: az.InferenceData, 
+    idata: Union[az.InferenceData, ForecastState], 
     df_quarterly: pd.DataFrame, 
     end: str = "2028Q4", 
-    N: int = 1000
+    N: int = 1000,
+    dtype: Union[str, np.dtype] = np.float64,
+    mmap_path: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    seed: Optional[int] = 42,
+    executor: Optional[Union[str, Executor]] = None,
+    max_workers: Optional[int] = None
 ) -> Tuple[np.ndarray, pd.PeriodIndex]:
     """
     Generate N random simulations from the fitted Bayesian model,
@@ -95,14 +964,32 @@ def generate_bayesian_simulations(
     ----------
     model : pm.Model
         Fitted PyMC model
-    idata : az.InferenceData
-        Inference data from the model
+    idata : az.InferenceData or ForecastState
+        Inference data from the model, or its compact forecast state
     df_quarterly : pd.DataFrame
         Historical data with PeriodIndex
     end : str
         End period for forecast in format 'YYYYQN' (e.g., '2028Q4')
     N : int
         Number of simulations to generate
+    dtype : str or np.dtype, optional
+        Floating-point type of the simulations (default: float64)
+    mmap_path : str, optional
+        If given, write the simulations into a memory-mapped ``.npy`` file
+        at this path instead of RAM
+    chunk_size : int, optional
+        If given, simulate this many paths at a time, which bounds the
+        float64 working memory when dtype or mmap_path is set. If None,
+        paths are simulated in blocks of ``BLOCK_SIZE``.
+    seed : int, optional
+        Seed of the random streams (default: 42). The simulations are the
+        same for any chunk_size, executor and max_workers. If None, fresh
+        entropy is used.
+    executor : str or Executor, optional
+        If given, simulate blocks of paths in parallel on this executor:
+        "thread", "process", "dask" or an Executor, see ``get_executor``
+    max_workers : int, optional
+        Number of workers of the executor
         
     Returns
     -------
@@ -111,77 +998,104 @@ def generate_bayesian_simulations(
     forecast_index : pd.PeriodIndex
         The quarters covered by the forecast.
     """
-    # Forecast range
-    last_period = df_quarterly.index[-1]
-    # Create the next period after last_period correctly
-    start_forecast = pd.Period(f"{last_period.year}Q{last_period.quarter}", freq="Q-DEC")
-    if last_period.quarter < 4:
-        start_forecast = pd.Period(f"{last_period.year}Q{last_period.quarter + 1}", freq="Q-DEC")
-    else:
-        start_forecast = pd.Period(f"{last_period.year + 1}Q1", freq="Q-DEC")
-    end_forecast = pd.Period(end, freq="Q-DEC")
+    from ..streaming import BLOCK_SIZE, iter_bayesian_simulations
 
-    def quarter_index(prd: pd.Period) -> int:
-        return prd.year * 4 + prd.quarter
-
-    steps = quarter_index(end_forecast) - quarter_index(start_forecast) + 1
-    if steps < 1:
-        raise ValueError(
-            f"Invalid forecast horizon: {start_forecast} to {end_forecast}"
-        )
+    # Randomly select a posterior sample for each path and simulate it
+    chunks, forecast_index = iter_bayesian_simulations(
+        model, idata, df_quarterly, end=end, N=N, chunk_size=chunk_size or BLOCK_SIZE,
+        seed=seed, executor=executor, max_workers=max_workers
+    )
+    sim_array = collect_simulations(chunks, len(forecast_index), N, dtype, mmap_path)
     
-    n_data = len(df_quarterly)
-    # Get the values from the first column
-    y = df_quarterly.iloc[:, 0].values
-    
-    # Setup forecast model
-    with model:
-        # Get parameter posterior samples
-        level_trace = idata.posterior["level"].values
-        trend_trace = idata.posterior["trend"].values
-        seasonal_trace = idata.posterior["seasonal"].values
-        sigma_obs_trace = idata.posterior["sigma_obs"].values
-        
-        # Flatten chains
-        level_samples = level_trace.reshape(-1, n_data)
-        trend_samples = trend_trace.reshape(-1, n_data)
-        seasonal_samples = seasonal_trace.reshape(-1, n_data)
-        sigma_samples = sigma_obs_trace.flatten()
-        
-        # Generate forecasts
-        np.random.seed(42)
-        sim_array = np.zeros((steps, N))
-        
-        # Generate N different forecast paths
-        for i in range(N):
-            # Randomly select a posterior sample
-            idx = np.random.randint(0, len(sigma_samples))
-            
-            # Get last values from the model
-            last_level = level_samples[idx, -1]
-            last_trend = trend_samples[idx, -1]
-            season_pattern = seasonal_samples[idx, -4:]  # Last year's seasonality
-            sigma = sigma_samples[idx]
-            
-            # Forecast values
-            forecast = np.zeros(steps)
-            for j in range(steps):
-                # Add in trend component with some noise
-                level_next = last_level + last_trend + np.random.normal(0, sigma/10)
-                trend_next = last_trend + np.random.normal(0, sigma/20)
-                
-                # Add in seasonal component
-                season_idx = j % 4
-                seasonal_component = season_pattern[season_idx] + np.random.normal(0, sigma/20)
-                
-                # Combine components
-                forecast[j] = level_next + seasonal_component + np.random.normal(0, sigma)
-                
-                # Update for next step
-                last_level = level_next
-                last_trend = trend_next
-            
-            sim_array[:, i] = forecast
+    return sim_array, forecast_index
+
+
+def _forecast_state(
+    idata: Union[az.InferenceData, ForecastState]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extract what forecasting needs from each posterior sample.
     
-    forecast_index = pd.period_range(start_forecast, periods=steps, freq="Q-DEC")
-    return sim_array, forecast_index
\ No newline at end of file
+    Returns
+    -------
+    last_level, last_trend : np.ndarray
+        Shape (S,), the final level and trend of each of the S samples
+    season_pattern : np.ndarray
+        Shape (S, 4), last year's seasonality of each sample
+    sigma : np.ndarray
+        Shape (S,), the observation noise scale of each sample
+    """
+    if not isinstance(idata, ForecastState):
+        idata = ForecastState.from_inference_data(idata)
+    return idata.level, idata.trend, idata.seasonal, idata.sigma_obs
+
+
+def _simulate_paths(
+    last_level: np.ndarray,
+    last_trend: np.ndarray,
+    season_pattern: np.ndarray,
+    sigma: np.ndarray,
+    steps: int,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Advance N local linear trend paths ``steps`` quarters ahead at once.
+
+    Parameters
+    ----------
+    last_level, last_trend, sigma : np.ndarray
+        Arrays of shape (N,) with the terminal level, terminal trend and
+        observation noise scale of each path.
+    season_pattern : np.ndarray
+        Array of shape (N, 4) with the last four seasonal values of each path.
+    steps : int
+        Number of quarters to simulate.
+    rng : np.random.Generator, optional
+        Source of the noise; a fresh generator if None.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (steps, N), each column is one simulation path.
+    """
+    N = len(sigma)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    # The trend entering step j has accumulated the trend noise of steps 0..j-1
+    trend = np.empty((steps, N))
+    trend[0] = 0.0
+    trend[1:] = rng.standard_normal((steps - 1, N))
+    trend[1:] *= sigma / 20
+    np.cumsum(trend, axis=0, out=trend)
+    trend += last_trend
+
+    # Level after step j is the previous level plus trend and level noise
+    level = rng.standard_normal((steps, N))
+    level *= sigma / 10
+    level += trend
+    np.cumsum(level, axis=0, out=level)
+    level += last_level
+    del trend
+
+    # Seasonal pattern repeats every four quarters
+    level += season_pattern.T[np.arange(steps) % 4]
+
+    # Seasonal and observation noise are independent, so draw them as one term
+    obs_noise = rng.standard_normal((steps, N))
+    obs_noise *= sigma * np.sqrt(1 + 1 / 400)
+    level += obs_noise
+
+    return level
+
+
+def _simulate_bayesian_block(
+    state: ForecastState, steps: int, N: int, seed: np.random.SeedSequence
+) -> np.ndarray:
+    """Simulate one block of paths from its own random stream."""
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(state), size=N)
+    return _simulate_paths(
+        state.level[idx], state.trend[idx], state.seasonal[idx], state.sigma_obs[idx],
+        steps, rng,
+    )
@@ -0,0 +1,227 @@
+"""Reusable Bayesian models whose data are swapped between fits."""
+
+import os
+import sys
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+KINDS = ("bayesian", "bayesian_kalman")
+
+
+class ModelFactory:
+    """
+    Cache of Bayesian models and their compiled samplers, reused across series.
+
+    Building a PyMC model and compiling the gradient of its log density is
+    a fixed cost of every fit, often larger than sampling for short
+    series. The factory builds each model once, with the observations in
+    ``pm.Data`` containers, and fits it to a new series by swapping the
+    data. NUTS then reuses the compiled log density; the approximations of
+    ``fit_bayesian_model`` reuse the model graph.
+
+    Models of ``fit_bayesian_model`` are shared by all series whose length
+    pads up to the same multiple of ``bucket``. The padding is masked out
+    of the likelihood, and the posterior is cut back to the length of the
+    series. Models of ``fit_bayesian_kalman_model`` are shared by series of
+    the same length and pattern of missing values.
+
+    Fits of the same model are serialized, so a factory can be shared by
+    the threads of a batch.
+
+    Parameters
+    ----------
+    bucket : int, optional
+        Length granularity of the shared "bayesian" models (default: 8)
+    max_models : int, optional
+        Number of models kept; the least recently used are dropped
+        (default: 16)
+    """
+
+    def __init__(self, bucket: int = 8, max_models: int = 16):
+        if bucket < 1:
+            raise ValueError("bucket must be positive.")
+        self.bucket = bucket
+        self.max_models = max_models
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def model(self, kind: str, y: np.ndarray):
+        """
+        The shared model of a kind, holding the data of a series.
+
+        Parameters
+        ----------
+        kind : str
+            "bayesian" or "bayesian_kalman"
+        y : np.ndarray
+            Observations of the series, with NaN for missing values
+
+        Returns
+        -------
+        pm.Model
+            The model, whose data are replaced by the next call for a
+            series sharing it
+        """
+        entry = self._entry(kind, np.asarray(y, dtype=float))
+        with entry.lock:
+            entry.set_data(y)
+            return entry.model
+
+    def fit(
+        self,
+        kind: str,
+        y: np.ndarray,
+        method: str = "nuts",
+        random_seed: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None
+    ):
+        """
+        Fit the shared model of a kind to a series.
+
+        Parameters
+        ----------
+        kind : str
+            "bayesian" or "bayesian_kalman"
+        y : np.ndarray
+            Observations of the series, with NaN for missing values
+        method : str, optional
+            Inference method, see ``fit_bayesian_model``
+        random_seed : int, optional
+            Seed for the sampler or optimizer
+        progress : Callable[[int, int], None], optional
+            Progress callback, see ``fit_bayesian_model``
+
+        Returns
+        -------
+        model : pm.Model
+            The shared model
+        idata : az.InferenceData
+            Posterior draws for the series
+        """
+        from .bayesian import _sample
+
+        y = np.asarray(y, dtype=float)
+        entry = self._entry(kind, y)
+        with entry.lock:
+            entry.set_data(y)
+            logp_dlogp_func = None
+            if method == "nuts":
+                if entry.logp_dlogp_func is None:
+                    entry.logp_dlogp_func = entry.model.logp_dlogp_function(
+                        ravel_inputs=True
+                    )
+                    entry.logp_dlogp_func.trust_input = True
+                logp_dlogp_func = entry.logp_dlogp_func
+            idata = _sample(entry.model, method, random_seed, logp_dlogp_func, progress)
+
+        if kind == "bayesian":
+            # Drop the states of the padding
+            idata.posterior = idata.posterior.isel(
+                {f"{name}_dim_0": slice(0, len(y)) for name in ["level", "trend", "seasonal"]}
+            )
+        return entry.model, idata
+
+    def _entry(self, kind: str, y: np.ndarray) -> "_Entry":
+        """Find or build the model entry of a series."""
+        from .bayesian import (
+            _build_bayesian_kalman_model,
+            _build_bayesian_model,
+            _set_bayesian_data,
+            _set_bayesian_kalman_data,
+        )
+
+        if kind == "bayesian":
+            length = -(-len(y) // self.bucket) * self.bucket
+            key: Tuple = (kind, length)
+        elif kind == "bayesian_kalman":
+            key = (kind, len(y), np.isnan(y).tobytes())
+        else:
+            raise ValueError(
+                f"Unknown model: {kind!r}. Use one of {', '.join(map(repr, KINDS))}."
+            )
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            if kind == "bayesian":
+                model = _build_bayesian_model(y, length=length)
+                entry = _Entry(model, lambda y: _set_bayesian_data(model, y))
+            else:
+                model = _build_bayesian_kalman_model(y, shared=True)
+                entry = _Entry(model, lambda y: _set_bayesian_kalman_data(model, y))
+            self._entries[key] = entry
+            while len(self._entries) > self.max_models:
+                self._entries.popitem(last=False)
+            return entry
+
+
+class _Entry:
+    """A shared model, its data setter and its compiled log density."""
+
+    def __init__(self, model, set_data):
+        self.model = model
+        self.set_data = set_data
+        self.logp_dlogp_func: Optional[Any] = None
+        self.lock = threading.Lock()
+
+
+_default_factory: Optional[ModelFactory] = None
+_default_lock = threading.Lock()
+
+
+def default_factory() -> ModelFactory:
+    """The model factory shared within this process, e.g. by batch workers."""
+    global _default_factory
+    with _default_lock:
+        if _default_factory is None:
+            _default_factory = ModelFactory()
+        return _default_factory
+
+
+def share_compile_cache(directory: str) -> None:
+    """
+    Make processes started from now on share one PyTensor compile cache.
+
+    PyTensor caches compiled C modules on disk, by default per user under
+    ``~/.pytensor``. Worker processes that do not share a home directory,
+    e.g. in containers or on a cluster with a shared file system, would
+    each compile the models again. This sets ``base_compiledir`` in the
+    ``PYTENSOR_FLAGS`` environment variable that new processes read when
+    they import PyTensor.
+
+    Parameters
+    ----------
+    directory : str
+        Cache directory, created if missing
+    """
+    directory = os.path.abspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    flags = [
+        flag for flag in os.environ.get("PYTENSOR_FLAGS", "").split(",")
+        if flag and not flag.startswith("base_compiledir=")
+    ]
+    os.environ["PYTENSOR_FLAGS"] = ",".join(flags + [f"base_compiledir={directory}"])
+
+    if "pytensor" in sys.modules:
+        import pytensor
+
+        if os.path.abspath(pytensor.config.base_compiledir) != directory:
+            warnings.warn(
+                "PyTensor is already imported, so this process keeps its compile "
+                f"cache in {pytensor.config.base_compiledir}; only new processes "
+                f"use {directory}."
+            )
@@ -0,0 +1,46 @@
+"""Forecast horizon shared by the simulation generators."""
+
+import pandas as pd
+
+
+def forecast_period_index(df_quarterly: pd.DataFrame, end: str) -> pd.PeriodIndex:
+    """
+    Quarters from the one after the last observation through ``end``.
+
+    Parameters
+    ----------
+    df_quarterly : pd.DataFrame
+        Historical data with PeriodIndex
+    end : str
+        End period for forecast in format 'YYYYQN' (e.g., '2028Q4')
+
+    Returns
+    -------
+    pd.PeriodIndex
+        The quarters covered by the forecast
+
+    Raises
+    ------
+    ValueError
+        If ``end`` is not after the last observation
+    """
+    # Forecast range
+    last_period = df_quarterly.index[-1]
+    # Create the next period after last_period correctly
+    start_forecast = pd.Period(f"{last_period.year}Q{last_period.quarter}", freq="Q-DEC")
+    if last_period.quarter < 4:
+        start_forecast = pd.Period(f"{last_period.year}Q{last_period.quarter + 1}", freq="Q-DEC")
+    else:
+        start_forecast = pd.Period(f"{last_period.year + 1}Q1", freq="Q-DEC")
+    end_forecast = pd.Period(end, freq="Q-DEC")
+
+    def quarter_index(prd: pd.Period) -> int:
+        return prd.year * 4 + prd.quarter
+
+    steps = quarter_index(end_forecast) - quarter_index(start_forecast) + 1
+    if steps < 1:
+        raise ValueError(
+            f"Invalid forecast horizon: {start_forecast} to {end_forecast}"
+        )
+
+    return pd.period_range(start_forecast, periods=steps, freq="Q-DEC")
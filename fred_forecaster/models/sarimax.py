@@ -1,12 +1,38 @@
 """SARIMAX time series forecasting models."""
 
+import inspect
+import itertools
 import numpy as np
 import pandas as pd
+from concurrent.futures import Executor
 from statsmodels.tsa.statespace.sarimax import SARIMAX
-from typing import Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
 
+from ..batch import get_executor, run_batch
+from ..instrumentation import annotate, instrumented
+from ..io import collect_simulations
 
-def fit_sarimax_model(ts_data: Union[pd.Series, pd.DataFrame]):
+if TYPE_CHECKING:
+    from ..store import ModelStore
+
+
+# SARIMAX(1,1,1)x(0,1,0)[4] used unless another order is given
+DEFAULT_ORDER = (1, 1, 1)
+DEFAULT_SEASONAL_ORDER = (0, 1, 0, 4)
+
+# "native" advances all paths of the fitted state space model together;
+# "statsmodels" calls ``results.simulate``
+SIMULATION_ENGINES = ("native", "statsmodels")
+
+
+@instrumented
+def fit_sarimax_model(
+    ts_data: Union[pd.Series, pd.DataFrame],
+    order: Tuple[int, int, int] = DEFAULT_ORDER,
+    seasonal_order: Tuple[int, int, int, int] = DEFAULT_SEASONAL_ORDER,
+    store: Optional["ModelStore"] = None,
+    start_params: Optional[np.ndarray] = None
+):
     """
     Fits a SARIMAX model to the provided time series data.
     
@@ -14,6 +40,17 @@ def fit_sarimax_model(ts_data: Union[pd.Series, pd.DataFrame]):
     ----------
     ts_data : Union[pd.Series, pd.DataFrame]
         Time series data to fit. If DataFrame, the first column is used.
+    order : Tuple[int, int, int], optional
+        The (p, d, q) order of the model (default: (1, 1, 1))
+    seasonal_order : Tuple[int, int, int, int], optional
+        The (P, D, Q, m) seasonal order of the model (default: (0, 1, 0, 4))
+    store : ModelStore, optional
+        Fitted-model store. If it holds parameters for the same data,
+        model and library versions, the optimization is skipped and the
+        stored parameters are filtered through the data instead; otherwise
+        the new parameters are saved to it.
+    start_params : np.ndarray, optional
+        Initial parameters for the optimizer, e.g. those of an earlier fit
         
     Returns
     -------
@@ -24,21 +61,309 @@ def fit_sarimax_model(ts_data: Union[pd.Series, pd.DataFrame]):
     if isinstance(ts_data, pd.DataFrame):
         ts_data = ts_data.iloc[:, 0]
         
-    p, d, q = 1, 1, 1
-    P, D, Q, m = 0, 1, 0, 4  # Example
-    model = SARIMAX(
+    model = _build_sarimax(ts_data, order, seasonal_order)
+    
+    if store is not None:
+        spec = {"order": list(order), "seasonal_order": list(seasonal_order)}
+        key = store.key("sarimax", ts_data, spec=spec, libraries=["statsmodels"])
+        stored = store.load(key)
+        if stored is not None:
+            annotate(store_hit=True)
+            return model.filter(stored["params"])
+    
+    results = model.fit(start_params=start_params, disp=False)
+    annotate(
+        store_hit=False,
+        iterations=results.mle_retvals.get("iterations"),
+        converged=results.mle_retvals.get("converged"),
+    )
+    
+    if store is not None:
+        store.save(key, {"params": np.asarray(results.params)})
+    return results
+
+
+@instrumented
+def update_sarimax_model(
+    results,
+    ts_data: Union[pd.Series, pd.DataFrame],
+    refit_every: Optional[int] = None,
+    drift_threshold: Optional[float] = None,
+    store: Optional["ModelStore"] = None,
+    obs_since_fit: int = 0
+) -> Tuple[Any, int]:
+    """
+    Updates fitted SARIMAX results with newly published observations.
+    
+    The observations in ``ts_data`` after the end of ``results`` are run
+    through the Kalman filter from its final state, keeping the estimated
+    parameters, so an update costs O(new observations). The parameters are
+    re-estimated (warm-started from the current ones) only when the
+    schedule or the drift check calls for it.
+    
+    Parameters
+    ----------
+    results : SARIMAXResults
+        Results from ``fit_sarimax_model`` or from a previous update
+    ts_data : Union[pd.Series, pd.DataFrame]
+        The full, extended time series. If DataFrame, the first column is used.
+    refit_every : int, optional
+        Re-estimate the parameters once this many observations have been
+        added since the last estimation. If None, never re-estimate on a
+        schedule.
+    drift_threshold : float, optional
+        Re-estimate the parameters when the mean squared standardized
+        one-step-ahead forecast error of the new observations exceeds this
+        value. It is about 1 when the model still fits, so values such as
+        2-4 flag a clear deterioration. If None, drift is not checked.
+    store : ModelStore, optional
+        Fitted-model store used when re-estimating
+    obs_since_fit : int, optional
+        Observations added to ``results`` since its parameters were last
+        estimated, as returned by the previous update (default: 0)
+        
+    Returns
+    -------
+    results : SARIMAXResults
+        Results covering the new observations, which ``generate_simulations``
+        forecasts from
+    obs_since_fit : int
+        Observations added since the last estimation, to pass to the next
+        update
+    """
+    # Convert DataFrame to Series if needed
+    if isinstance(ts_data, pd.DataFrame):
+        ts_data = ts_data.iloc[:, 0]
+        
+    new_data = ts_data[ts_data.index > results.fittedvalues.index[-1]]
+    if len(new_data) == 0:
+        return results, obs_since_fit
+    
+    # statsmodels expects the new data under the name of the fitted series
+    updated = results.extend(new_data.rename(results.model.endog_names))
+    obs_since_fit += len(new_data)
+    
+    refit = refit_every is not None and obs_since_fit >= refit_every
+    if drift_threshold is not None:
+        errors = updated.filter_results.standardized_forecasts_error[0]
+        refit = refit or np.nanmean(errors ** 2) > drift_threshold
+    
+    if refit:
+        updated = fit_sarimax_model(
+            ts_data,
+            order=results.model.order,
+            seasonal_order=results.model.seasonal_order,
+            store=store,
+            start_params=np.asarray(results.params),
+        )
+        obs_since_fit = 0
+    
+    return updated, obs_since_fit
+
+
+def _build_sarimax(
+    ts_data: pd.Series,
+    order: Tuple[int, int, int],
+    seasonal_order: Tuple[int, int, int, int]
+) -> SARIMAX:
+    """Build the (unfitted) SARIMAX model used by ``fit_sarimax_model``."""
+    return SARIMAX(
         ts_data,
-        order=(p, d, q),
-        seasonal_order=(P, D, Q, m),
+        order=order,
+        seasonal_order=seasonal_order,
         enforce_stationarity=False,
         enforce_invertibility=False,
     )
-    results = model.fit(disp=False)
-    return results
 
 
+@instrumented
+def select_sarimax_order(
+    ts_data: Union[pd.Series, pd.DataFrame],
+    p: Sequence[int] = range(3),
+    d: Sequence[int] = (1,),
+    q: Sequence[int] = range(3),
+    P: Sequence[int] = range(2),
+    D: Sequence[int] = (1,),
+    Q: Sequence[int] = range(2),
+    m: int = 4,
+    criterion: str = "aic",
+    prune_threshold: Optional[float] = 10.0,
+    executor: Union[str, Executor] = "process",
+    max_workers: Optional[int] = None
+):
+    """
+    Selects the SARIMAX order with the best information criterion.
+    
+    Candidates are fitted in waves of increasing size p + q + P + Q, with
+    each wave fitted in parallel. Every candidate is warm-started from the
+    parameters of the best already-fitted model it extends by one lag (with
+    the new coefficients set to zero), which typically saves most of the
+    optimizer iterations. A fitted model whose criterion is more than
+    ``prune_threshold`` above the best so far is not extended further, so
+    unpromising regions of the grid are never fitted.
+    
+    Parameters
+    ----------
+    ts_data : Union[pd.Series, pd.DataFrame]
+        Time series data to fit. If DataFrame, the first column is used.
+    p, d, q : Sequence[int], optional
+        Candidate non-seasonal AR orders, differences and MA orders
+        (default: p and q in 0-2, d = 1)
+    P, D, Q : Sequence[int], optional
+        Candidate seasonal AR orders, differences and MA orders
+        (default: P and Q in 0-1, D = 1)
+    m : int, optional
+        Seasonal period (default: 4)
+    criterion : str, optional
+        "aic" (default), "bic" or "hqic"
+    prune_threshold : float, optional
+        Criterion gap to the best model beyond which a model is not
+        extended (default: 10). If None, the full grid is fitted.
+    executor : str or Executor, optional
+        Executor name or instance, see ``batch.get_executor``
+        (default: "process")
+    max_workers : int, optional
+        Number of workers. If None, uses the number of CPUs.
+        
+    Returns
+    -------
+    results : SARIMAXResults
+        Results of the best model
+    ranking : pd.DataFrame
+        One row per fitted candidate, sorted from best to worst, with the
+        order, seasonal order, information criteria, log-likelihood, the
+        order it was warm-started from and any fitting error
+        
+    Raises
+    ------
+    ValueError
+        If the criterion is unknown
+    RuntimeError
+        If no candidate could be fitted
+    """
+    if criterion not in ("aic", "bic", "hqic"):
+        raise ValueError(f"Unknown criterion: {criterion!r}. Use 'aic', 'bic' or 'hqic'.")
+    
+    # Convert DataFrame to Series if needed
+    if isinstance(ts_data, pd.DataFrame):
+        ts_data = ts_data.iloc[:, 0]
+    
+    # Candidates as (p, d, q, P, D, Q), grouped into waves by number of lags
+    grid = set(itertools.product(p, d, q, P, D, Q))
+    waves = {}
+    for cand in grid:
+        waves.setdefault(cand[0] + cand[2] + cand[3] + cand[5], []).append(cand)
+    
+    fits = {}
+    best = np.inf
+    with get_executor(executor, max_workers) as pool:
+        for size in sorted(waves):
+            tasks = {}
+            for cand in sorted(waves[size]):
+                parents = [
+                    fits[parent] for parent in _nested_parents(cand)
+                    if parent in fits and fits[parent]["error"] is None
+                ]
+                extendable = [
+                    fit for fit in parents
+                    if prune_threshold is None or fit[criterion] <= best + prune_threshold
+                ]
+                if any(parent in grid for parent in _nested_parents(cand)) and not extendable:
+                    continue
+                warm = min(extendable, key=lambda fit: fit[criterion], default=None)
+                tasks[cand] = (cand, warm)
+            
+            results = run_batch(
+                _fit_candidate, list(tasks.values()), executor=pool, ts_data=ts_data, m=m
+            )
+            for cand, result in zip(tasks, results):
+                fit = result.value if result.ok else {
+                    "cand": cand, "error": result.error, "warm_start": None,
+                    "aic": np.nan, "bic": np.nan, "hqic": np.nan, "llf": np.nan,
+                }
+                fits[cand] = fit
+                if fit["error"] is None:
+                    best = min(best, fit[criterion])
+    
+    ranking = pd.DataFrame([
+        {
+            "order": cand[:3],
+            "seasonal_order": cand[3:] + (m,),
+            "aic": fit["aic"],
+            "bic": fit["bic"],
+            "hqic": fit["hqic"],
+            "llf": fit["llf"],
+            "warm_start": _format_order(fit["warm_start"], m),
+            "error": fit["error"],
+        }
+        for cand, fit in fits.items()
+    ])
+    ranking = ranking.sort_values(criterion, na_position="last").reset_index(drop=True)
+    if ranking.empty or ranking[criterion].isna().all():
+        raise RuntimeError("Order selection failed: no candidate model could be fitted.")
+    
+    top = ranking.iloc[0]
+    params = fits[top["order"] + top["seasonal_order"][:3]]["params"]
+    results = _build_sarimax(ts_data, top["order"], top["seasonal_order"]).filter(params)
+    return results, ranking
+
+
+def _format_order(cand: Optional[Tuple[int, ...]], m: int) -> Optional[str]:
+    """Format a candidate as "(p, d, q)x(P, D, Q, m)"."""
+    if cand is None:
+        return None
+    return f"{cand[:3]}x{cand[3:] + (m,)}"
+
+
+def _nested_parents(cand: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    """Candidates with one fewer lag in exactly one of p, q, P or Q."""
+    parents = []
+    for pos in (0, 2, 3, 5):
+        if cand[pos] > 0:
+            parent = list(cand)
+            parent[pos] -= 1
+            parents.append(tuple(parent))
+    return parents
+
+
+def _fit_candidate(task, ts_data: pd.Series, m: int) -> Dict[str, Any]:
+    """Fit one candidate order, warm-started from a nested parent fit."""
+    cand, warm = task
+    model = _build_sarimax(ts_data, cand[:3], cand[3:] + (m,))
+    
+    start_params = None
+    if warm is not None:
+        # Reuse the parent's coefficients; new lags start at zero
+        parent = dict(zip(warm["param_names"], warm["params"]))
+        start_params = np.array([parent.get(name, 0.0) for name in model.param_names])
+    
+    results = model.fit(start_params=start_params, disp=False)
+    return {
+        "cand": cand,
+        "params": np.asarray(results.params),
+        "param_names": list(model.param_names),
+        "aic": results.aic,
+        "bic": results.bic,
+        "hqic": results.hqic,
+        "llf": results.llf,
+        "warm_start": warm["cand"] if warm is not None else None,
+        "error": None,
+    }
+
+
+@instrumented
 def generate_simulations(
-    results, df_quarterly: pd.DataFrame, end: str = "2028Q4", N: int = 1000
+    results,
+    df_quarterly: pd.DataFrame,
+    end: str = "2028Q4",
+    N: int = 1000,
+    dtype: Union[str, np.dtype] = np.float64,
+    mmap_path: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    seed: Optional[int] = 42,
+    executor: Optional[Union[str, Executor]] = None,
+    max_workers: Optional[int] = None,
+    engine: str = "native"
 ) -> Tuple[np.ndarray, pd.PeriodIndex]:
     """
     Generate N random simulations from the fitted SARIMAX results,
@@ -54,6 +379,29 @@ def generate_simulations(
         End period for forecast in format 'YYYYQN' (e.g., '2028Q4')
     N : int
         Number of simulations to generate
+    dtype : str or np.dtype, optional
+        Floating-point type of the simulations (default: float64)
+    mmap_path : str, optional
+        If given, write the simulations into a memory-mapped ``.npy`` file
+        at this path instead of RAM
+    chunk_size : int, optional
+        If given, simulate this many paths at a time, which bounds the
+        float64 working memory when dtype or mmap_path is set. If None,
+        paths are simulated in blocks of ``BLOCK_SIZE``.
+    seed : int, optional
+        Seed of the random streams (default: 42). The simulations are the
+        same for any chunk_size, executor and max_workers. If None, fresh
+        entropy is used.
+    executor : str or Executor, optional
+        If given, simulate blocks of paths in parallel on this executor:
+        "thread", "process", "dask" or an Executor, see ``get_executor``
+    max_workers : int, optional
+        Number of workers of the executor
+    engine : str, optional
+        "native" (default) reads the system matrices and the predicted
+        state of the fit and advances all paths of a block with one matrix
+        product per quarter. It falls back to "statsmodels", which calls
+        ``results.simulate``, for models with time-varying matrices.
 
     Returns
     -------
@@ -62,28 +410,31 @@ def generate_simulations(
     forecast_index : pd.PeriodIndex
         The quarters covered by the forecast.
     """
-    # Forecast range
-    last_period = df_quarterly.index[-1]
-    # Create the next period after last_period correctly
-    start_forecast = pd.Period(f"{last_period.year}Q{last_period.quarter}", freq="Q-DEC")
-    if last_period.quarter < 4:
-        start_forecast = pd.Period(f"{last_period.year}Q{last_period.quarter + 1}", freq="Q-DEC")
-    else:
-        start_forecast = pd.Period(f"{last_period.year + 1}Q1", freq="Q-DEC")
-    end_forecast = pd.Period(end, freq="Q-DEC")
+    from ..streaming import BLOCK_SIZE, iter_simulations
 
-    def quarter_index(prd: pd.Period) -> int:
-        return prd.year * 4 + prd.quarter
+    chunks, forecast_index = iter_simulations(
+        results, df_quarterly, end=end, N=N, chunk_size=chunk_size or BLOCK_SIZE,
+        seed=seed, executor=executor, max_workers=max_workers, engine=engine
+    )
+    sim_array = collect_simulations(chunks, len(forecast_index), N, dtype, mmap_path)
 
-    steps = quarter_index(end_forecast) - quarter_index(start_forecast) + 1
-    if steps < 1:
-        raise ValueError(
-            f"Invalid forecast horizon: {start_forecast} to {end_forecast}"
-        )
+    return sim_array, forecast_index
 
-    # Simulate
-    np.random.seed(42)
-    sim_array = results.simulate(nsimulations=steps, repetitions=N, anchor="end")
+
+def _simulate_sarimax(
+    results, steps: int, N: int, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Simulate N paths of ``steps`` quarters from the end of the sample."""
+    if rng is None:
+        rng = np.random.default_rng()
+    # statsmodels 0.15 renamed random_state to rng
+    if "rng" in inspect.signature(results.simulate).parameters:
+        seed_kwargs = {"rng": rng}
+    else:
+        seed_kwargs = {"random_state": rng}
+    sim_array = results.simulate(
+        nsimulations=steps, repetitions=N, anchor="end", **seed_kwargs
+    )
 
     # Some versions give shape (N, steps), ensure shape is (steps, N).
     if sim_array.shape[0] == N:
@@ -94,5 +445,101 @@ def generate_simulations(
     else:
         sim_array = np.asarray(sim_array)
 
-    forecast_index = pd.period_range(start_forecast, periods=steps, freq="Q-DEC")
-    return sim_array, forecast_index
\ No newline at end of file
+    return sim_array
+
+
+def _check_engine(engine: str) -> None:
+    if engine not in SIMULATION_ENGINES:
+        raise ValueError(
+            f"Unknown simulation engine: {engine!r}. "
+            f"Use one of {', '.join(map(repr, SIMULATION_ENGINES))}."
+        )
+
+
+def _is_time_invariant(results) -> bool:
+    """Whether the fit is a univariate model with constant system matrices."""
+    ssm = results.filter_results
+    matrices = [
+        ssm.design, ssm.obs_intercept, ssm.obs_cov, ssm.transition,
+        ssm.state_intercept, ssm.selection, ssm.state_cov,
+    ]
+    return ssm.k_endog == 1 and all(matrix.shape[-1] == 1 for matrix in matrices)
+
+
+def _simulate_state_space(
+    results, steps: int, N: int, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Simulate N paths of a time-invariant SARIMAX fit from the end of the sample.
+
+    Draws the initial states from the predicted state distribution after
+    the last observation, as ``results.simulate(anchor="end")`` does, then
+    iterates the measurement and transition equations
+
+        y_t = d + Z a_t + e_t,    a_{t+1} = c + T a_t + R u_t
+
+    for all paths at once. Only the (k_states, N) states of the current
+    quarter are held besides the output.
+
+    Parameters
+    ----------
+    results : SARIMAXResults
+        Fitted results with time-invariant system matrices
+    steps : int
+        Number of quarters to simulate
+    N : int
+        Number of paths
+    rng : np.random.Generator, optional
+        Source of the noise; a fresh generator if None
+
+    Returns
+    -------
+    np.ndarray
+        Shape (steps, N), each column is one simulation path
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    # The filter results hold the covariances already multiplied by the
+    # scale of concentrated fits
+    ssm = results.filter_results
+
+    design = ssm.design[0, :, 0]
+    obs_intercept = ssm.obs_intercept[0, 0]
+    obs_sd = np.sqrt(max(ssm.obs_cov[0, 0, 0], 0.0))
+    transition = ssm.transition[:, :, 0]
+    state_intercept = ssm.state_intercept[:, :1]
+    # Maps standard normal draws to the state disturbances R u_t
+    shock_factor = ssm.selection[:, :, 0] @ _psd_factor(ssm.state_cov[:, :, 0])
+
+    state = _psd_factor(ssm.predicted_state_cov[:, :, -1]) @ rng.standard_normal(
+        (ssm.k_states, N)
+    )
+    state += ssm.predicted_state[:, -1:]
+
+    sim_array = np.empty((steps, N))
+    for t in range(steps):
+        np.dot(design, state, out=sim_array[t])
+        sim_array[t] += obs_intercept
+        if obs_sd > 0:
+            sim_array[t] += obs_sd * rng.standard_normal(N)
+        if t < steps - 1:
+            state = transition @ state
+            state += shock_factor @ rng.standard_normal((shock_factor.shape[1], N))
+            state += state_intercept
+    return sim_array
+
+
+def _psd_factor(cov: np.ndarray) -> np.ndarray:
+    """A matrix L with L L' = cov, for a possibly singular covariance."""
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)
+    return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+
+def _simulate_sarimax_block(
+    results, steps: int, N: int, seed: np.random.SeedSequence, engine: str = "native"
+) -> np.ndarray:
+    """Simulate one block of paths from its own random stream."""
+    rng = np.random.default_rng(seed)
+    if engine == "native" and _is_time_invariant(results):
+        return _simulate_state_space(results, steps, N, rng)
+    return _simulate_sarimax(results, steps, N, rng)
@@ -0,0 +1,26 @@
+"""Imports of optional dependencies, with installation hints."""
+
+
+def import_pyarrow():
+    """
+    Import pyarrow, which backs the cache, ensemble and batch output files.
+
+    Returns
+    -------
+    pa, pq : module
+        The ``pyarrow`` and ``pyarrow.parquet`` modules
+
+    Raises
+    ------
+    ImportError
+        If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Reading and writing Arrow and Parquet files requires pyarrow. "
+            "Install it with `pip install fred-forecaster[arrow]`."
+        ) from e
+    return pa, pq
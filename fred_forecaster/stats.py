@@ -0,0 +1,207 @@
+"""Weighted summary statistics of simulation ensembles."""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence, Tuple
+
+
+def weighted_quantiles(
+    sim_array: np.ndarray,
+    probs: Sequence[float],
+    weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Weighted quantiles of each forecast quarter for many levels at once.
+
+    Each row is sorted once and all levels are read off its cumulative
+    weights. With equal weights the result matches ``np.quantile`` with
+    linear interpolation.
+
+    Parameters
+    ----------
+    sim_array : np.ndarray
+        Array of shape (steps, N) containing N simulation paths
+    probs : Sequence[float]
+        Probability levels in [0, 1]
+    weights : np.ndarray, optional
+        Weight vector of length N. If None, equal weights are used.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (len(probs), steps)
+    """
+    probs = np.asarray(probs, dtype=float)
+    out = np.empty((len(probs), sim_array.shape[0]))
+    if weights is None:
+        # Row by row, so a memory-mapped ensemble is never copied whole
+        for i, row in enumerate(sim_array):
+            out[:, i] = np.quantile(row, probs)
+        return out
+
+    weights = np.asarray(weights, dtype=float)
+    # Paths with zero weight do not contribute
+    keep = weights > 0
+    if not keep.all():
+        keep = np.flatnonzero(keep)
+        weights = weights[keep]
+    else:
+        keep = slice(None)
+
+    for i, row in enumerate(sim_array):
+        row = np.asarray(row[keep], dtype=float)
+        order = np.argsort(row)
+        sorted_values, sorted_weights = row[order], weights[order]
+        if len(row) == 1:
+            out[:, i] = sorted_values[0]
+            continue
+
+        # Position of each sorted value on [0, 1]: k / (N - 1) for equal weights
+        cum = np.cumsum(sorted_weights)
+        positions = (cum - sorted_weights) / (cum[-1] - sorted_weights[-1])
+        out[:, i] = np.interp(probs, positions, sorted_values)
+    return out
+
+
+def summarize_simulations(
+    sim_array: np.ndarray,
+    forecast_index: pd.PeriodIndex,
+    weights: Optional[np.ndarray] = None,
+    probs: Sequence[float] = (0.05, 0.5, 0.95)
+) -> pd.DataFrame:
+    """
+    Weighted mean and quantiles of each forecast quarter.
+
+    Parameters
+    ----------
+    sim_array : np.ndarray
+        Array of shape (steps, N) containing N simulation paths
+    forecast_index : pd.PeriodIndex
+        Index of time periods corresponding to sim_array rows
+    weights : np.ndarray, optional
+        Weight vector of length N. If None, equal weights are used.
+    probs : Sequence[float], optional
+        Quantile levels (default: 5%, 50% and 95%)
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by "Quarter", with a "mean" column and one column per
+        quantile level
+    """
+    if weights is None:
+        mean = sim_array.mean(axis=1, dtype=float)
+    else:
+        # Row by row, so a memory-mapped ensemble is never copied whole
+        weights = np.asarray(weights, dtype=float)
+        mean = np.array([np.dot(row, weights) for row in sim_array]) / np.sum(weights)
+
+    df = pd.DataFrame(
+        weighted_quantiles(sim_array, probs, weights).T,
+        index=pd.Index(forecast_index, name="Quarter"),
+        columns=list(probs),
+    )
+    df.insert(0, "mean", mean)
+    return df
+
+
+def decline_probabilities(
+    sim_array: np.ndarray,
+    forecast_index: pd.PeriodIndex,
+    weights: Optional[np.ndarray] = None,
+    start_year: int = 2025
+) -> Tuple[pd.DataFrame, float, float]:
+    """
+    Probabilities of quarter-over-quarter declines.
+
+    Parameters
+    ----------
+    sim_array : np.ndarray
+        Array of shape (steps, N) containing N simulation paths
+    forecast_index : pd.PeriodIndex
+        Index of time periods corresponding to sim_array rows
+    weights : np.ndarray, optional
+        Weight vector of length N. If None, equal weights are used.
+    start_year : int, optional
+        Year from which decline probabilities are reported (default: 2025)
+
+    Returns
+    -------
+    df_prob_fall : pd.DataFrame
+        Probability of a decrease from the previous quarter, for each
+        quarter from start_year onward, indexed by "Quarter"
+    overall_prob_drop : float
+        Probability of at least one decline over the whole forecast
+    prob_drop_start_year_on : float
+        Probability of at least one decline from start_year onward
+        (NaN if the forecast ends before start_year)
+    """
+    if weights is None:
+        weights = np.ones(sim_array.shape[1])
+    start_idx = _start_index(forecast_index, start_year)
+    per_quarter, overall, window = _decline_totals(sim_array, weights, start_idx)
+    total = np.sum(weights)
+    return _decline_frame(
+        per_quarter / total, overall / total, window / total,
+        forecast_index, start_year, start_idx,
+    )
+
+
+def _start_index(forecast_index: pd.PeriodIndex, start_year: int) -> Optional[int]:
+    """Row of the first quarter in start_year or later, if any."""
+    in_window = np.asarray(forecast_index.year >= start_year)
+    return int(np.argmax(in_window)) if in_window.any() else None
+
+
+def _decline_totals(
+    sim_array: np.ndarray,
+    weights: np.ndarray,
+    start_idx: Optional[int]
+) -> Tuple[np.ndarray, float, float]:
+    """
+    Weighted counts of declines in one pass over the ensemble.
+
+    Returns the weight of the paths declining into each quarter after the
+    first, of the paths with any decline, and of the paths with a decline
+    from start_idx onward.
+    """
+    steps, N = sim_array.shape
+    if start_idx is None:
+        start_idx = steps
+    per_quarter = np.zeros(steps - 1)
+    before = np.zeros(N, dtype=bool)
+    in_window = np.zeros(N, dtype=bool)
+
+    # Pairs of rows at a time keep the working memory at O(N)
+    for i in range(1, steps):
+        declines = sim_array[i] < sim_array[i - 1]
+        per_quarter[i - 1] = declines.dot(weights)
+        if i - 1 < start_idx:
+            before |= declines
+        else:
+            in_window |= declines
+
+    return (
+        per_quarter,
+        float((before | in_window).dot(weights)),
+        float(in_window.dot(weights)),
+    )
+
+
+def _decline_frame(
+    prob: np.ndarray,
+    overall: float,
+    window: float,
+    forecast_index: pd.PeriodIndex,
+    start_year: int,
+    start_idx: Optional[int]
+) -> Tuple[pd.DataFrame, float, float]:
+    """Assemble the output of ``decline_probabilities``."""
+    in_window = np.asarray(forecast_index.year[1:] >= start_year)
+    df_prob_fall = pd.DataFrame(
+        {"ProbDecrease": prob[in_window]},
+        index=pd.Index(forecast_index[1:][in_window], name="Quarter"),
+    )
+    if start_idx is None:
+        window = np.nan
+    return df_prob_fall, overall, window
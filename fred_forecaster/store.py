@@ -0,0 +1,116 @@
+"""Content-addressed on-disk store of fitted model parameters."""
+
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Union
+
+from . import __version__
+
+
+class ModelStore:
+    """
+    Store of fitted model parameters keyed on what determines the fit.
+
+    Each entry is a compressed ``.npz`` file named by a SHA-256 hash of the
+    series values and index, the model specification and the versions of
+    the libraries that produced the fit. A series that has not been revised
+    since the last run therefore maps to the same entry, and the fitting
+    functions rehydrate their results from it instead of refitting. Any
+    change to the data, the model or the libraries yields a new key.
+
+    Pass the store to ``fit_sarimax_model``, ``fit_bayesian_model`` or
+    ``fit_bayesian_kalman_model`` through their ``store`` argument.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Store directory. If None, uses the FRED_FORECASTER_MODEL_DIR
+        environment variable, falling back to ~/.cache/fred_forecaster/models.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        if directory is None:
+            directory = os.getenv(
+                "FRED_FORECASTER_MODEL_DIR",
+                os.path.join(
+                    os.path.expanduser("~"), ".cache", "fred_forecaster", "models"
+                ),
+            )
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(
+        self,
+        kind: str,
+        ts_data: Union[pd.Series, pd.DataFrame],
+        spec: Optional[Dict[str, Any]] = None,
+        libraries: Optional[List[str]] = None
+    ) -> str:
+        """
+        Compute the store key of a fit.
+
+        Parameters
+        ----------
+        kind : str
+            Model family, e.g. "sarimax" or "bayesian"
+        ts_data : Union[pd.Series, pd.DataFrame]
+            Time series the model is fitted to
+        spec : Dict[str, Any], optional
+            JSON-serializable model specification
+        libraries : List[str], optional
+            Modules whose versions affect the fit, in addition to numpy and
+            pandas
+
+        Returns
+        -------
+        str
+            Key of the form "<kind>-<hex digest>"
+        """
+        versions = {"fred_forecaster": __version__}
+        for name in ["numpy", "pandas"] + list(libraries or []):
+            versions[name] = importlib.import_module(name).__version__
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps(
+            {"kind": kind, "spec": spec or {}, "versions": versions},
+            sort_keys=True,
+        ).encode())
+        digest.update(np.ascontiguousarray(ts_data.to_numpy(dtype=float)).tobytes())
+        digest.update("\x1f".join(map(str, ts_data.index)).encode())
+        return f"{kind}-{digest.hexdigest()}"
+
+    def path(self, key: str) -> str:
+        """Return the file path of a store entry."""
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Load the arrays stored under a key.
+
+        Returns
+        -------
+        Dict[str, np.ndarray] or None
+            The stored arrays, or None if there is no entry for the key
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as stored:
+            return {name: stored[name] for name in stored.files}
+
+    def save(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """Store arrays under a key, replacing any existing entry."""
+        # Write to a temporary file first so readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
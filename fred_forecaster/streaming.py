@@ -0,0 +1,472 @@
+"""Chunked simulation generators and online summary accumulators.
+
+The generators yield an ensemble in chunks of paths, so that peak memory
+is bounded by the chunk size rather than by N. The accumulators summarize
+the chunks as they arrive without ever materializing the full ensemble.
+"""
+
+import functools
+import os
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import (
+    Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+)
+
+from .models.horizon import forecast_period_index
+from .stats import _decline_frame, _decline_totals, _start_index
+
+
+# Paths per random stream. Each block of paths draws from its own stream,
+# spawned from the seed, so the output does not depend on how the blocks
+# are grouped into chunks or spread over workers.
+BLOCK_SIZE = 1000
+
+# Arguments shared by the blocks simulated in a worker process
+_WORKER_ARGS: Tuple = ()
+
+
+def iter_simulations(
+    results,
+    df_quarterly: pd.DataFrame,
+    end: str = "2028Q4",
+    N: int = 1000,
+    chunk_size: int = 10000,
+    seed: Optional[int] = 42,
+    executor: Optional[Union[str, Executor]] = None,
+    max_workers: Optional[int] = None,
+    engine: str = "native"
+) -> Tuple[Iterator[np.ndarray], pd.PeriodIndex]:
+    """
+    Streaming variant of ``generate_simulations`` for SARIMAX results.
+
+    Parameters
+    ----------
+    results : SARIMAXResults
+        Fitted SARIMAX model results
+    df_quarterly : pd.DataFrame
+        Historical data with PeriodIndex
+    end : str
+        End period for forecast in format 'YYYYQN' (e.g., '2028Q4')
+    N : int
+        Total number of simulations to generate
+    chunk_size : int, optional
+        Number of paths per chunk (default: 10000)
+    seed : int, optional
+        Seed of the random streams (default: 42). The same seed gives the
+        same paths for any chunk_size, executor and number of workers.
+        If None, fresh entropy is used.
+    executor : str or Executor, optional
+        If given, simulate blocks of ``BLOCK_SIZE`` paths in parallel on
+        this executor, see ``get_executor``. If None, simulate in the
+        calling thread.
+    max_workers : int, optional
+        Number of workers of the executor
+    engine : str, optional
+        "native" (default) or "statsmodels", see ``generate_simulations``
+
+    Returns
+    -------
+    chunks : Iterator[np.ndarray]
+        Arrays of shape (steps, n) with n <= chunk_size, covering N paths
+    forecast_index : pd.PeriodIndex
+        The quarters covered by the forecast.
+    """
+    from .models.sarimax import _check_engine, _simulate_sarimax_block
+
+    _check_engine(engine)
+    forecast_index = forecast_period_index(df_quarterly, end)
+    steps = len(forecast_index)
+    blocks = _iter_blocks(
+        functools.partial(_simulate_sarimax_block, engine=engine),
+        (results, steps), N, seed, executor, max_workers
+    )
+    return _rechunk(blocks, chunk_size), forecast_index
+
+
+def iter_bayesian_simulations(
+    model: Any,
+    idata,
+    df_quarterly: pd.DataFrame,
+    end: str = "2028Q4",
+    N: int = 1000,
+    chunk_size: int = 10000,
+    seed: Optional[int] = 42,
+    executor: Optional[Union[str, Executor]] = None,
+    max_workers: Optional[int] = None
+) -> Tuple[Iterator[np.ndarray], pd.PeriodIndex]:
+    """
+    Streaming variant of ``generate_bayesian_simulations``.
+
+    Parameters
+    ----------
+    model : pm.Model
+        Fitted PyMC model
+    idata : az.InferenceData or ForecastState
+        Inference data from the model, or its compact forecast state
+    df_quarterly : pd.DataFrame
+        Historical data with PeriodIndex
+    end : str
+        End period for forecast in format 'YYYYQN' (e.g., '2028Q4')
+    N : int
+        Total number of simulations to generate
+    chunk_size : int, optional
+        Number of paths per chunk (default: 10000)
+    seed : int, optional
+        Seed of the random streams (default: 42), see ``iter_simulations``
+    executor : str or Executor, optional
+        If given, simulate blocks of paths in parallel on this executor.
+        Only the compact forecast state is sent to the workers.
+    max_workers : int, optional
+        Number of workers of the executor
+
+    Returns
+    -------
+    chunks : Iterator[np.ndarray]
+        Arrays of shape (steps, n) with n <= chunk_size, covering N paths
+    forecast_index : pd.PeriodIndex
+        The quarters covered by the forecast.
+    """
+    from .models.bayesian import ForecastState, _simulate_bayesian_block
+
+    forecast_index = forecast_period_index(df_quarterly, end)
+    steps = len(forecast_index)
+    if not isinstance(idata, ForecastState):
+        idata = ForecastState.from_inference_data(idata)
+    blocks = _iter_blocks(
+        _simulate_bayesian_block, (idata, steps), N, seed, executor, max_workers
+    )
+    return _rechunk(blocks, chunk_size), forecast_index
+
+
+def _chunk_sizes(N: int, chunk_size: int) -> Iterator[int]:
+    """Split N paths into chunks of at most chunk_size."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive.")
+    for start in range(0, N, chunk_size):
+        yield min(chunk_size, N - start)
+
+
+def _iter_blocks(
+    simulate_block: Callable[..., np.ndarray],
+    args: Tuple,
+    N: int,
+    seed: Optional[int],
+    executor: Optional[Union[str, Executor]],
+    max_workers: Optional[int]
+) -> Iterator[np.ndarray]:
+    """
+    Simulate N paths in blocks of ``BLOCK_SIZE``, in order.
+
+    Block i is ``simulate_block(*args, n_i, seed_i)``, where seed_i is the
+    i-th ``SeedSequence`` spawned from the seed. With an executor, a few
+    blocks per worker are in flight at a time, so memory stays bounded.
+    The "process" executor receives args once per worker; other executors,
+    including ``ProcessPoolExecutor`` instances, receive them with each block.
+    """
+    from .batch import get_executor
+
+    sizes = list(_chunk_sizes(N, BLOCK_SIZE))
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if executor is None:
+        for n, block_seed in zip(sizes, seeds):
+            yield simulate_block(*args, n, block_seed)
+        return
+
+    if executor == "process":
+        # Avoid pickling the fitted model again for every block
+        context = ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_set_worker_args, initargs=(args,)
+        )
+        task: Tuple = (_simulate_worker_block, simulate_block)
+    else:
+        context = get_executor(executor, max_workers)
+        task = (simulate_block, *args)
+
+    with context as pool:
+        in_flight = 2 * (max_workers or os.cpu_count() or 1)
+        pending: Deque[Future] = deque()
+        for n, block_seed in zip(sizes, seeds):
+            pending.append(pool.submit(*task, n, block_seed))
+            if len(pending) >= in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _set_worker_args(args: Tuple) -> None:
+    global _WORKER_ARGS
+    _WORKER_ARGS = args
+
+
+def _simulate_worker_block(
+    simulate_block: Callable[..., np.ndarray], n: int, seed: np.random.SeedSequence
+) -> np.ndarray:
+    return simulate_block(*_WORKER_ARGS, n, seed)
+
+
+def _rechunk(blocks: Iterable[np.ndarray], chunk_size: int) -> Iterator[np.ndarray]:
+    """Regroup a stream of (steps, n) blocks into chunks of chunk_size paths."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive.")
+    parts: List[np.ndarray] = []
+    size = 0
+    for block in blocks:
+        start = 0
+        while start < block.shape[1]:
+            take = min(chunk_size - size, block.shape[1] - start)
+            parts.append(block[:, start:start + take])
+            size += take
+            start += take
+            if size == chunk_size:
+                yield parts[0] if len(parts) == 1 else np.concatenate(parts, axis=1)
+                parts, size = [], 0
+    if parts:
+        yield parts[0] if len(parts) == 1 else np.concatenate(parts, axis=1)
+
+
+class MeanAccumulator:
+    """
+    Online weighted mean of each forecast quarter.
+
+    Parameters
+    ----------
+    steps : int
+        Number of forecast quarters
+    """
+
+    def __init__(self, steps: int):
+        self.total = np.zeros(steps)
+        self.weight = 0.0
+
+    def update(self, chunk: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        """Add a chunk of shape (steps, n), with optional path weights of length n."""
+        if weights is None:
+            weights = np.ones(chunk.shape[1])
+        self.total += chunk.dot(weights)
+        self.weight += weights.sum()
+
+    def merge(self, other: "MeanAccumulator") -> None:
+        """Combine with an accumulator fed with other chunks."""
+        self.total += other.total
+        self.weight += other.weight
+
+    def result(self) -> np.ndarray:
+        """Weighted mean of shape (steps,)."""
+        return self.total / self.weight
+
+
+class QuantileSketch:
+    """
+    Mergeable sketch of the weighted distribution of each forecast quarter.
+
+    Each quarter is summarized by at most ``max_centroids`` weighted
+    centroids, in the style of a t-digest: centroids are small in the tails
+    and larger in the middle of the distribution, so extreme quantiles stay
+    accurate. Sketches fed with different chunks can be merged.
+
+    Parameters
+    ----------
+    steps : int
+        Number of forecast quarters
+    max_centroids : int, optional
+        Maximum number of centroids per quarter (default: 200)
+    """
+
+    def __init__(self, steps: int, max_centroids: int = 200):
+        self.max_centroids = max_centroids
+        self.means = [np.zeros(0) for _ in range(steps)]
+        self.weights = [np.zeros(0) for _ in range(steps)]
+        self.min = np.full(steps, np.inf)
+        self.max = np.full(steps, -np.inf)
+
+    def update(self, chunk: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        """Add a chunk of shape (steps, n), with optional path weights of length n."""
+        if weights is None:
+            weights = np.ones(chunk.shape[1])
+        keep = weights > 0
+        chunk, weights = chunk[:, keep], weights[keep]
+        if chunk.shape[1] == 0:
+            return
+
+        self.min = np.minimum(self.min, chunk.min(axis=1))
+        self.max = np.maximum(self.max, chunk.max(axis=1))
+        for i in range(len(self.means)):
+            self._compress(
+                i,
+                np.concatenate([self.means[i], chunk[i]]),
+                np.concatenate([self.weights[i], weights]),
+            )
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Combine with a sketch fed with other chunks."""
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        for i in range(len(self.means)):
+            self._compress(
+                i,
+                np.concatenate([self.means[i], other.means[i]]),
+                np.concatenate([self.weights[i], other.weights[i]]),
+            )
+
+    def quantile(self, probs: Sequence[float]) -> np.ndarray:
+        """
+        Approximate weighted quantiles.
+
+        Parameters
+        ----------
+        probs : Sequence[float]
+            Probability levels in [0, 1]
+
+        Returns
+        -------
+        np.ndarray
+            Shape (len(probs), steps)
+        """
+        probs = np.asarray(probs, dtype=float)
+        out = np.empty((len(probs), len(self.means)))
+        for i, (means, weights) in enumerate(zip(self.means, self.weights)):
+            cum = np.cumsum(weights)
+            positions = (cum - weights / 2) / cum[-1]
+            out[:, i] = np.interp(
+                probs,
+                np.concatenate([[0.0], positions, [1.0]]),
+                np.concatenate([[self.min[i]], means, [self.max[i]]]),
+            )
+        return out
+
+    def _compress(self, i: int, means: np.ndarray, weights: np.ndarray) -> None:
+        """Merge sorted points into centroids of bounded size."""
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cum = np.cumsum(weights)
+        q = (cum - weights / 2) / cum[-1]
+        # The arcsine scale gives the tails many small centroids
+        scale = np.arcsin(2 * q - 1) / np.pi + 0.5
+        bucket = np.minimum((scale * self.max_centroids).astype(int), self.max_centroids - 1)
+        bucket_weight = np.bincount(bucket, weights=weights)
+        occupied = bucket_weight > 0
+        self.weights[i] = bucket_weight[occupied]
+        self.means[i] = (
+            np.bincount(bucket, weights=weights * means)[occupied] / self.weights[i]
+        )
+
+
+class DeclineAccumulator:
+    """
+    Online weighted probabilities of quarter-over-quarter declines.
+
+    Parameters
+    ----------
+    forecast_index : pd.PeriodIndex
+        Index of time periods corresponding to the chunk rows
+    start_year : int, optional
+        Year from which the windowed probability of any decline is
+        computed (default: 2025)
+    """
+
+    def __init__(self, forecast_index: pd.PeriodIndex, start_year: int = 2025):
+        self.forecast_index = forecast_index
+        self.start_year = start_year
+        self.start_idx = _start_index(forecast_index, start_year)
+
+        self.quarter_declines = np.zeros(len(forecast_index) - 1)
+        self.any_decline = 0.0
+        self.window_decline = 0.0
+        self.weight = 0.0
+
+    def update(self, chunk: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        """Add a chunk of shape (steps, n), with optional path weights of length n."""
+        if weights is None:
+            weights = np.ones(chunk.shape[1])
+        per_quarter, overall, window = _decline_totals(chunk, weights, self.start_idx)
+        self.quarter_declines += per_quarter
+        self.any_decline += overall
+        self.window_decline += window
+        self.weight += weights.sum()
+
+    def merge(self, other: "DeclineAccumulator") -> None:
+        """Combine with an accumulator fed with other chunks."""
+        self.quarter_declines += other.quarter_declines
+        self.any_decline += other.any_decline
+        self.window_decline += other.window_decline
+        self.weight += other.weight
+
+    def result(self) -> Tuple[pd.DataFrame, float, float]:
+        """
+        Decline probabilities of the chunks seen so far, as returned by
+        ``decline_probabilities``.
+        """
+        return _decline_frame(
+            self.quarter_declines / self.weight,
+            self.any_decline / self.weight,
+            self.window_decline / self.weight,
+            self.forecast_index,
+            self.start_year,
+            self.start_idx,
+        )
+
+
+def summarize_chunks(
+    chunks: Iterable[np.ndarray],
+    forecast_index: pd.PeriodIndex,
+    weights: Optional[np.ndarray] = None,
+    probs: Sequence[float] = (0.05, 0.5, 0.95),
+    start_year: int = 2025,
+    max_centroids: int = 200
+) -> Dict[str, Any]:
+    """
+    Summarize a stream of simulation chunks in one pass.
+
+    Parameters
+    ----------
+    chunks : Iterable[np.ndarray]
+        Arrays of shape (steps, n), e.g. from ``iter_simulations``
+    forecast_index : pd.PeriodIndex
+        Index of time periods corresponding to the chunk rows
+    weights : np.ndarray, optional
+        Weight vector over all N paths, consumed in chunk order. If None,
+        equal weights are used.
+    probs : Sequence[float], optional
+        Quantile levels (default: 5%, 50% and 95%)
+    start_year : int, optional
+        Year from which decline probabilities are reported (default: 2025)
+    max_centroids : int, optional
+        Size of the quantile sketch per quarter (default: 200)
+
+    Returns
+    -------
+    Dict[str, Any]
+        "mean": pd.Series of weighted means by quarter;
+        "quantiles": pd.DataFrame of approximate quantiles by quarter, one
+        column per level;
+        "prob_decrease": pd.DataFrame of quarter-over-quarter decline
+        probabilities from start_year onward;
+        "overall_prob_drop" and "prob_drop_start_year_on": probabilities of
+        at least one decline over the forecast and from start_year onward
+    """
+    steps = len(forecast_index)
+    mean = MeanAccumulator(steps)
+    sketch = QuantileSketch(steps, max_centroids)
+    declines = DeclineAccumulator(forecast_index, start_year)
+
+    offset = 0
+    for chunk in chunks:
+        n = chunk.shape[1]
+        chunk_weights = weights[offset:offset + n] if weights is not None else None
+        offset += n
+        for accumulator in (mean, sketch, declines):
+            accumulator.update(chunk, chunk_weights)
+
+    df_prob_fall, overall, window = declines.result()
+    return {
+        "mean": pd.Series(mean.result(), index=forecast_index, name="mean"),
+        "quantiles": pd.DataFrame(
+            sketch.quantile(probs).T, index=forecast_index, columns=list(probs)
+        ),
+        "prob_decrease": df_prob_fall,
+        "overall_prob_drop": overall,
+        "prob_drop_start_year_on": window,
+    }
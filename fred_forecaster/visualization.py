@@ -7,14 +7,20 @@ import plotly.express as px
 from typing import Optional, Tuple, Dict, Any, List
 
 from .data import get_series_name, get_series_title
+from .instrumentation import instrumented
+from .stats import decline_probabilities, summarize_simulations
 
 
+@instrumented
 def plot_forecasts(
     df_quarterly: pd.DataFrame, 
     sim_array: np.ndarray, 
     forecast_index: pd.PeriodIndex, 
     weights: Optional[np.ndarray] = None,
-    num_paths_to_show: int = 50
+    num_paths_to_show: int = 50,
+    render: str = "traces",
+    max_history_points: Optional[int] = None,
+    density_bins: int = 100
 ) -> go.Figure:
     """
     Plot historical data + simulation paths + (optional) weighted means using Plotly.
@@ -31,12 +37,36 @@ def plot_forecasts(
         Weight vector of length N. If None, equal weights are used.
     num_paths_to_show : int, optional
         Number of individual simulation paths to show (default: 50)
+    render : str, optional
+        How to draw the simulations (default: "traces"):
+        
+        - "traces": one ``Scatter`` trace per shown path.
+        - "webgl": all shown paths in a single ``Scattergl`` trace, separated
+          by gaps, with the data sent as binary typed arrays. Figure size and
+          render time stay flat as ``num_paths_to_show`` grows.
+        - "density": a heatmap of the (weighted) distribution of every
+          quarter over all N paths instead of individual paths.
+    max_history_points : int, optional
+        If given, thin the historical series to at most this many points,
+        always keeping the last observation
+    density_bins : int, optional
+        Number of value bins of the "density" heatmap (default: 100)
         
     Returns
     -------
     go.Figure
         Plotly figure object
+        
+    Raises
+    ------
+    ValueError
+        If the render mode is unknown
     """
+    if render not in ("traces", "webgl", "density"):
+        raise ValueError(
+            f"Unknown render mode: {render!r}. Use 'traces', 'webgl' or 'density'."
+        )
+    
     # Get series name and title
     series_name = get_series_name(df_quarterly)
     series_title = get_series_title(df_quarterly)
@@ -51,19 +81,55 @@ def plot_forecasts(
     # Convert forecast index to timestamps
     forecast_dates = forecast_index.to_timestamp()
     
+    hist_values = df_quarterly[series_name].to_numpy()
+    if max_history_points is not None and len(hist_values) > max_history_points:
+        keep = _decimate(len(hist_values), max_history_points)
+        hist_dates, hist_values = hist_dates[keep], hist_values[keep]
+    
+    if render != "traces":
+        # Numeric dates let Plotly encode the data as binary arrays
+        hist_x, forecast_x = _epoch_ms(hist_dates), _epoch_ms(forecast_dates)
+        fig.update_xaxes(type="date")
+    else:
+        hist_x, forecast_x = hist_dates, forecast_dates
+    
     # Add historical data
     fig.add_trace(
         go.Scatter(
-            x=hist_dates,
-            y=df_quarterly[series_name],
+            x=hist_x,
+            y=hist_values,
             mode="lines",
             line=dict(color="black", width=2),
             name="Historical"
         )
     )
     
+    if render == "density":
+        fig.add_trace(
+            _density_heatmap(sim_array, forecast_x, weights, density_bins)
+        )
+    elif render == "webgl" and num_paths_to_show > 0:
+        paths_to_show = min(num_paths_to_show, sim_array.shape[1])
+        indices = np.random.choice(sim_array.shape[1], paths_to_show, replace=False)
+        
+        # One trace with a NaN gap after each path
+        steps = len(forecast_x)
+        x = np.tile(np.append(forecast_x, np.nan), paths_to_show)
+        y = np.full((paths_to_show, steps + 1), np.nan, dtype=np.float32)
+        y[:, :steps] = sim_array[:, indices].T
+        fig.add_trace(
+            go.Scattergl(
+                x=x,
+                y=y.ravel(),
+                mode="lines",
+                line=dict(color="rgba(200, 200, 200, 0.3)"),
+                connectgaps=False,
+                hoverinfo="skip",
+                showlegend=False
+            )
+        )
     # Plot a subset of individual simulation paths
-    if num_paths_to_show > 0:
+    elif num_paths_to_show > 0:
         paths_to_show = min(num_paths_to_show, sim_array.shape[1])
         indices = np.random.choice(sim_array.shape[1], paths_to_show, replace=False)
         
@@ -78,53 +144,39 @@ def plot_forecasts(
                 )
             )
     
-    # Weighted mean or unweighted average
+    # Weighted mean and 5-95% band in one pass over the ensemble
+    summary = summarize_simulations(
+        sim_array, forecast_index, weights, probs=(0.05, 0.95)
+    )
+    lower_bound = summary[0.05].to_numpy()
+    upper_bound = summary[0.95].to_numpy()
+    
     if weights is not None:
-        # Calculate weighted mean
-        weighted_mean = np.dot(sim_array, weights)
-        
-        # Calculate percentiles
-        lower_bound = np.percentile(sim_array, 5, axis=1)
-        upper_bound = np.percentile(sim_array, 95, axis=1)
-        
         # Add weighted mean
         fig.add_trace(
             go.Scatter(
-                x=forecast_dates,
-                y=weighted_mean,
+                x=forecast_x,
+                y=summary["mean"].to_numpy(),
                 mode="lines",
                 line=dict(color="blue", width=2),
                 name="Weighted Mean"
             )
         )
-        
-        # Add confidence interval
-        fig.add_trace(
-            go.Scatter(
-                x=np.concatenate([forecast_dates, forecast_dates[::-1]]),
-                y=np.concatenate([upper_bound, lower_bound[::-1]]),
-                fill="toself",
-                fillcolor="rgba(0, 0, 255, 0.2)",
-                line=dict(color="rgba(0, 0, 255, 0)"),
-                name="5-95% Confidence Interval"
-            )
-        )
+        band_color = "0, 0, 255"
     else:
-        # Calculate simple percentiles
-        lower_bound = np.percentile(sim_array, 5, axis=1)
-        upper_bound = np.percentile(sim_array, 95, axis=1)
-        
-        # Add confidence interval
-        fig.add_trace(
-            go.Scatter(
-                x=np.concatenate([forecast_dates, forecast_dates[::-1]]),
-                y=np.concatenate([upper_bound, lower_bound[::-1]]),
-                fill="toself",
-                fillcolor="rgba(255, 165, 0, 0.2)",
-                line=dict(color="rgba(255, 165, 0, 0)"),
-                name="5-95% Confidence Interval"
-            )
+        band_color = "255, 165, 0"
+    
+    # Add confidence interval
+    fig.add_trace(
+        go.Scatter(
+            x=np.concatenate([forecast_x, forecast_x[::-1]]),
+            y=np.concatenate([upper_bound, lower_bound[::-1]]),
+            fill="toself",
+            fillcolor=f"rgba({band_color}, 0.2)",
+            line=dict(color=f"rgba({band_color}, 0)"),
+            name="5-95% Confidence Interval"
         )
+    )
     
     # Update layout
     y_axis_title = f"{series_title}"
@@ -175,6 +227,51 @@ def plot_forecasts(
     return fig
 
 
+def _epoch_ms(dates: pd.DatetimeIndex) -> np.ndarray:
+    """Dates as float milliseconds since the epoch, as Plotly date axes accept."""
+    return dates.as_unit("ms").asi8.astype(float)
+
+
+def _decimate(n: int, max_points: int) -> np.ndarray:
+    """Evenly spaced positions out of n, including the first and last."""
+    return np.unique(np.linspace(0, n - 1, max(max_points, 2)).round().astype(int))
+
+
+def _density_heatmap(
+    sim_array: np.ndarray,
+    forecast_x: np.ndarray,
+    weights: Optional[np.ndarray],
+    bins: int
+) -> go.Heatmap:
+    """Heatmap of the share of paths in each value bin, per quarter."""
+    steps, N = sim_array.shape
+    if weights is None:
+        weights = np.ones(N)
+    
+    # Row by row, so a memory-mapped ensemble is never copied whole.
+    # fmin and fmax skip NaN without building a mask of the whole array.
+    low = np.fmin.reduce([np.fmin.reduce(row) for row in sim_array])
+    high = np.fmax.reduce([np.fmax.reduce(row) for row in sim_array])
+    width = (high - low) / bins if high > low else 1.0
+    
+    counts = np.empty((steps, bins))
+    for i, row in enumerate(sim_array):
+        bin_idx = np.clip(((row - low) / width).astype(np.intp), 0, bins - 1)
+        counts[i] = np.bincount(bin_idx, weights=weights, minlength=bins)
+    share = counts / counts.sum(axis=1, keepdims=True)
+    
+    return go.Heatmap(
+        x=forecast_x,
+        y=low + width * (np.arange(bins) + 0.5),
+        z=share.T.astype(np.float32),
+        colorscale="Greys",
+        showscale=False,
+        hoverinfo="skip",
+        name="Simulation Density"
+    )
+
+
+@instrumented
 def plot_drop_probabilities(
     sim_array: np.ndarray, 
     forecast_index: pd.PeriodIndex, 
@@ -200,42 +297,9 @@ def plot_drop_probabilities(
     go.Figure
         Plotly figure object
     """
-    # If no weights, assume uniform
-    N = sim_array.shape[1]
-    if weights is None:
-        weights = np.ones(N) / N
-
-    # Probability for each quarter from start_year onward
-    prob_fall_data = []
-    for i in range(1, len(forecast_index)):
-        if forecast_index[i].year < start_year:
-            continue
-        arr_this = sim_array[i, :]
-        arr_prev = sim_array[i - 1, :]
-        prob = np.dot(weights, (arr_this < arr_prev).astype(float))
-        prob_fall_data.append((forecast_index[i], prob))
-
-    df_prob_fall = pd.DataFrame(
-        prob_fall_data, columns=["Quarter", "ProbDecrease"]
-    ).set_index("Quarter")
-
-    # Overall probability of at least one drop
-    diffs = np.diff(sim_array, axis=0)
-    has_decline = (diffs < 0).any(axis=0).astype(float)
-    overall_prob_drop = np.dot(weights, has_decline)
-
-    # Probability from start_year onward
-    start_idx = None
-    for i, q in enumerate(forecast_index):
-        if q.year >= start_year:
-            start_idx = i
-            break
-    if start_idx is not None:
-        relevant_diffs = np.diff(sim_array[start_idx:], axis=0)
-        has_decline_start_year = (relevant_diffs < 0).any(axis=0).astype(float)
-        prob_drop_start_year_on = np.dot(weights, has_decline_start_year)
-    else:
-        prob_drop_start_year_on = np.nan
+    df_prob_fall, overall_prob_drop, prob_drop_start_year_on = decline_probabilities(
+        sim_array, forecast_index, weights, start_year
+    )
 
     # Create plot
     fig = go.Figure()
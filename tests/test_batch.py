@@ -0,0 +1,55 @@
+import unittest
+import pandas as pd
+import numpy as np
+from fred_forecaster.batch import fit_and_simulate_many, run_batch
+
+
+def _square_or_fail(x):
+    if x < 0:
+        raise ValueError("negative input")
+    return x * x
+
+
+class TestBatch(unittest.TestCase):
+    
+    def setUp(self):
+        """Create a small panel of quarterly series"""
+        index = pd.period_range('2020Q1', periods=12, freq='Q-DEC')
+        self.series = {
+            f"S{i}": pd.DataFrame({'Debt': np.linspace(100, 210, 12) * (i + 1)}, index=index)
+            for i in range(3)
+        }
+        
+    def test_run_batch_isolates_errors(self):
+        """Test that a failing item does not abort the batch"""
+        for executor in ["serial", "thread", "process"]:
+            results = run_batch(_square_or_fail, [3, -1, 2], executor=executor, max_workers=2)
+            
+            self.assertEqual([r.key for r in results], ["0", "1", "2"])
+            self.assertEqual([r.value for r in results], [9, None, 4])
+            self.assertFalse(results[1].ok)
+            self.assertIn("negative input", results[1].error)
+            self.assertIn("ValueError", results[1].traceback)
+            
+    def test_fit_and_simulate_many(self):
+        """Test that batch fits keep input order and match a serial run"""
+        results = fit_and_simulate_many(
+            self.series, end="2023Q4", N=20, executor="process", max_workers=2
+        )
+        serial = fit_and_simulate_many(self.series, end="2023Q4", N=20, executor="serial")
+        
+        self.assertEqual([r.key for r in results], ["S0", "S1", "S2"])
+        for result, expected in zip(results, serial):
+            self.assertTrue(result.ok, result.error)
+            sim_array, forecast_index = result.value
+            self.assertEqual(sim_array.shape, (4, 20))
+            np.testing.assert_allclose(sim_array, expected.value[0], atol=1e-2)
+        
+    def test_unknown_executor(self):
+        """Test that an unknown executor name is rejected"""
+        with self.assertRaises(ValueError):
+            run_batch(_square_or_fail, [1], executor="bogus")
+
+
+if __name__ == '__main__':
+    unittest.main()
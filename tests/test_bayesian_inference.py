@@ -0,0 +1,93 @@
+import importlib.util
+import unittest
+from unittest.mock import patch
+import pytest
+import pandas as pd
+import numpy as np
+import arviz as az
+from fred_forecaster.models.bayesian import (
+    compare_posteriors,
+    fit_bayesian_kalman_model,
+    fit_bayesian_model,
+    generate_bayesian_simulations,
+)
+
+
+class TestFastInference(unittest.TestCase):
+    
+    def setUp(self):
+        """Create a trending quarterly series"""
+        rng = np.random.default_rng(0)
+        index = pd.period_range('2015Q1', periods=24, freq='Q-DEC')
+        values = 20 + np.cumsum(0.5 + rng.normal(0, 0.3, 24))
+        self.df = pd.DataFrame({'Debt': values}, index=index)
+        
+    def test_compare_posteriors(self):
+        """Test the accuracy table of an approximation against a reference"""
+        rng = np.random.default_rng(1)
+        reference = az.from_dict(posterior={
+            "sigma_obs": rng.normal(1.0, 0.1, (2, 2000)),
+            "level": rng.normal(5.0, 1.0, (2, 2000, 10)),
+        })
+        approx = az.from_dict(posterior={
+            "sigma_obs": rng.normal(1.05, 0.05, (1, 4000)),
+            "level": rng.normal(5.0, 1.0, (1, 4000, 10)),
+        })
+        
+        df = compare_posteriors(approx, reference)
+        self.assertEqual(list(df.index), ["sigma_obs", "level[-1]"])
+        self.assertAlmostEqual(df.loc["sigma_obs", "mean_error"], 0.5, delta=0.05)
+        self.assertAlmostEqual(df.loc["sigma_obs", "sd_ratio"], 0.5, delta=0.05)
+        self.assertLess(abs(df.loc["level[-1]", "mean_error"]), 0.1)
+        self.assertAlmostEqual(df.loc["level[-1]", "sd_ratio"], 1.0, delta=0.1)
+        
+    def test_unknown_method(self):
+        """Test that an unknown inference method is rejected"""
+        with self.assertRaises(ValueError):
+            fit_bayesian_model(self.df, method="laplace")
+        with self.assertRaises(ValueError):
+            fit_bayesian_kalman_model(self.df, method="laplace")
+            
+    @unittest.skipIf(importlib.util.find_spec("pymc_extras"), "pymc-extras is installed")
+    def test_pathfinder_requires_pymc_extras(self):
+        """Test that Pathfinder without pymc-extras names the missing extra"""
+        with self.assertRaisesRegex(ImportError, "pymc-extras"):
+            fit_bayesian_kalman_model(self.df, method="pathfinder")
+            
+    def test_sampler_progress(self):
+        """Test that sampler iterations are reported to the progress callback"""
+        fake_idata = az.from_dict(posterior={"sigma_obs": np.ones((2, 5))})
+        
+        def fake_sample(*args, callback=None, **kwargs):
+            for _ in range(3):
+                callback(trace=None, draw=None)
+            return fake_idata
+        
+        calls = []
+        with patch('pymc.sample', side_effect=fake_sample):
+            fit_bayesian_kalman_model(
+                self.df, smooth_states=False, progress=lambda *args: calls.append(args)
+            )
+        self.assertEqual(calls, [(1, 2000), (2, 2000), (3, 2000)])
+        
+    @pytest.mark.slow  # Mark as slow test to skip in quick test runs
+    def test_advi_feeds_simulations(self):
+        """Test that ADVI draws can be simulated like NUTS draws"""
+        calls = []
+        model, idata = fit_bayesian_kalman_model(
+            self.df, method="advi", random_seed=0, progress=lambda *args: calls.append(args)
+        )
+        
+        self.assertEqual(calls[-1][1], 10000)
+        self.assertEqual(idata.posterior.sizes["chain"], 1)
+        for var in ["sigma_obs", "level", "trend", "seasonal"]:
+            self.assertIn(var, idata.posterior)
+        sim_array, forecast_index = generate_bayesian_simulations(
+            model, idata, self.df, end="2022Q4", N=50
+        )
+        self.assertEqual(sim_array.shape, (len(forecast_index), 50))
+        self.assertTrue(np.all(np.isfinite(sim_array)))
+
+
+if __name__ == '__main__':
+    unittest.main()
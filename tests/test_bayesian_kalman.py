@@ -0,0 +1,86 @@
+import unittest
+import pandas as pd
+import numpy as np
+import pytest
+import pytensor.tensor as pt
+from scipy.stats import multivariate_normal
+from fred_forecaster.models.bayesian import (
+    _kalman_loglik,
+    _simulation_smoother,
+    _spectral_loglik,
+    fit_bayesian_kalman_model,
+    generate_bayesian_simulations,
+)
+
+
+class TestKalmanMarginalizedModel(unittest.TestCase):
+    
+    def setUp(self):
+        """Create test data and the exact marginal covariance of the model"""
+        rng = np.random.default_rng(1)
+        self.y = np.cumsum(rng.normal(0, 1, 20)) + 5
+        self.state_var, self.obs_var, self.init_var = 0.3, 0.2, 1.02
+        t = np.arange(len(self.y))
+        self.cov = (
+            self.init_var + self.state_var * np.minimum.outer(t, t)
+            + self.obs_var * np.eye(len(self.y))
+        )
+        
+    def test_likelihoods_match_exact_marginal(self):
+        """Test that both likelihood forms equal the multivariate normal density"""
+        exact = multivariate_normal(np.full(len(self.y), self.y[0]), self.cov).logpdf(self.y)
+        
+        spectral = _spectral_loglik(
+            self.y, self.init_var,
+            pt.as_tensor_variable(self.state_var), pt.as_tensor_variable(self.obs_var)
+        ).eval()
+        kalman = _kalman_loglik(
+            pt.as_tensor_variable(self.y), pt.as_tensor_variable(np.ones(len(self.y))),
+            self.y[0], self.init_var, self.state_var, self.obs_var
+        ).eval()
+        
+        self.assertAlmostEqual(spectral, exact, places=8)
+        self.assertAlmostEqual(kalman, exact, places=8)
+        
+    def test_kalman_likelihood_skips_missing(self):
+        """Test that missing observations are marginalized out"""
+        observed = np.ones(len(self.y), dtype=bool)
+        observed[5] = False
+        exact = multivariate_normal(
+            np.full(observed.sum(), self.y[0]), self.cov[np.ix_(observed, observed)]
+        ).logpdf(self.y[observed])
+        
+        kalman = _kalman_loglik(
+            pt.as_tensor_variable(np.where(observed, self.y, 0.0)),
+            pt.as_tensor_variable(observed.astype(float)),
+            self.y[0], self.init_var, self.state_var, self.obs_var
+        ).eval()
+        self.assertAlmostEqual(kalman, exact, places=8)
+        
+    def test_smoother_reproduces_observations(self):
+        """Test that smoothed states add up to the data when noise is negligible"""
+        states = _simulation_smoother(
+            self.y, np.full((3, 3), [0.1, 0.01, 0.01]), np.full(3, 1e-10),
+            np.random.default_rng(0)
+        )
+        self.assertEqual(states.shape, (3, len(self.y), 3))
+        np.testing.assert_allclose(states.sum(axis=-1), np.tile(self.y, (3, 1)), atol=1e-3)
+        
+    @pytest.mark.slow  # Mark as slow test to skip in quick test runs
+    def test_fit_and_simulate(self):
+        """Test that the fitted model feeds generate_bayesian_simulations"""
+        index = pd.period_range('2019Q1', periods=len(self.y), freq='Q-DEC')
+        df = pd.DataFrame({'Debt': self.y}, index=index)
+        model, idata = fit_bayesian_kalman_model(df, random_seed=0)
+        
+        for var in ["sigma_level", "sigma_obs", "level", "trend", "seasonal"]:
+            self.assertIn(var, idata.posterior)
+        sim_array, forecast_index = generate_bayesian_simulations(
+            model, idata, df, end="2024Q4", N=50
+        )
+        self.assertEqual(sim_array.shape, (len(forecast_index), 50))
+        self.assertTrue(np.all(~np.isnan(sim_array)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from fred_forecaster.models.bayesian import _simulate_paths
+
+
+class TestBayesianSimulationEngine(unittest.TestCase):
+    
+    def test_noise_free_paths_follow_trend_and_season(self):
+        """Test that the batched recursion reproduces the local linear trend"""
+        N, steps = 5, 9
+        last_level = np.arange(N, dtype=float)
+        last_trend = np.full(N, 0.5)
+        season_pattern = np.tile([1.0, -1.0, 2.0, -2.0], (N, 1))
+        
+        sim_array = _simulate_paths(
+            last_level, last_trend, season_pattern, np.zeros(N), steps
+        )
+        
+        step = np.arange(1, steps + 1)[:, np.newaxis]
+        expected = (
+            last_level + step * last_trend
+            + season_pattern.T[np.arange(steps) % 4]
+        )
+        self.assertEqual(sim_array.shape, (steps, N))
+        np.testing.assert_allclose(sim_array, expected)
+    
+    def test_noise_scale(self):
+        """Test that the one-step-ahead spread matches the per-path sigma"""
+        np.random.seed(0)
+        N = 200000
+        sim_array = _simulate_paths(
+            np.zeros(N), np.zeros(N), np.zeros((N, 4)), np.ones(N), 2
+        )
+        
+        # Level, seasonal and observation noise at the first step
+        expected_std = np.sqrt(1 / 100 + 1 / 400 + 1)
+        self.assertAlmostEqual(sim_array[0].std(), expected_std, places=2)
+        self.assertTrue(np.all(~np.isnan(sim_array)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from benchmarks.run import FakeFredClient, compare, main, measure, run
+from fred_forecaster.data import fetch_fred_data
+
+
+class TestBenchmarks(unittest.TestCase):
+    
+    def test_fake_client_serves_quarterly_data(self):
+        """Test that the fake client feeds the real fetch path"""
+        df = fetch_fred_data("SYNTH", client=FakeFredClient(n_months=120))
+        self.assertEqual(len(df), 40)
+        self.assertEqual(df.attrs["title"], "Synthetic SYNTH")
+        
+    def test_measure_traces_numpy_memory(self):
+        """Test that peak memory includes NumPy allocations"""
+        stats = measure(lambda: np.ones(2_000_000), repeat=1)
+        self.assertGreater(stats["peak_mb"], 15)
+        self.assertGreater(stats["time"], 0)
+        
+    def test_run_and_compare(self):
+        """Test a tiny sweep and the regression check against it"""
+        baseline = run(repeat=1, only="generate_bayesian_simulations")
+        self.assertEqual(len(baseline["results"]), 4)
+        self.assertEqual(compare(baseline, baseline), [])
+        
+        slower = {
+            "environment": baseline["environment"],
+            "results": [dict(r, time=r["time"] * 2) for r in baseline["results"]],
+        }
+        self.assertEqual(len(compare(slower, baseline)), 4)
+        
+        failed = {
+            "environment": baseline["environment"],
+            "results": [{"name": r["name"], "params": r["params"], "error": "ValueError: x"}
+                        for r in baseline["results"][:1]],
+        }
+        self.assertIn("failed with ValueError", compare(failed, baseline)[0])
+        
+    def test_compare_without_baseline(self):
+        """Test that comparing against a missing baseline fails before running"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            missing = os.path.join(tmpdir, "baseline.json")
+            with self.assertRaises(SystemExit) as cm:
+                main(["--compare", "--baseline", missing, "--only", "nothing"])
+        self.assertNotEqual(cm.exception.code, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import time
+import threading
+import unittest
+from unittest import mock
+import pandas as pd
+import numpy as np
+from fred_forecaster.cache import FredCache
+from fred_forecaster.data import fetch_fred_data
+
+
+class FakeFred:
+    """Local stand-in for fredapi.Fred that counts requests"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def get_series_info(self, series_id):
+        self.calls.append(("info", series_id))
+        return pd.Series({"title": f"Title {series_id}", "units": "Billions of Dollars",
+                          "frequency": "Monthly"})
+    
+    def get_series(self, series_id):
+        self.calls.append(("series", series_id))
+        index = pd.date_range("2020-01-01", periods=24, freq="MS")
+        return pd.Series(np.arange(24, dtype=float), index=index)
+
+
+class TestFredCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.client = FakeFred()
+        
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        
+    def test_cache_hit_skips_client(self):
+        """Test that a fresh cache entry is served without network requests"""
+        cache = FredCache(self.tmpdir.name)
+        first = fetch_fred_data("TEST", cache=cache, client=self.client)
+        second = fetch_fred_data("TEST", cache=cache, client=self.client)
+        
+        self.assertEqual(len(self.client.calls), 2)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(second.attrs["title"], "Title TEST")
+        self.assertEqual(second.attrs["units"], "Billions of Dollars")
+        
+    def test_expired_entry_is_refetched(self):
+        """Test that entries older than the TTL are downloaded again"""
+        cache = FredCache(self.tmpdir.name, ttl=0)
+        fetch_fred_data("TEST", cache=cache, client=self.client)
+        time.sleep(0.01)
+        fetch_fred_data("TEST", cache=cache, client=self.client)
+        self.assertEqual(len(self.client.calls), 4)
+        
+    def test_offline_mode(self):
+        """Test that offline mode serves stale entries and never fetches"""
+        fetch_fred_data("TEST", cache=FredCache(self.tmpdir.name), client=self.client)
+        offline = FredCache(self.tmpdir.name, ttl=0, offline=True)
+        
+        result = fetch_fred_data("TEST", cache=offline, client=self.client)
+        self.assertEqual(len(result), 8)
+        self.assertEqual(len(self.client.calls), 2)
+        
+        with self.assertRaises(LookupError):
+            fetch_fred_data("MISSING", cache=offline, client=self.client)
+            
+    def test_lru_eviction(self):
+        """Test that the least recently used series is evicted first"""
+        cache = FredCache(self.tmpdir.name, max_bytes=None)
+        for series_id in ["A", "B", "C"]:
+            fetch_fred_data(series_id, cache=cache, client=self.client)
+        # Room for A and C only; sizes differ slightly with the metadata
+        max_bytes = os.path.getsize(cache.path("A")) + os.path.getsize(cache.path("C"))
+        
+        # Touch A so that B becomes the least recently used entry
+        os.utime(cache.path("B"), (0, 0))
+        os.utime(cache.path("C"), (1, 1))
+        cache.get("A")
+        cache.max_bytes = max_bytes
+        cache.prune()
+        
+        self.assertTrue(os.path.exists(cache.path("A")))
+        self.assertFalse(os.path.exists(cache.path("B")))
+        self.assertTrue(os.path.exists(cache.path("C")))
+
+    def test_similar_ids_do_not_collide(self):
+        """Test that IDs differing only in unsafe characters get their own entries"""
+        cache = FredCache(self.tmpdir.name)
+        series = pd.Series([1.0, 2.0], index=pd.date_range("2020-01-01", periods=2, freq="MS"))
+        cache.put("A/B", series, {"title": "slash"})
+        cache.put("A_B", series * 2, {"title": "underscore"})
+
+        self.assertNotEqual(cache.path("A/B"), cache.path("A_B"))
+        self.assertEqual(cache.get("A/B")[1]["title"], "slash")
+        self.assertEqual(cache.get("A_B")[1]["title"], "underscore")
+
+        # A file holding another series is a miss, not a wrong answer
+        os.replace(cache.path("A_B"), cache.path("A/B"))
+        self.assertIsNone(cache.get("A/B"))
+
+    def test_concurrent_eviction(self):
+        """Test that files evicted by another thread count as misses"""
+        cache = FredCache(self.tmpdir.name, max_bytes=None)
+        for series_id in ["A", "B"]:
+            fetch_fred_data(series_id, cache=cache, client=self.client)
+
+        # A prune that lists B, after which another thread removes it first
+        real_stat = os.stat
+
+        def stat(path, *args, **kwargs):
+            if path == cache.path("B"):
+                os.remove(path)
+            return real_stat(path, *args, **kwargs)
+
+        cache.max_bytes = 0
+        with mock.patch("fred_forecaster.cache.os.stat", side_effect=stat):
+            cache.prune()
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+        self.assertIsNone(cache.get("A"))
+
+        # Threads fetching into a cache with room for one entry
+        cache.max_bytes = 1
+        errors = []
+
+        def fetch(series_id):
+            try:
+                for _ in range(10):
+                    fetch_fred_data(series_id, cache=cache, client=FakeFred())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fetch, args=(s,)) for s in "CDEF"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import pandas as pd
+import numpy as np
+from fred_forecaster.calibration import calibrate_simulations
+
+
+class TestEntropyCalibration(unittest.TestCase):
+    
+    def setUp(self):
+        """Create simulated paths around the CBO targets"""
+        np.random.seed(42)
+        self.forecast_index = pd.period_range(start='2024Q1', periods=8, freq='Q-DEC')
+        base_values = np.array([32.0, 33.0, 34.0, 35.0, 36.0, 36.5, 37.0, 37.5])
+        noise = np.random.normal(0, 1.0, (8, 1000))
+        self.sim_array = base_values[:, np.newaxis] + noise
+        
+    def test_entropy_calibration_matches_targets(self):
+        """Test that entropy weights reproduce the Q4 targets exactly"""
+        targets = {2024: 35.230, 2025: 37.209}
+        weights = calibrate_simulations(
+            self.sim_array, self.forecast_index, targets, method="entropy"
+        )
+        
+        self.assertEqual(len(weights), 1000)
+        self.assertAlmostEqual(np.sum(weights), 1.0, places=10)
+        self.assertTrue(np.all(weights > 0))
+        np.testing.assert_allclose(
+            self.sim_array[[3, 7]].dot(weights), [35.230, 37.209], rtol=1e-6
+        )
+        
+    def test_entropy_calibration_unreachable_targets(self):
+        """Test that targets outside the simulated range raise an error"""
+        with self.assertRaises(RuntimeError):
+            calibrate_simulations(
+                self.sim_array, self.forecast_index, {2024: 100.0}, method="entropy"
+            )
+            
+    def test_unknown_method(self):
+        """Test that an unknown method name is rejected"""
+        with self.assertRaises(ValueError):
+            calibrate_simulations(self.sim_array, self.forecast_index, method="bogus")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import tracemalloc
+import unittest
+import pandas as pd
+import numpy as np
+from fred_forecaster.calibration import calibrate_scenarios, calibrate_simulations
+
+
+class TestScenarioCalibration(unittest.TestCase):
+    
+    def setUp(self):
+        """Create simulated paths around the CBO targets"""
+        np.random.seed(42)
+        self.forecast_index = pd.period_range(start='2024Q1', periods=12, freq='Q-DEC')
+        base_values = np.linspace(32.0, 40.0, 12)
+        noise = np.random.normal(0, 1.0, (12, 400))
+        self.sim_array = base_values[:, np.newaxis] + noise
+        self.scenarios = [
+            {2024: 34.0 + d, 2025: 36.5 + 2 * d, 2026: 39.5 + 3 * d}
+            for d in np.linspace(-0.2, 0.2, 5)
+        ]
+        
+    def test_entropy_matches_single_calibration(self):
+        """Test that batched entropy weights equal one calibration per scenario"""
+        weights = calibrate_scenarios(self.sim_array, self.forecast_index, self.scenarios)
+        
+        self.assertEqual(weights.shape, (5, 400))
+        for row, targets in zip(weights, self.scenarios):
+            expected = calibrate_simulations(
+                self.sim_array, self.forecast_index, targets, method="entropy"
+            )
+            np.testing.assert_allclose(row, expected, rtol=1e-6, atol=1e-12)
+            
+    def test_slsqp_matches_targets(self):
+        """Test that warm-started SLSQP weights fit every scenario"""
+        scenarios = self.scenarios[:3]
+        weights = calibrate_scenarios(
+            self.sim_array[:, :100], self.forecast_index, scenarios, method="slsqp"
+        )
+        
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+        for row, targets in zip(weights, scenarios):
+            np.testing.assert_allclose(
+                self.sim_array[[3, 7, 11], :100].dot(row), list(targets.values()), rtol=1e-3
+            )
+            
+    def test_mapping_with_different_years(self):
+        """Test named scenarios that target different years"""
+        scenarios = {
+            "full": self.scenarios[2],
+            "short": {2025: 36.6},
+            "beyond": {2025: 36.4, 2030: 50.0},
+        }
+        weights = calibrate_scenarios(self.sim_array, self.forecast_index, scenarios)
+        
+        for row, (name, targets) in zip(weights, scenarios.items()):
+            years = [year for year in targets if year <= 2026]
+            rows = [4 * (year - 2024) + 3 for year in years]
+            np.testing.assert_allclose(
+                self.sim_array[rows].dot(row), [targets[y] for y in years], rtol=1e-6
+            )
+            
+    def test_unreachable_scenario(self):
+        """Test that the failing scenarios are named in the error"""
+        scenarios = {"ok": {2024: 34.0}, "bad": {2024: 100.0}}
+        with self.assertRaisesRegex(RuntimeError, "bad"):
+            calibrate_scenarios(self.sim_array, self.forecast_index, scenarios)
+            
+    def test_invalid_input(self):
+        """Test that unknown methods and scenarios without years are rejected"""
+        with self.assertRaises(ValueError):
+            calibrate_scenarios(
+                self.sim_array, self.forecast_index, self.scenarios, method="bogus"
+            )
+        with self.assertRaises(ValueError):
+            calibrate_scenarios(self.sim_array, self.forecast_index, [{2040: 1.0}])
+        with self.assertRaisesRegex(ValueError, "No scenarios"):
+            calibrate_scenarios(self.sim_array, self.forecast_index, [])
+            
+    def test_many_targets_memory(self):
+        """Test that batched Newton steps do not allocate k * k rows of N paths"""
+        k, N = 20, 20000
+        forecast_index = pd.period_range(start='2024Q1', periods=4 * k, freq='Q-DEC')
+        sim_array = np.random.normal(0, 1.0, (4 * k, N))
+        scenarios = [
+            {2024 + j: 0.05 * d * (-1) ** j for j in range(k)} for d in range(4)
+        ]
+        
+        tracemalloc.start()
+        try:
+            weights = calibrate_scenarios(sim_array, forecast_index, scenarios)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        self.assertEqual(weights.shape, (4, N))
+        # The (k * k, N) row products alone would take 64 MB
+        self.assertLess(peak, k * k * N * 8 / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+import numpy as np
+import pyarrow.dataset as ds
+from fred_forecaster import cli
+from fred_forecaster.cli import is_complete, load_config, run_config
+from tests.test_cache import FakeFred
+
+
+class FlakyFred(FakeFred):
+    """Fake client failing for one series"""
+    
+    def get_series(self, series_id):
+        if series_id == "BAD":
+            raise ValueError("Bad Request. The series does not exist.")
+        return super().get_series(series_id)
+
+
+class TestCli(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp.name, "out")
+        
+    def tearDown(self):
+        self.tmp.cleanup()
+        
+    def _config(self, **overrides):
+        config = {
+            "series": ["A", "B"],
+            "output": self.output,
+            "end": "2022Q4",
+            "N": 200,
+            "start_year": 2022,
+            "calibration": {"method": "entropy", "targets": {"A": {"2022": 35.00002}}},
+        }
+        config.update(overrides)
+        path = os.path.join(self.tmp.name, "config.json")
+        with open(path, "w") as f:
+            json.dump(config, f)
+        return load_config(path)
+        
+    def test_load_toml(self):
+        """Test TOML configs and defaults"""
+        path = os.path.join(self.tmp.name, "config.toml")
+        with open(path, "w") as f:
+            f.write('series = ["GDP"]\nN = 50\n\n[calibration]\nmethod = "slsqp"\n')
+        config = load_config(path)
+        
+        self.assertEqual(config["series"], ["GDP"])
+        self.assertEqual(config["N"], 50)
+        self.assertEqual(config["model"], "sarimax")
+        self.assertEqual(config["calibration"]["method"], "slsqp")
+        with self.assertRaises(ValueError):
+            load_config(os.path.join(self.tmp.name, "config.yaml"))
+        
+    def test_run_writes_partitions(self):
+        """Test the Parquet outputs of a run"""
+        results = run_config(self._config(), client=FakeFred(), executor="serial")
+        
+        self.assertTrue(all(r.ok for r in results))
+        self.assertTrue(is_complete(self.output, "A"))
+        
+        dataset = ds.dataset(self.output, format="parquet", partitioning="hive",
+                             exclude_invalid_files=True)
+        self.assertIn("series_id", dataset.schema.names)
+        
+        partition = os.path.join(self.output, "series_id=A")
+        sims = pd.read_parquet(os.path.join(partition, "simulations.parquet"))
+        weights = pd.read_parquet(os.path.join(partition, "weights.parquet"))
+        summary = pd.read_parquet(os.path.join(partition, "summary.parquet"))
+        
+        self.assertEqual(sims.shape, (200, 1 + 4))
+        self.assertEqual(list(sims.columns[1:]), ["2022Q1", "2022Q2", "2022Q3", "2022Q4"])
+        self.assertAlmostEqual(weights["weight"].sum(), 1.0)
+        # Calibrated to the Q4 target
+        self.assertAlmostEqual(sims["2022Q4"].to_numpy().dot(weights["weight"]), 35.00002, places=7)
+        self.assertEqual(list(summary.columns), ["quarter", "mean", "q0.05", "q0.5", "q0.95", "prob_decrease"])
+        self.assertAlmostEqual(summary["mean"].iloc[-1], 35.00002, places=7)
+        
+        # Uncalibrated series get equal weights
+        weights_b = pd.read_parquet(os.path.join(self.output, "series_id=B", "weights.parquet"))
+        np.testing.assert_allclose(weights_b["weight"], 1 / 200)
+        
+    def test_resume(self):
+        """Test that complete series are skipped and failed ones retried"""
+        config = self._config(series=["A", "BAD"])
+        results = run_config(config, client=FlakyFred(), executor="serial")
+        self.assertTrue(results[0].ok)
+        self.assertIn("does not exist", results[1].error)
+        self.assertFalse(is_complete(self.output, "BAD"))
+        
+        client = FakeFred()
+        results = run_config(config, client=client, executor="serial")
+        self.assertEqual([r.key for r in results], ["BAD"])
+        self.assertNotIn(("series", "A"), client.calls)
+        
+        # Forcing redoes everything
+        results = run_config(config, resume=False, client=FakeFred(), executor="serial")
+        self.assertEqual([r.key for r in results], ["A", "BAD"])
+        
+    def test_main(self):
+        """Test that the console script reports a missing API key"""
+        path = os.path.join(self.tmp.name, "config.json")
+        with open(path, "w") as f:
+            json.dump({"series": ["X"], "output": self.output}, f)
+        
+        env = os.environ.pop("FRED_API_KEY", None)
+        try:
+            status = cli.main(["run", path, "--executor", "serial"])
+        finally:
+            if env is not None:
+                os.environ["FRED_API_KEY"] = env
+        self.assertEqual(status, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
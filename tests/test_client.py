@@ -0,0 +1,133 @@
+import asyncio
+import http.client
+import json
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pandas as pd
+import numpy as np
+from fred_forecaster.client import FredClient
+from fred_forecaster.data import fetch_fred_data_many, fetch_fred_data_many_async
+
+
+class FakeFredHandler(BaseHTTPRequestHandler):
+    """Serves the two FRED endpoints used by FredClient"""
+    
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    
+    def do_GET(self):
+        url = urlsplit(self.path)
+        series_id = parse_qs(url.query)["series_id"][0]
+        self.connections.add(self.client_address)
+        if series_id == "DROP":
+            # Hang up without a response
+            self.close_connection = True
+            return
+        if series_id == "MISSING":
+            self._reply(400, {"error_code": 400, "error_message": "Bad series"})
+        elif url.path.endswith("/series"):
+            self._reply(200, {"seriess": [{"id": series_id, "title": f"Title {series_id}",
+                                           "units": "Percent", "frequency": "Monthly"}]})
+        else:
+            observations = [{"date": f"2020-{m:02d}-01", "value": str(m)} for m in range(1, 13)]
+            observations[0]["value"] = "."
+            self._reply(200, {"observations": observations})
+    
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+class TestFredClient(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeFredHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.root_url = f"http://127.0.0.1:{cls.server.server_address[1]}/fred"
+        
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        
+    def setUp(self):
+        FakeFredHandler.connections.clear()
+        self.client = FredClient(
+            api_key="test_key", max_connections=2,
+            max_requests_per_minute=None, root_url=self.root_url
+        )
+        
+    def tearDown(self):
+        self.client.close()
+        
+    def test_get_series(self):
+        """Test that observations and metadata are parsed like fredapi"""
+        series = self.client.get_series("TEST")
+        self.assertEqual(len(series), 12)
+        self.assertTrue(np.isnan(series.iloc[0]))
+        self.assertEqual(series.iloc[-1], 12.0)
+        self.assertIsInstance(series.index, pd.DatetimeIndex)
+        
+        info = self.client.get_series_info("TEST")
+        self.assertEqual(info["title"], "Title TEST")
+        
+        with self.assertRaises(ValueError):
+            self.client.get_series("MISSING")
+            
+    def test_failed_request_drops_connection(self):
+        """Test that a request failing on every retry closes its connection"""
+        self.client.get_series("TEST")
+        conn = self.client._connections.queue[-1]
+        self.assertIsNotNone(conn.sock)
+        
+        opened = []
+        new_connection = self.client._new_connection
+        def track():
+            opened.append(new_connection())
+            return opened[-1]
+        
+        with mock.patch.object(self.client, "_new_connection", track):
+            with self.assertRaises(http.client.HTTPException):
+                self.client.get_series("DROP")
+        self.assertTrue(self.client._connections.empty())
+        for c in [conn] + opened:
+            self.assertIsNone(c.sock)
+        
+        # Later requests open a fresh connection
+        self.assertEqual(len(self.client.get_series("TEST")), 12)
+            
+    def test_fetch_many_reuses_connections(self):
+        """Test that a bulk fetch keeps results in order over pooled connections"""
+        series_ids = [f"S{i}" for i in range(20)]
+        results = fetch_fred_data_many(series_ids, client=self.client, max_workers=4)
+        
+        self.assertEqual(list(results), series_ids)
+        self.assertEqual(results["S3"].attrs["title"], "Title S3")
+        self.assertEqual(len(results["S3"]), 4)
+        # 40 requests share at most two keep-alive connections
+        self.assertLessEqual(len(FakeFredHandler.connections), 2)
+        
+    def test_fetch_many_async(self):
+        """Test that the asyncio variant returns the same DataFrames"""
+        series_ids = ["A", "B", "C"]
+        results = asyncio.run(
+            fetch_fred_data_many_async(series_ids, client=self.client)
+        )
+        self.assertEqual(list(results), series_ids)
+        self.assertEqual(results["B"].attrs["series_id"], "B")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+import arviz as az
+from fred_forecaster.store import ModelStore
+from fred_forecaster.models.bayesian import (
+    ForecastState,
+    fit_bayesian_model,
+    generate_bayesian_simulations,
+)
+
+
+class TestForecastState(unittest.TestCase):
+    
+    def setUp(self):
+        """Create a posterior shaped like the output of fit_bayesian_model"""
+        n = 12
+        rng = np.random.default_rng(0)
+        posterior = {name: rng.normal(size=(2, 50, n)) for name in ["level", "trend", "seasonal"]}
+        posterior["level"] += 100
+        posterior["sigma_obs"] = np.abs(rng.normal(size=(2, 50)))
+        self.posterior = posterior
+        self.idata = az.from_dict(posterior=posterior)
+        index = pd.period_range('2020Q1', periods=n, freq='Q-DEC')
+        self.df = pd.DataFrame({'Debt': np.arange(n, dtype=float)}, index=index)
+        
+    def test_from_inference_data(self):
+        """Test that the state holds the terminal values of each draw"""
+        state = ForecastState.from_inference_data(self.idata)
+        
+        self.assertEqual(len(state), 100)
+        np.testing.assert_array_equal(state.level, self.posterior["level"][..., -1].reshape(-1))
+        np.testing.assert_array_equal(
+            state.seasonal, self.posterior["seasonal"][..., -4:].reshape(100, 4)
+        )
+        self.assertEqual(state.nbytes, 100 * 7 * 8)
+        
+    def test_simulations_match_inference_data(self):
+        """Test that the generator gives the same paths from the compact state"""
+        state = ForecastState.from_inference_data(self.idata)
+        expected, _ = generate_bayesian_simulations(None, self.idata, self.df, end="2024Q4", N=20)
+        result, _ = generate_bayesian_simulations(None, state, self.df, end="2024Q4", N=20)
+        np.testing.assert_array_equal(result, expected)
+        
+    def test_save_load_round_trip(self):
+        """Test that a saved state loads back unchanged"""
+        state = ForecastState.from_inference_data(self.idata)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "state.npz")
+            state.save(path)
+            loaded = ForecastState.load(path)
+        for name, values in state.to_arrays().items():
+            np.testing.assert_array_equal(getattr(loaded, name), values)
+            
+    def test_inconsistent_shapes(self):
+        """Test that arrays of different lengths are rejected"""
+        with self.assertRaises(ValueError):
+            ForecastState(np.zeros(3), np.zeros(3), np.zeros((2, 4)), np.zeros(3))
+            
+    def test_compact_fit_stores_state(self):
+        """Test that a compact fit stores and returns only the forecast state"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = ModelStore(tmpdir)
+            with patch('pymc.sample', return_value=self.idata) as mock_sample:
+                fit_bayesian_model(self.df, store=store, compact=True)
+                model, state = fit_bayesian_model(self.df, store=store, compact=True)
+                self.assertEqual(mock_sample.call_count, 1)
+        
+        self.assertIsInstance(state, ForecastState)
+        np.testing.assert_array_equal(state.sigma_obs, self.posterior["sigma_obs"].reshape(-1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+import unittest
+
+import fred_forecaster
+
+
+HEAVY_MODULES = ["pymc", "arviz", "pytensor", "statsmodels", "plotly"]
+
+
+def _loaded_modules(code):
+    """Run code in a fresh interpreter and list the heavy modules it loaded"""
+    script = (
+        f"{code}\n"
+        "import sys\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return [m for m in output.split(",") if m]
+
+
+class TestLazyImports(unittest.TestCase):
+    
+    def test_bare_import_is_light(self):
+        """Test that importing the package loads no modeling or plotting library"""
+        self.assertEqual(_loaded_modules("import fred_forecaster"), [])
+        
+    def test_light_functions_stay_light(self):
+        """Test that calibration and data access do not load heavy libraries"""
+        loaded = _loaded_modules(
+            "from fred_forecaster import calibrate_simulations, fetch_fred_data"
+        )
+        self.assertEqual(loaded, [])
+        
+    def test_public_names_resolve(self):
+        """Test that every exported name is still importable from the package"""
+        for name in fred_forecaster.__all__:
+            self.assertTrue(callable(getattr(fred_forecaster, name)), name)
+        with self.assertRaises(AttributeError):
+            fred_forecaster.not_a_function
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import unittest
+import warnings
+import arviz as az
+import pandas as pd
+import numpy as np
+from fred_forecaster.calibration import calibrate_simulations
+from fred_forecaster.data import fetch_fred_data_many, fetch_fred_data_many_async
+from fred_forecaster.instrumentation import (
+    add_hook,
+    annotate,
+    instrumented,
+    is_enabled,
+    record_spans,
+    remove_hook,
+    span,
+)
+from fred_forecaster.models.bayesian import _sampler_stats
+from fred_forecaster.models.sarimax import fit_sarimax_model
+from tests.test_cache import FakeFred
+
+
+@instrumented
+def _double(x):
+    annotate(doubled=True)
+    return 2 * x
+
+
+class TestInstrumentation(unittest.TestCase):
+    
+    def test_disabled_is_transparent(self):
+        """Test that without hooks nothing is recorded"""
+        self.assertFalse(is_enabled())
+        with span("stage") as record:
+            self.assertIsNone(record)
+            annotate(ignored=True)
+        self.assertEqual(_double(2), 4)
+        self.assertEqual(_double.__name__, "_double")
+        
+    def test_nested_spans(self):
+        """Test span nesting, attributes and error capture"""
+        with record_spans() as spans:
+            with span("outer", run=1) as outer:
+                _double(3)
+            with self.assertRaises(ValueError):
+                with span("failing"):
+                    raise ValueError("boom")
+        
+        self.assertEqual([s.name for s in spans], ["_double", "outer", "failing"])
+        inner = spans[0]
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(inner.attributes, {"doubled": True})
+        self.assertEqual(spans[1].attributes, {"run": 1})
+        self.assertGreaterEqual(spans[1].duration, inner.duration)
+        self.assertEqual(spans[2].error, "ValueError: boom")
+        self.assertEqual(spans[2].to_dict()["name"], "failing")
+        self.assertFalse(is_enabled())
+        
+    def test_broken_hook_warns(self):
+        """Test that a failing hook does not break the pipeline"""
+        def broken(record):
+            raise RuntimeError("metrics down")
+        add_hook(broken)
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                self.assertEqual(_double(1), 2)
+        finally:
+            remove_hook(broken)
+        self.assertIn("metrics down", str(caught[0].message))
+        
+    def test_pipeline_stages(self):
+        """Test the spans and measurements of the pipeline functions"""
+        index = pd.period_range('2020Q1', periods=12, freq='Q-DEC')
+        data = pd.DataFrame({'Debt': np.linspace(100, 210, 12)}, index=index)
+        rng = np.random.default_rng(0)
+        sim_array = rng.normal(size=(4, 500))
+        forecast_index = pd.period_range('2024Q1', periods=4, freq='Q-DEC')
+        
+        with record_spans() as spans:
+            fetch_fred_data_many(["A", "B"], client=FakeFred(), max_workers=2)
+            fit_sarimax_model(data)
+            calibrate_simulations(sim_array, forecast_index, {2024: 0.1}, method="entropy")
+        
+        by_name = {}
+        for record in spans:
+            by_name.setdefault(record.name, []).append(record)
+        
+        many = by_name["fetch_fred_data_many"][0]
+        self.assertEqual(len(by_name["fetch_fred_data"]), 2)
+        for record in by_name["fetch_fred_data"]:
+            self.assertEqual(record.parent_id, many.span_id)
+            self.assertFalse(record.attributes["cache_hit"])
+        self.assertIn("iterations", by_name["fit_sarimax_model"][0].attributes)
+        calibration = by_name["calibrate_simulations"][0].attributes
+        self.assertEqual(calibration["method"], "entropy")
+        self.assertGreater(calibration["iterations"], 0)
+        
+    def test_async_fetch_spans(self):
+        """Test that the async fetch is timed until done and parents the fetches"""
+        with record_spans() as spans:
+            asyncio.run(fetch_fred_data_many_async(["A", "B"], client=FakeFred(), max_workers=2))
+        
+        (many,) = [record for record in spans if record.name == "fetch_fred_data_many_async"]
+        fetches = [record for record in spans if record.name == "fetch_fred_data"]
+        self.assertEqual(len(fetches), 2)
+        for record in fetches:
+            self.assertEqual(record.parent_id, many.span_id)
+            self.assertLessEqual(record.duration, many.duration)
+        
+    def test_sampler_stats(self):
+        """Test throughput and divergence counting"""
+        idata = az.from_dict(
+            posterior={"sigma_obs": np.ones((2, 50))},
+            sample_stats={"diverging": np.arange(100).reshape(2, 50) < 3},
+        )
+        idata.posterior.attrs["sampling_time"] = 4.0
+        stats = _sampler_stats(idata)
+        
+        self.assertEqual(stats["total_draws"], 100)
+        self.assertEqual(stats["draws_per_sec"], 25.0)
+        self.assertEqual(stats["divergences"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
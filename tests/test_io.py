@@ -0,0 +1,167 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+import arviz as az
+import pyarrow as pa
+import pandas as pd
+import numpy as np
+from fred_forecaster.calibration import calibrate_simulations
+from fred_forecaster.io import (
+    collect_simulations,
+    load_simulations,
+    open_simulation_array,
+    save_simulations,
+)
+from fred_forecaster.models.bayesian import generate_bayesian_simulations
+from fred_forecaster.models.sarimax import fit_sarimax_model, generate_simulations
+from fred_forecaster.stats import summarize_simulations
+from fred_forecaster.visualization import plot_forecasts
+
+
+class TestSimulationStorage(unittest.TestCase):
+    
+    def setUp(self):
+        """Create test data and a small posterior"""
+        self.tmp = tempfile.TemporaryDirectory()
+        index = pd.period_range('2020Q1', periods=12, freq='Q-DEC')
+        self.data = pd.DataFrame({'Debt': np.linspace(100, 210, 12)}, index=index)
+        
+        rng = np.random.default_rng(0)
+        self.idata = az.from_dict(posterior={
+            "level": 200 + rng.normal(size=(2, 50, 12)),
+            "trend": 10 + rng.normal(size=(2, 50, 12)),
+            "seasonal": rng.normal(size=(2, 50, 12)),
+            "sigma_obs": rng.uniform(0.5, 1.5, size=(2, 50)),
+        })
+        
+    def tearDown(self):
+        self.tmp.cleanup()
+        
+    def test_float32_matches_float64(self):
+        """Test that float32 output is the float64 ensemble rounded"""
+        dense, _ = generate_bayesian_simulations(None, self.idata, self.data, end="2024Q4", N=300)
+        single, _ = generate_bayesian_simulations(
+            None, self.idata, self.data, end="2024Q4", N=300, dtype="float32"
+        )
+        
+        self.assertEqual(dense.dtype, np.float64)
+        self.assertEqual(single.dtype, np.float32)
+        np.testing.assert_array_equal(single, dense.astype(np.float32))
+        
+    def test_memmap_output(self):
+        """Test that chunks are written into a reloadable memory map"""
+        path = os.path.join(self.tmp.name, "sims", "debt.npy")
+        sim_array, forecast_index = generate_bayesian_simulations(
+            None, self.idata, self.data, end="2024Q4", N=1000,
+            dtype=np.float32, mmap_path=path, chunk_size=128
+        )
+        
+        self.assertIsInstance(sim_array, np.memmap)
+        self.assertEqual(sim_array.shape, (8, 1000))
+        reloaded = np.load(path, mmap_mode="r")
+        np.testing.assert_array_equal(reloaded, sim_array)
+        self.assertTrue(np.all(np.isfinite(reloaded)))
+        
+        # Consumers accept the read-only memory map as is
+        weights = calibrate_simulations(
+            reloaded, forecast_index, {2024: float(np.mean(reloaded[-1]))}, method="entropy"
+        )
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        summary = summarize_simulations(reloaded, forecast_index, weights)
+        self.assertEqual(summary.shape, (8, 4))
+        plot_forecasts(self.data, reloaded, forecast_index, weights, render="density")
+        
+    def test_memmap_not_copied(self):
+        """Test that weighted summaries and plots of a memory map stay far below its size"""
+        path = os.path.join(self.tmp.name, "large.npy")
+        sim_array = open_simulation_array(200, 50000, np.float32, path)
+        rng = np.random.default_rng(0)
+        for i in range(200):
+            sim_array[i] = rng.normal(i, 1, 50000)
+        sim_array.flush()
+        reloaded = np.load(path, mmap_mode="r")
+        forecast_index = pd.period_range('2023Q1', periods=200, freq='Q-DEC')
+        weights = rng.uniform(0.5, 1.5, 50000)
+        
+        # Plotly builds its validators on first use
+        plot_forecasts(self.data, reloaded[:, :10], forecast_index, weights[:10], render="density")
+        
+        tracemalloc.start()
+        try:
+            summarize_simulations(reloaded, forecast_index, weights)
+            plot_forecasts(self.data, reloaded, forecast_index, weights, render="density")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # A float64 copy would take twice the 40 MB of the file
+        self.assertLess(peak, reloaded.nbytes / 4)
+        
+    def test_sarimax_options(self):
+        """Test dtype and chunking of SARIMAX simulations"""
+        results = fit_sarimax_model(self.data)
+        sim_array, _ = generate_simulations(
+            results, self.data, end="2024Q4", N=50, dtype="float32", chunk_size=16
+        )
+        self.assertEqual(sim_array.shape, (8, 50))
+        self.assertEqual(sim_array.dtype, np.float32)
+        
+    def test_validation(self):
+        """Test that bad dtypes and chunk counts are rejected"""
+        with self.assertRaises(ValueError):
+            open_simulation_array(4, 10, dtype=np.int64)
+        with self.assertRaises(ValueError):
+            collect_simulations([np.zeros((4, 3))], 4, 10, dtype=np.float32)
+
+
+class TestSimulationFiles(unittest.TestCase):
+    
+    def setUp(self):
+        """Create an ensemble with weights and metadata"""
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.sim_array = rng.normal(size=(8, 500)).astype(np.float32)
+        self.forecast_index = pd.period_range('2025Q1', periods=8, freq='Q-DEC')
+        self.weights = rng.dirichlet(np.ones(500))
+        self.attrs = {"title": "Federal Debt", "units": "Millions of Dollars", "series_id": "GFDEBTN"}
+        
+    def tearDown(self):
+        self.tmp.cleanup()
+        
+    def test_round_trip(self):
+        """Test that Arrow IPC and Parquet files restore every component"""
+        for name in ["sims.arrow", "sims.parquet"]:
+            path = os.path.join(self.tmp.name, name)
+            save_simulations(path, self.sim_array, self.forecast_index, self.weights, self.attrs)
+            sim_array, forecast_index, weights, attrs = load_simulations(path)
+            
+            np.testing.assert_array_equal(sim_array, self.sim_array)
+            self.assertEqual(sim_array.dtype, np.float32)
+            self.assertTrue(forecast_index.equals(self.forecast_index))
+            np.testing.assert_array_equal(weights, self.weights)
+            self.assertEqual(attrs, self.attrs)
+            
+    def test_ipc_load_is_zero_copy(self):
+        """Test that memory-mapped loads allocate no Arrow memory"""
+        path = os.path.join(self.tmp.name, "sims.arrow")
+        save_simulations(path, self.sim_array, self.forecast_index)
+        
+        allocated = pa.total_allocated_bytes()
+        sim_array, _, weights, attrs = load_simulations(path)
+        self.assertEqual(pa.total_allocated_bytes(), allocated)
+        self.assertFalse(sim_array.flags.writeable)
+        self.assertIsNone(weights)
+        self.assertEqual(attrs, {})
+        
+    def test_shape_validation(self):
+        """Test that mismatched inputs are rejected"""
+        path = os.path.join(self.tmp.name, "sims.arrow")
+        with self.assertRaises(ValueError):
+            save_simulations(path, self.sim_array, self.forecast_index[:4])
+        with self.assertRaises(ValueError):
+            save_simulations(path, self.sim_array, self.forecast_index, self.weights[:10])
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pytest
+import pandas as pd
+import numpy as np
+import arviz as az
+from fred_forecaster.models import bayesian
+from fred_forecaster.models.bayesian import (
+    _build_bayesian_kalman_model,
+    _build_bayesian_model,
+    _jittered_points,
+    _set_bayesian_data,
+    fit_bayesian_model,
+)
+from fred_forecaster.models.factory import ModelFactory, share_compile_cache
+
+
+def fake_sample(model, method="nuts", random_seed=None, logp_dlogp_func=None,
+                progress=None):
+    """Posterior draws shaped like the model's free variables"""
+    point = model.initial_point()
+    posterior = {
+        name.replace("_log__", ""): np.zeros((1, 3) + np.shape(value))
+        for name, value in point.items()
+    }
+    return az.from_dict(posterior=posterior)
+
+
+class TestModelFactory(unittest.TestCase):
+    
+    def setUp(self):
+        """Create series of similar lengths"""
+        rng = np.random.default_rng(0)
+        self.y = np.cumsum(0.5 + rng.normal(0, 0.3, 37)) + 20
+        
+    def test_padded_model_matches_model(self):
+        """Test that the padded likelihood ignores the padding"""
+        model = _build_bayesian_model(self.y)
+        padded = _build_bayesian_model(self.y, length=len(self.y))
+        point = model.initial_point()
+        self.assertAlmostEqual(
+            model.compile_logp()(point), padded.compile_logp()(point), places=8
+        )
+        
+        padded = _build_bayesian_model(self.y, length=40)
+        logp = padded.compile_logp()
+        point = padded.initial_point()
+        before = logp(point)
+        # The data past the end of the series are masked out
+        y = padded["y"].get_value()
+        y[37:] = 1000.0
+        padded["y"].set_value(y)
+        self.assertAlmostEqual(logp(point), before, places=8)
+        
+    def test_swapping_data(self):
+        """Test that swapped data change the likelihood like a rebuilt model"""
+        other = self.y[:35] * 1.1
+        padded = _build_bayesian_model(self.y, length=40)
+        logp = padded.compile_logp()
+        point = padded.initial_point()
+        
+        _set_bayesian_data(padded, other)
+        expected = _build_bayesian_model(other, length=40)
+        self.assertAlmostEqual(logp(point), expected.compile_logp()(point), places=8)
+        with self.assertRaises(ValueError):
+            _set_bayesian_data(padded, np.ones(41))
+            
+    def test_kalman_model_shares_data(self):
+        """Test that the Kalman model reads its data from containers"""
+        model = _build_bayesian_kalman_model(self.y, shared=True)
+        self.assertIn("diffs", model.named_vars)
+        
+        missing = self.y.copy()
+        missing[3] = np.nan
+        model = _build_bayesian_kalman_model(missing, shared=True)
+        self.assertIn("y", model.named_vars)
+        
+    @patch('fred_forecaster.models.bayesian._sample', side_effect=fake_sample)
+    def test_factory_reuses_models(self, mock_sample):
+        """Test that series in the same length bucket share one model"""
+        factory = ModelFactory(bucket=8)
+        index = pd.period_range('2010Q1', periods=40, freq='Q-DEC')
+        first = pd.Series(self.y, index=index[:37])
+        second = pd.Series(self.y[:34] + 1, index=index[:34])
+        
+        model_a, idata_a = fit_bayesian_model(first, method="advi", factory=factory)
+        model_b, idata_b = fit_bayesian_model(second, method="advi", factory=factory)
+        
+        self.assertIs(model_a, model_b)
+        self.assertEqual((factory.misses, factory.hits), (1, 1))
+        np.testing.assert_array_equal(model_b["y"].get_value()[:34], second.values)
+        self.assertEqual(idata_a.posterior.sizes["level_dim_0"], 37)
+        self.assertEqual(idata_b.posterior.sizes["level_dim_0"], 34)
+        
+        fit_bayesian_model(pd.Series(self.y[:20], index=index[:20]), method="advi",
+                           factory=factory)
+        self.assertEqual(len(factory), 2)
+        
+    def test_share_compile_cache(self):
+        """Test that new processes are pointed at the shared cache"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {"PYTENSOR_FLAGS": "floatX=float64"}):
+                with self.assertWarns(UserWarning):
+                    share_compile_cache(tmpdir)
+                flags = os.environ["PYTENSOR_FLAGS"].split(",")
+        self.assertEqual(flags, ["floatX=float64", f"base_compiledir={tmpdir}"])
+
+        
+    def test_jittered_initial_points(self):
+        """Test that each chain starts from its own finite point"""
+        model = _build_bayesian_model(self.y, length=40)
+        logp_dlogp_func = model.logp_dlogp_function(ravel_inputs=True)
+        points = _jittered_points(model, logp_dlogp_func, random_seed=0)
+        
+        self.assertEqual(len(points), 2)
+        self.assertFalse(np.allclose(points[0]["sigma_obs_log__"], points[1]["sigma_obs_log__"]))
+        logp = model.compile_logp()
+        for point in points:
+            self.assertTrue(np.isfinite(logp(point)))
+        
+    @pytest.mark.slow  # Mark as slow test to skip in quick test runs
+    def test_refit_matches_fresh_fit(self):
+        """Test that sampling a reused, padded model matches a fresh fit"""
+        index = pd.period_range('2010Q1', periods=37, freq='Q-DEC')
+        series = pd.Series(self.y, index=index)
+        factory = ModelFactory()
+        with patch.object(bayesian, "_NUTS_DRAWS", 50), patch.object(bayesian, "_NUTS_TUNE", 50):
+            _, fresh = fit_bayesian_model(series, random_seed=1)
+            fit_bayesian_model(series * 1.1, random_seed=1, factory=factory)
+            _, refit = fit_bayesian_model(series, random_seed=1, factory=factory)
+        
+        self.assertEqual(factory.hits, 1)
+        self.assertEqual(refit.posterior.sizes["level_dim_0"], 37)
+        self.assertEqual(refit.posterior.sizes["chain"], 2)
+        # Chains start from different jittered points
+        first_draws = refit.posterior["sigma_obs"].values[:, 0]
+        self.assertNotEqual(first_draws[0], first_draws[1])
+        for name in ["level", "trend"]:
+            np.testing.assert_allclose(
+                refit.posterior[name].mean(["chain", "draw"]).values[-1],
+                fresh.posterior[name].mean(["chain", "draw"]).values[-1],
+                atol=0.5,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import pandas as pd
+import numpy as np
+from fred_forecaster.models.sarimax import (
+    _nested_parents,
+    generate_simulations,
+    select_sarimax_order,
+)
+
+
+class TestOrderSelection(unittest.TestCase):
+    
+    def setUp(self):
+        """Create an ARIMA(1,1,1) series with a quarterly pattern"""
+        rng = np.random.default_rng(0)
+        n = 80
+        e = rng.normal(0, 1, n)
+        x = np.zeros(n)
+        for t in range(1, n):
+            x[t] = 0.6 * x[t - 1] + e[t] + 0.3 * e[t - 1]
+        dates = pd.date_range(start='2000-01-01', periods=n, freq='QE')
+        self.test_series = pd.Series(np.cumsum(x) + np.tile([1, -1, 2, -2], n // 4) + 100, index=dates)
+        self.test_df = pd.DataFrame({'Debt': self.test_series})
+        self.test_df.index = pd.PeriodIndex(self.test_df.index, freq='Q-DEC')
+        
+    def test_nested_parents(self):
+        """Test that parents drop one lag from p, q, P or Q but never d or D"""
+        self.assertEqual(
+            sorted(_nested_parents((1, 1, 0, 1, 1, 0))),
+            [(0, 1, 0, 1, 1, 0), (1, 1, 0, 0, 1, 0)],
+        )
+        self.assertEqual(_nested_parents((0, 1, 0, 0, 1, 0)), [])
+        
+    def test_select_sarimax_order(self):
+        """Test that the best model leads a ranking sorted by AIC"""
+        results, ranking = select_sarimax_order(
+            self.test_series, p=range(3), q=range(2), P=range(2), Q=range(1),
+            executor="process", max_workers=2
+        )
+        
+        self.assertTrue(ranking["aic"].is_monotonic_increasing)
+        self.assertEqual(results.model.order, ranking.loc[0, "order"])
+        self.assertEqual(results.model.seasonal_order, ranking.loc[0, "seasonal_order"])
+        self.assertAlmostEqual(results.aic, ranking.loc[0, "aic"], places=6)
+        # Only the smallest model is fitted from scratch
+        self.assertEqual(ranking["warm_start"].isna().sum(), 1)
+        
+        sim_array, forecast_index = generate_simulations(results, self.test_df, end="2020Q4", N=10)
+        self.assertEqual(sim_array.shape, (4, 10))
+        
+    def test_pruning_skips_candidates(self):
+        """Test that a zero threshold fits fewer candidates than the full grid"""
+        _, full = select_sarimax_order(self.test_series, prune_threshold=None, executor="serial")
+        _, pruned = select_sarimax_order(self.test_series, prune_threshold=0.0, executor="serial")
+        self.assertEqual(len(full), 36)
+        self.assertLess(len(pruned), len(full))
+
+
+if __name__ == '__main__':
+    unittest.main()
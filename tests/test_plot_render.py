@@ -0,0 +1,61 @@
+import unittest
+import pandas as pd
+import numpy as np
+from fred_forecaster.visualization import plot_forecasts
+
+
+class TestPlotRender(unittest.TestCase):
+    
+    def setUp(self):
+        """Create a long history and a large ensemble"""
+        index = pd.period_range('1950Q1', periods=300, freq='Q-DEC')
+        self.df_quarterly = pd.DataFrame({'Debt': np.linspace(1, 30, 300)}, index=index)
+        self.forecast_index = pd.period_range('2025Q1', periods=8, freq='Q-DEC')
+        rng = np.random.default_rng(0)
+        self.sim_array = 30 + np.cumsum(rng.normal(size=(8, 5000)), axis=0)
+        
+    def test_webgl_single_trace(self):
+        """Test that all shown paths go into one binary-encoded WebGL trace"""
+        fig = plot_forecasts(
+            self.df_quarterly, self.sim_array, self.forecast_index,
+            num_paths_to_show=200, render="webgl"
+        )
+        
+        gl = [trace for trace in fig.data if trace.type == "scattergl"]
+        self.assertEqual(len(gl), 1)
+        self.assertEqual(len(fig.data), 3)
+        # Each path is followed by a gap
+        self.assertEqual(len(gl[0].y), 200 * 9)
+        self.assertEqual(np.isnan(gl[0].y).sum(), 200)
+        self.assertIn('"bdata"', fig.to_json())
+        
+    def test_density(self):
+        """Test that the density fan does not grow with N"""
+        fig = plot_forecasts(
+            self.df_quarterly, self.sim_array, self.forecast_index,
+            render="density", density_bins=40
+        )
+        heatmap = [trace for trace in fig.data if trace.type == "heatmap"][0]
+        
+        self.assertEqual(heatmap.z.shape, (40, 8))
+        np.testing.assert_allclose(heatmap.z.sum(axis=0), 1, rtol=1e-5)
+        
+    def test_history_decimation(self):
+        """Test that the history is thinned, keeping its last point"""
+        fig = plot_forecasts(
+            self.df_quarterly, self.sim_array, self.forecast_index,
+            num_paths_to_show=0, max_history_points=50
+        )
+        history = fig.data[0]
+        
+        self.assertLessEqual(len(history.y), 50)
+        self.assertEqual(history.y[-1], 30)
+        
+    def test_unknown_render(self):
+        """Test that an unknown render mode is rejected"""
+        with self.assertRaises(ValueError):
+            plot_forecasts(self.df_quarterly, self.sim_array, self.forecast_index, render="svg")
+
+
+if __name__ == '__main__':
+    unittest.main()
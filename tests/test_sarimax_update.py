@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+from fred_forecaster.models.sarimax import (
+    fit_sarimax_model,
+    generate_simulations,
+    update_sarimax_model,
+)
+
+
+class TestSarimaxUpdate(unittest.TestCase):
+    
+    def setUp(self):
+        """Create a random walk with drift and a fit to all but the last quarters"""
+        rng = np.random.default_rng(0)
+        index = pd.period_range('2000Q1', periods=60, freq='Q-DEC')
+        self.test_series = pd.Series(np.cumsum(rng.normal(1, 1, 60)) + 100, index=index)
+        self.test_df = pd.DataFrame({'Debt': self.test_series})
+        self.results = fit_sarimax_model(self.test_series[:56])
+        
+    def test_update_matches_full_filter(self):
+        """Test that updating forecasts like filtering the full series"""
+        with patch('statsmodels.tsa.statespace.sarimax.SARIMAX.fit') as mock_fit:
+            updated, count = update_sarimax_model(self.results, self.test_series[:58])
+            updated, count = update_sarimax_model(updated, self.test_df, obs_since_fit=count)
+            mock_fit.assert_not_called()
+        self.assertEqual(count, 4)
+        
+        full = self.results.append(self.test_series[56:], refit=False)
+        np.testing.assert_allclose(updated.forecast(4), full.forecast(4))
+        np.testing.assert_allclose(updated.params, self.results.params)
+        
+        sim_array, forecast_index = generate_simulations(updated, self.test_df, end="2015Q4", N=10)
+        self.assertEqual(sim_array.shape, (4, 10))
+        self.assertEqual(str(forecast_index[0]), "2015Q1")
+        
+    def test_no_new_data(self):
+        """Test that an update without new observations is a no-op"""
+        updated, count = update_sarimax_model(self.results, self.test_series[:56], obs_since_fit=3)
+        self.assertIs(updated, self.results)
+        self.assertEqual(count, 3)
+        
+    def test_refit_schedule(self):
+        """Test that parameters are re-estimated once enough quarters arrive"""
+        updated, count = update_sarimax_model(self.results, self.test_series[:58], refit_every=4)
+        self.assertEqual((updated.nobs, count), (2, 2))
+        updated, count = update_sarimax_model(
+            updated, self.test_series, refit_every=4, obs_since_fit=count
+        )
+        self.assertEqual((updated.nobs, count), (60, 0))
+
+        # The schedule is carried by the count, not by the results object
+        updated, count = update_sarimax_model(
+            self.results, self.test_series[:58], refit_every=4, obs_since_fit=2
+        )
+        self.assertEqual((updated.nobs, count), (58, 0))
+        
+    def test_refit_on_drift(self):
+        """Test that a structural break triggers re-estimation"""
+        broken = self.test_series.copy()
+        broken.iloc[56:] += 50
+        updated, _ = update_sarimax_model(self.results, broken, drift_threshold=4.0)
+        self.assertEqual(updated.nobs, 60)
+        
+        updated, _ = update_sarimax_model(self.results, self.test_series, drift_threshold=4.0)
+        self.assertEqual(updated.nobs, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import pandas as pd
+import numpy as np
+from fred_forecaster.models.bayesian import ForecastState, generate_bayesian_simulations
+from fred_forecaster.models.sarimax import fit_sarimax_model, generate_simulations
+
+
+class TestSimulationSeeding(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Fit a small SARIMAX model and build a forecast state"""
+        index = pd.period_range('2015Q1', periods=24, freq='Q-DEC')
+        rng = np.random.default_rng(1)
+        cls.data = pd.DataFrame(
+            {'Debt': np.linspace(100, 330, 24) + rng.normal(0, 2, 24)}, index=index
+        )
+        cls.results = fit_sarimax_model(cls.data)
+        cls.state = ForecastState(
+            level=rng.normal(300, 5, 50),
+            trend=rng.normal(10, 1, 50),
+            seasonal=rng.normal(0, 1, (50, 4)),
+            sigma_obs=rng.uniform(1, 2, 50),
+        )
+
+    def _sarimax(self, **kwargs):
+        return generate_simulations(self.results, self.data, end="2022Q4", N=2500, **kwargs)[0]
+
+    def _bayesian(self, **kwargs):
+        return generate_bayesian_simulations(
+            None, self.state, self.data, end="2022Q4", N=2500, **kwargs
+        )[0]
+
+    def test_independent_of_chunking_and_workers(self):
+        """Test that the seed alone determines the simulations"""
+        for simulate in [self._sarimax, self._bayesian]:
+            reference = simulate()
+            self.assertEqual(reference.shape, (8, 2500))
+            for kwargs in [
+                {"chunk_size": 700},
+                {"chunk_size": 2500},
+                {"executor": "thread", "max_workers": 1},
+                {"executor": "thread", "max_workers": 3, "chunk_size": 900},
+                {"executor": "process", "max_workers": 2},
+            ]:
+                np.testing.assert_array_equal(simulate(**kwargs), reference, err_msg=str(kwargs))
+
+    def test_seed_changes_simulations(self):
+        """Test that different seeds give different paths"""
+        for simulate in [self._sarimax, self._bayesian]:
+            self.assertFalse(np.array_equal(simulate(seed=1), simulate(seed=2)))
+            np.testing.assert_array_equal(simulate(seed=3), simulate(seed=3))
+
+    def test_global_random_state_untouched(self):
+        """Test that simulating neither reads nor reseeds the global NumPy state"""
+        np.random.seed(123)
+        expected = np.random.random()
+        np.random.seed(123)
+        self._sarimax()
+        self._bayesian()
+        self.assertEqual(np.random.random(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import pandas as pd
+import numpy as np
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from fred_forecaster.models.sarimax import (
+    _is_time_invariant,
+    _simulate_state_space,
+    fit_sarimax_model,
+    generate_simulations,
+)
+
+
+class TestStateSpaceSimulation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Fit a seasonal SARIMAX model"""
+        rng = np.random.default_rng(0)
+        index = pd.period_range('2000Q1', periods=60, freq='Q-DEC')
+        values = 100 + np.cumsum(rng.normal(2, 1, 60)) + np.tile([1, -1, 0.5, -0.5], 15)
+        cls.data = pd.DataFrame({'Debt': values}, index=index)
+        cls.results = fit_sarimax_model(cls.data)
+
+    def test_matches_forecast_distribution(self):
+        """Test that the paths have the mean and variance of the Kalman forecast"""
+        self._check_forecast_distribution(self.results)
+
+    def test_concentrated_scale(self):
+        """Test fits whose variances are concentrated out of the likelihood"""
+        results = SARIMAX(
+            self.data['Debt'], order=(1, 1, 1), seasonal_order=(0, 1, 0, 4),
+            concentrate_scale=True,
+        ).fit(disp=False)
+        self.assertTrue(results.filter_results.filter_concentrated)
+        self._check_forecast_distribution(results)
+
+    def _check_forecast_distribution(self, results):
+        sim_array = _simulate_state_space(results, 12, 40000, np.random.default_rng(1))
+        forecast = results.get_forecast(12)
+
+        self.assertEqual(sim_array.shape, (12, 40000))
+        sd = np.sqrt(forecast.var_pred_mean.values)
+        np.testing.assert_array_less(
+            np.abs(sim_array.mean(axis=1) - forecast.predicted_mean.values), 0.03 * sd
+        )
+        np.testing.assert_allclose(sim_array.var(axis=1), sd ** 2, rtol=0.05)
+
+    def test_engines_agree(self):
+        """Test that the native and statsmodels engines give the same distribution"""
+        native, forecast_index = generate_simulations(
+            self.results, self.data, end="2017Q4", N=20000
+        )
+        reference, reference_index = generate_simulations(
+            self.results, self.data, end="2017Q4", N=20000, engine="statsmodels"
+        )
+
+        self.assertTrue(forecast_index.equals(reference_index))
+        self.assertEqual(native.shape, reference.shape)
+        # Five standard errors of the difference of the two means
+        sd = reference.std(axis=1)
+        np.testing.assert_array_less(
+            np.abs(native.mean(axis=1) - reference.mean(axis=1)), 5 * sd * np.sqrt(2 / 20000)
+        )
+        np.testing.assert_allclose(native.std(axis=1), sd, rtol=0.05)
+
+    def test_time_varying_model_falls_back(self):
+        """Test that models with a time trend are simulated by statsmodels"""
+        results = SARIMAX(self.data['Debt'], order=(1, 1, 0), trend="t").fit(disp=False)
+        self.assertFalse(_is_time_invariant(results))
+        self.assertTrue(_is_time_invariant(self.results))
+
+        sim_array, _ = generate_simulations(results, self.data, end="2016Q4", N=10)
+        self.assertEqual(sim_array.shape, (8, 10))
+
+    def test_unknown_engine(self):
+        """Test that an unknown engine is rejected"""
+        with self.assertRaises(ValueError):
+            generate_simulations(self.results, self.data, end="2016Q4", N=10, engine="fast")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import pandas as pd
+import numpy as np
+from fred_forecaster.stats import (
+    decline_probabilities,
+    summarize_simulations,
+    weighted_quantiles,
+)
+
+
+class TestStats(unittest.TestCase):
+    
+    def setUp(self):
+        """Create a simulated ensemble with calibration-style weights"""
+        rng = np.random.default_rng(1)
+        self.forecast_index = pd.period_range('2024Q3', '2026Q4', freq='Q-DEC')
+        steps = len(self.forecast_index)
+        self.sim_array = np.cumsum(rng.normal(0.1, 1.0, size=(steps, 2000)), axis=0)
+        self.weights = rng.uniform(0, 2, size=2000)
+        self.weights[:100] = 0
+        self.weights /= self.weights.sum()
+        
+    def test_equal_weights_match_numpy(self):
+        """Test that equal weights reproduce np.quantile"""
+        probs = [0, 0.01, 0.25, 0.5, 0.9, 1]
+        expected = np.quantile(self.sim_array, probs, axis=1)
+        np.testing.assert_allclose(
+            weighted_quantiles(self.sim_array, probs, np.full(2000, 3.0)), expected
+        )
+        np.testing.assert_allclose(weighted_quantiles(self.sim_array, probs), expected)
+        
+    def test_zero_weights_drop_paths(self):
+        """Test that paths with zero weight are ignored"""
+        sim_array = np.array([[1.0, 2.0, 3.0]])
+        self.assertAlmostEqual(weighted_quantiles(sim_array, [0.5], np.array([1, 0, 1]))[0, 0], 2.0)
+        self.assertAlmostEqual(weighted_quantiles(sim_array, [1.0], np.array([1, 1, 0]))[0, 0], 2.0)
+        
+    def test_summarize_simulations(self):
+        """Test the tidy summary frame"""
+        summary = summarize_simulations(self.sim_array, self.forecast_index, self.weights)
+        
+        self.assertEqual(list(summary.columns), ["mean", 0.05, 0.5, 0.95])
+        self.assertEqual(summary.index.name, "Quarter")
+        np.testing.assert_allclose(summary["mean"], self.sim_array.dot(self.weights))
+        self.assertTrue((summary[0.05] < summary[0.5]).all())
+        self.assertTrue((summary[0.5] < summary[0.95]).all())
+        
+    def test_decline_probabilities(self):
+        """Test against a direct loop over quarters"""
+        df_prob_fall, overall, window = decline_probabilities(
+            self.sim_array, self.forecast_index, self.weights, start_year=2025
+        )
+        
+        expected = [
+            self.weights.dot(self.sim_array[i] < self.sim_array[i - 1])
+            for i in range(1, len(self.forecast_index))
+            if self.forecast_index[i].year >= 2025
+        ]
+        np.testing.assert_allclose(df_prob_fall["ProbDecrease"], expected)
+        self.assertEqual(df_prob_fall.index[0], pd.Period('2025Q1'))
+        
+        diffs = np.diff(self.sim_array, axis=0)
+        self.assertAlmostEqual(overall, self.weights.dot((diffs < 0).any(axis=0)))
+        self.assertAlmostEqual(window, self.weights.dot((diffs[2:] < 0).any(axis=0)))
+        
+        # A forecast ending before start_year has no window
+        _, _, window = decline_probabilities(self.sim_array, self.forecast_index, start_year=2030)
+        self.assertTrue(np.isnan(window))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+import arviz as az
+from fred_forecaster.store import ModelStore
+from fred_forecaster.models.sarimax import fit_sarimax_model, generate_simulations
+from fred_forecaster.models.bayesian import fit_bayesian_model, generate_bayesian_simulations
+
+
+class TestModelStore(unittest.TestCase):
+    
+    def setUp(self):
+        """Create test data and an empty store"""
+        dates = pd.date_range(start='2020-01-01', periods=12, freq='QE')
+        values = np.array([100, 110, 120, 130, 140, 150, 160, 170, 180, 190, 200, 210])
+        self.test_series = pd.Series(values, index=dates, dtype=float)
+        self.test_df = pd.DataFrame({'Debt': self.test_series})
+        self.test_df.index = pd.PeriodIndex(self.test_df.index, freq='Q-DEC')
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = ModelStore(self.tmpdir.name)
+        
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        
+    def test_key_depends_on_data_and_spec(self):
+        """Test that keys change with the values, the index and the spec"""
+        key = self.store.key("sarimax", self.test_series, spec={"order": [1, 1, 1]})
+        self.assertEqual(key, self.store.key("sarimax", self.test_series.copy(),
+                                             spec={"order": [1, 1, 1]}))
+        
+        revised = self.test_series.copy()
+        revised.iloc[-1] += 1
+        shifted = self.test_series.copy()
+        shifted.index = shifted.index + pd.offsets.QuarterEnd()
+        for other in [
+            self.store.key("sarimax", revised, spec={"order": [1, 1, 1]}),
+            self.store.key("sarimax", shifted, spec={"order": [1, 1, 1]}),
+            self.store.key("sarimax", self.test_series, spec={"order": [2, 1, 1]}),
+        ]:
+            self.assertNotEqual(key, other)
+        
+    def test_sarimax_refit_is_skipped(self):
+        """Test that a stored SARIMAX fit is rehydrated without optimizing"""
+        results = fit_sarimax_model(self.test_series, store=self.store)
+        
+        with patch('statsmodels.tsa.statespace.sarimax.SARIMAX.fit') as mock_fit:
+            restored = fit_sarimax_model(self.test_series, store=self.store)
+            mock_fit.assert_not_called()
+        
+        np.testing.assert_allclose(restored.params, results.params)
+        sim_array, forecast_index = generate_simulations(restored, self.test_df, end="2023Q4", N=10)
+        self.assertEqual(sim_array.shape, (4, 10))
+        
+    def test_bayesian_resample_is_skipped(self):
+        """Test that stored posterior draws are returned without sampling"""
+        n = len(self.test_series)
+        rng = np.random.default_rng(0)
+        posterior = {name: rng.normal(size=(2, 5, n)) for name in ["level", "trend", "seasonal"]}
+        posterior["sigma_obs"] = np.abs(rng.normal(size=(2, 5)))
+        fake_idata = az.from_dict(posterior=posterior)
+        
+        with patch('pymc.sample', return_value=fake_idata) as mock_sample:
+            fit_bayesian_model(self.test_series, store=self.store)
+            model, idata = fit_bayesian_model(self.test_series, store=self.store)
+            self.assertEqual(mock_sample.call_count, 1)
+        
+        np.testing.assert_array_equal(idata.posterior["level"].values, posterior["level"])
+        sim_array, _ = generate_bayesian_simulations(model, idata, self.test_df, end="2023Q4", N=10)
+        self.assertEqual(sim_array.shape, (4, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
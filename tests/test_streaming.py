@@ -0,0 +1,133 @@
+import unittest
+import pandas as pd
+import numpy as np
+from fred_forecaster.models.sarimax import fit_sarimax_model, generate_simulations
+from fred_forecaster.streaming import (
+    BLOCK_SIZE,
+    DeclineAccumulator,
+    MeanAccumulator,
+    QuantileSketch,
+    _iter_blocks,
+    iter_simulations,
+    summarize_chunks,
+)
+from fred_forecaster.visualization import plot_drop_probabilities
+
+
+class CountingModel:
+    """Stand-in for a fitted model that counts how often it is pickled"""
+    
+    pickles = 0
+    
+    def __getstate__(self):
+        CountingModel.pickles += 1
+        return self.__dict__
+
+
+def _simulate_counting_block(model, N, seed):
+    return np.random.default_rng(seed).normal(size=(2, N))
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        """Create a simulated ensemble"""
+        rng = np.random.default_rng(0)
+        self.forecast_index = pd.period_range('2024Q3', '2027Q4', freq='Q-DEC')
+        steps = len(self.forecast_index)
+        self.sim_array = np.cumsum(rng.normal(0.2, 1.0, size=(steps, 5000)), axis=0)
+        self.weights = rng.uniform(0.5, 1.5, size=5000)
+        self.weights /= self.weights.sum()
+
+    def _chunks(self, size):
+        return (self.sim_array[:, i:i + size] for i in range(0, self.sim_array.shape[1], size))
+
+    def test_iter_simulations_matches_dense(self):
+        """Test that the chunks cover N paths over the same horizon"""
+        index = pd.period_range('2020Q1', periods=12, freq='Q-DEC')
+        data = pd.DataFrame({'Debt': np.linspace(100, 210, 12)}, index=index)
+        results = fit_sarimax_model(data)
+
+        chunks, forecast_index = iter_simulations(results, data, end="2024Q4", N=25, chunk_size=10)
+        chunks = list(chunks)
+        _, dense_index = generate_simulations(results, data, end="2024Q4", N=25)
+
+        self.assertTrue(forecast_index.equals(dense_index))
+        self.assertEqual([c.shape for c in chunks], [(8, 10), (8, 10), (8, 5)])
+
+    def test_summary_matches_dense(self):
+        """Test that the online summaries agree with the dense computations"""
+        summary = summarize_chunks(
+            self._chunks(700), self.forecast_index, weights=self.weights
+        )
+
+        np.testing.assert_allclose(summary["mean"], self.sim_array.dot(self.weights))
+
+        # Compare the decline probabilities with the existing dense version
+        fig = plot_drop_probabilities(self.sim_array, self.forecast_index, self.weights)
+        np.testing.assert_allclose(summary["prob_decrease"]["ProbDecrease"], fig.data[0].y)
+        self.assertEqual(summary["prob_decrease"].index[0], pd.Period('2025Q1'))
+
+        has_decline = (np.diff(self.sim_array, axis=0) < 0).any(axis=0)
+        self.assertAlmostEqual(summary["overall_prob_drop"], self.weights.dot(has_decline))
+
+    def test_quantile_sketch_accuracy(self):
+        """Test that the sketch quantiles are close to exact quantiles"""
+        sketch = QuantileSketch(len(self.forecast_index), max_centroids=100)
+        for chunk in self._chunks(500):
+            sketch.update(chunk)
+
+        probs = [0.01, 0.05, 0.5, 0.95, 0.99]
+        exact = np.quantile(self.sim_array, probs, axis=1)
+        spread = self.sim_array.std(axis=1)
+        self.assertTrue(np.all(np.abs(sketch.quantile(probs) - exact) < 0.05 * spread))
+
+    def test_merge(self):
+        """Test that merged accumulators equal a single accumulator"""
+        steps = len(self.forecast_index)
+        left, right, whole = MeanAccumulator(steps), MeanAccumulator(steps), MeanAccumulator(steps)
+        left_d, right_d = DeclineAccumulator(self.forecast_index), DeclineAccumulator(self.forecast_index)
+        left_q, right_q = QuantileSketch(steps), QuantileSketch(steps)
+        left.update(self.sim_array[:, :2000])
+        left_d.update(self.sim_array[:, :2000])
+        left_q.update(self.sim_array[:, :2000])
+        right.update(self.sim_array[:, 2000:])
+        right_d.update(self.sim_array[:, 2000:])
+        right_q.update(self.sim_array[:, 2000:])
+        whole.update(self.sim_array)
+
+        left.merge(right)
+        left_d.merge(right_d)
+        left_q.merge(right_q)
+        np.testing.assert_allclose(left.result(), whole.result())
+        np.testing.assert_allclose(left_d.result()[0]["ProbDecrease"], (np.diff(self.sim_array, axis=0) < 0).mean(axis=1)[1:])
+        np.testing.assert_allclose(
+            left_q.quantile([0.5])[0], np.median(self.sim_array, axis=1),
+            atol=0.05 * self.sim_array.std(axis=1).max()
+        )
+
+    def test_process_workers_receive_model_once(self):
+        """Test that a process pool does not pickle the model for every block"""
+        CountingModel.pickles = 0
+        blocks = list(_iter_blocks(
+            _simulate_counting_block, (CountingModel(),), 10 * BLOCK_SIZE, 1, "process", 2
+        ))
+        
+        self.assertLessEqual(CountingModel.pickles, 2)
+        reference = _iter_blocks(
+            _simulate_counting_block, (CountingModel(),), 10 * BLOCK_SIZE, 1, None, None
+        )
+        for block, expected in zip(blocks, reference):
+            np.testing.assert_array_equal(block, expected)
+
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected"""
+        index = pd.period_range('2020Q1', periods=12, freq='Q-DEC')
+        data = pd.DataFrame({'Debt': np.linspace(100, 210, 12)}, index=index)
+        chunks, _ = iter_simulations(None, data, end="2024Q4", N=10, chunk_size=0)
+        with self.assertRaises(ValueError):
+            next(chunks)
+
+
+if __name__ == '__main__':
+    unittest.main()